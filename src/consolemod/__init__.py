@@ -1,7 +1,11 @@
 """ConsoleMod - A powerful, thread-safe terminal UI library"""
 
 # Core module
-from .core import TerminalSplitter, Pane, EventBus, KeyEvent, FocusEvent, KeyCode
+from .core import (
+    TerminalSplitter, Pane, PaneView, PaneRenderer, TextCache, IngestPolicy, FrameScheduler,
+    RenderBackend, RichBackend, CellBackend, OffscreenTerminal, TerminalWriter,
+    EventBus, KeyEvent, FocusEvent, KeyCode,
+)
 
 # UI module
 from .ui import (
@@ -37,7 +41,8 @@ from .monitoring import (
 from .utils import (
     wrap_text, align_text, truncate_text, highlight_text,
     format_bytes, format_duration, create_box, TextAlign,
-    load_config, CircularBuffer,
+    load_config, CircularBuffer, StyleTable, ScrollbackTier, SpillTier,
+    CompressedTier, TrigramIndex, LogIndex, RowIndex, RepeatCollapser,
     CommandHistory, UndoRedoStack, StateSnapshot,
     PaneExporter,
 )
@@ -56,6 +61,16 @@ __all__ = [
     # Core
     "TerminalSplitter",
     "Pane",
+    "PaneView",
+    "PaneRenderer",
+    "TextCache",
+    "IngestPolicy",
+    "FrameScheduler",
+    "RenderBackend",
+    "RichBackend",
+    "CellBackend",
+    "OffscreenTerminal",
+    "TerminalWriter",
     
     # Events
     "EventBus",
@@ -141,6 +156,14 @@ __all__ = [
     
     # Utils - Buffer
     "CircularBuffer",
+    "StyleTable",
+    "ScrollbackTier",
+    "SpillTier",
+    "CompressedTier",
+    "TrigramIndex",
+    "LogIndex",
+    "RowIndex",
+    "RepeatCollapser",
     
     # Utils - History
     "CommandHistory",
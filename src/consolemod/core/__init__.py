@@ -1,6 +1,22 @@
 """Core module - Terminal UI and pane management"""
 from .core import TerminalSplitter
 from .pane import Pane
+from .view import PaneView
+from .renderer import PaneRenderer
+from .wrap import TextCache
+from .ingest import IngestPolicy
+from .scheduler import FrameScheduler
+from .backends import RenderBackend, RichBackend, CellBackend
+from .offscreen import OffscreenTerminal
+from .output import TerminalWriter
 from .events import EventBus, KeyEvent, FocusEvent, KeyCode
+from ..ui.layout import LayoutMode
 
-__all__ = ["TerminalSplitter", "Pane", "EventBus", "KeyEvent", "FocusEvent", "KeyCode"]
+__all__ = [
+    "TerminalSplitter", "Pane", "PaneView", "PaneRenderer", "TextCache", "IngestPolicy",
+    "FrameScheduler",
+    "RenderBackend", "RichBackend", "CellBackend", "OffscreenTerminal",
+    "TerminalWriter",
+    "EventBus", "KeyEvent", "FocusEvent", "KeyCode",
+    "LayoutMode",
+]
@@ -0,0 +1,247 @@
+import threading
+from typing import Dict, List, Optional
+from rich.cells import get_character_cell_size
+from rich.console import COLOR_SYSTEMS, Console, RenderableType
+from rich.control import Control
+from rich.screen import Screen
+from rich.style import Style
+
+
+class RenderBackend:
+    """Base class for turning a renderable into terminal output"""
+
+    def __init__(self, console: Console) -> None:
+        """Initialize backend
+
+        Args:
+            console: Console that frames are rendered for
+        """
+        self.console: Console = console
+        self.lock: threading.RLock = threading.RLock()
+
+    def reset(self) -> None:
+        """Forget any previous frame so the next one is drawn in full"""
+
+    def render(self, renderable: RenderableType) -> str:
+        """Render a full-screen frame (thread-safe)
+
+        Args:
+            renderable: Renderable filling the screen
+
+        Returns:
+            Escape sequences and text to write to the terminal
+        """
+        raise NotImplementedError
+
+
+class RichBackend(RenderBackend):
+    """Redraws the whole screen through Rich on every frame"""
+
+    def render(self, renderable: RenderableType) -> str:
+        """Render a full-screen frame (thread-safe)"""
+        with self.lock:
+            with self.console.capture() as capture:
+                self.console.print(Control.home(), Screen(renderable), end="")
+            return capture.get()
+
+
+class CellBackend(RenderBackend):
+    """Double-buffered cell grid that only emits changed cells
+
+    The screen is kept as a grid of characters and interned style ids. Each
+    frame is rendered into a fresh grid and diffed against the previous one;
+    only cells that changed are written, with cursor moves and SGR codes
+    emitted only when they are needed. Tail-style panes where a few rows
+    change per frame cost a fraction of a full redraw.
+    """
+
+    # Marks the second cell of a double-width character
+    WIDE_CONTINUATION = ""
+    # Interned styles kept before the tables are rebuilt on the next frame
+    MAX_STYLES = 4096
+
+    def __init__(self, console: Console) -> None:
+        super().__init__(console)
+        self.width: int = 0
+        self.height: int = 0
+        self._chars: List[str] = []
+        self._styles: List[int] = []
+        self._style_ids: Dict[Optional[Style], int] = {}
+        self._sgr: List[str] = []
+        self._clear_styles()
+        self.cells_written: int = 0  # Cells emitted during the last render
+
+    def reset(self) -> None:
+        """Forget the previous frame so the next one is drawn in full"""
+        with self.lock:
+            self.width = 0
+            self.height = 0
+            self._chars = []
+            self._styles = []
+            self._clear_styles()
+
+    def get_text(self) -> List[str]:
+        """Get the current screen contents as plain text lines (thread-safe)
+
+        Returns:
+            One string per screen row
+        """
+        with self.lock:
+            w = self.width
+            return [
+                "".join(self._chars[row * w:(row + 1) * w])
+                for row in range(self.height)
+            ]
+
+    def render(self, renderable: RenderableType) -> str:
+        """Render a frame and return only the output for changed cells (thread-safe)"""
+        with self.lock:
+            width, height = self.console.size
+            full = (width, height) != (self.width, self.height)
+            if full or len(self._sgr) > self.MAX_STYLES:
+                # Style ids are reassigned, so the old grid cannot be diffed against
+                self._clear_styles()
+                full = True
+            chars, styles = self._rasterize(renderable, width, height)
+
+            out: List[str] = []
+            if full:
+                out.append("\x1b[0m\x1b[2J")
+            self._diff(out, chars, styles, width, height, full)
+            if out:
+                out.append("\x1b[0m")
+
+            self.width, self.height = width, height
+            self._chars, self._styles = chars, styles
+            return "".join(out)
+
+    def _style_id(self, style: Optional[Style]) -> int:
+        """Intern a style and return its id"""
+        style_id = self._style_ids.get(style)
+        if style_id is None:
+            style_id = len(self._sgr)
+            self._style_ids[style] = style_id
+            self._sgr.append(self._make_sgr(style))
+        return style_id
+
+    def _clear_styles(self) -> None:
+        """Drop interned styles, keeping id 0 for unstyled cells (call with lock held)"""
+        self._style_ids = {None: 0}
+        self._sgr = ["\x1b[0m"]
+
+    def _make_sgr(self, style: Optional[Style]) -> str:
+        """Build a self-contained SGR sequence (reset + attributes) for a style"""
+        color_system = self.console.color_system
+        if not color_system:
+            return ""
+        if style is None:
+            return "\x1b[0m"
+        marked = style.render("\x00", color_system=COLOR_SYSTEMS[color_system])
+        prefix = marked.split("\x00", 1)[0]
+        if not prefix:
+            return "\x1b[0m"
+        return "\x1b[0;" + prefix[2:]
+
+    def _rasterize(self, renderable: RenderableType, width: int, height: int):
+        """Render into flat character and style-id arrays"""
+        size = width * height
+        chars = [" "] * size
+        styles = [0] * size
+        options = self.console.options.update_dimensions(width, height)
+        lines = self.console.render_lines(renderable, options, pad=True)
+
+        for row, line in enumerate(lines[:height]):
+            base = row * width
+            col = 0
+            for segment in line:
+                if segment.control or col >= width:
+                    continue
+                style_id = self._style_id(segment.style)
+                for ch in segment.text:
+                    cell_width = get_character_cell_size(ch)
+                    if cell_width == 0:
+                        if col > 0:
+                            chars[base + col - 1] += ch  # Combining character
+                        continue
+                    if col + cell_width > width:
+                        break
+                    chars[base + col] = ch
+                    styles[base + col] = style_id
+                    if cell_width == 2:
+                        chars[base + col + 1] = self.WIDE_CONTINUATION
+                        styles[base + col + 1] = style_id
+                    col += cell_width
+        return chars, styles
+
+    def _diff(
+        self,
+        out: List[str],
+        chars: List[str],
+        styles: List[int],
+        width: int,
+        height: int,
+        full: bool
+    ) -> None:
+        """Append output for cells that differ from the previous frame"""
+        old_chars, old_styles = self._chars, self._styles
+        sgr = self._sgr
+        cursor = -1        # Flat index where the terminal cursor is, -1 if unknown
+        current_style = -1
+        written = 0
+
+        for row in range(height):
+            start = row * width
+            end = start + width
+            if not full and chars[start:end] == old_chars[start:end] \
+                    and styles[start:end] == old_styles[start:end]:
+                continue
+
+            idx = start
+            while idx < end:
+                ch = chars[idx]
+                if not full and ch == old_chars[idx] and styles[idx] == old_styles[idx]:
+                    idx += 1
+                    continue
+                if ch == self.WIDE_CONTINUATION:
+                    idx -= 1  # Redraw the whole wide character
+                    ch = chars[idx]
+                if cursor != idx:
+                    out.append(f"\x1b[{row + 1};{idx - start + 1}H")
+                style_id = styles[idx]
+                if style_id != current_style:
+                    out.append(sgr[style_id])
+                    current_style = style_id
+                out.append(ch)
+                written += 1
+                step = 2 if idx + 1 < end and chars[idx + 1] == self.WIDE_CONTINUATION else 1
+                idx += step
+                # Writing the last column leaves the cursor in a pending-wrap state
+                cursor = idx if idx < end else -1
+
+        self.cells_written = written
+
+
+BACKENDS = {
+    "rich": RichBackend,
+    "cells": CellBackend,
+}
+
+
+def create_backend(name: str, console: Console) -> RenderBackend:
+    """Create a render backend by name
+
+    Args:
+        name: "rich" (full redraw) or "cells" (diffed cell grid)
+        console: Console frames are rendered for
+
+    Returns:
+        RenderBackend instance
+    """
+    try:
+        return BACKENDS[name](console)
+    except KeyError:
+        raise ValueError(f"Unknown render backend: {name!r}") from None
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
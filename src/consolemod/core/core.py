@@ -1,15 +1,19 @@
 import threading
 import asyncio
+import signal
 import time
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Callable, Tuple
 from rich.console import Console
-from rich.live import Live
-from rich.panel import Panel
 from rich.text import Text
 from .pane import Pane
+from .renderer import PaneRenderer
+from .scheduler import FrameScheduler
+from .backends import RenderBackend, create_backend
+from .offscreen import OffscreenTerminal
+from .output import TerminalWriter, supports_synchronized_output
 from .events import EventBus, KeyEvent, FocusEvent, KeyCode
 from ..input.input_handler import InputHandler
-from ..ui.themes import Theme, get_theme, style_to_rich
+from ..ui.themes import Theme, get_theme
 from ..ui.layout import Layout, LayoutMode, LayoutConstraints
 from ..monitoring.metrics import PerformanceMonitor, MemoryMonitor
 from ..monitoring.debounce import Debouncer
@@ -25,21 +29,67 @@ class TerminalSplitter:
         theme: str = "dark",
         enable_input: bool = True,
         layout_mode: LayoutMode = LayoutMode.VERTICAL,
-        enable_metrics: bool = False
+        enable_metrics: bool = False,
+        backend: str = "rich",
+        terminal: Optional[OffscreenTerminal] = None,
+        max_bytes_per_second: Optional[int] = None,
+        synchronized_output: Optional[bool] = None,
+        render_thread: bool = False
     ) -> None:
+        """Initialize splitter
+        
+        Args:
+            config: Config file path or dict
+            fps: Maximum frames per second
+            theme: Theme name
+            enable_input: Whether to read keyboard input
+            layout_mode: Pane arrangement
+            enable_metrics: Whether to collect performance and memory metrics
+            backend: "rich" to redraw the full screen each frame, or "cells" to
+                diff a cell grid and only write changed cells (less output on
+                slow links)
+            terminal: Render into this in-memory terminal instead of the real
+                screen (headless mode for tests and benchmarks; disables input)
+            max_bytes_per_second: Output budget; when recent frames would exceed
+                it the effective frame rate is lowered (None = unlimited)
+            synchronized_output: Wrap frames in synchronized-output sequences
+                (None = auto-detect for real terminals)
+            render_thread: Build and write frames on a dedicated background
+                thread so the event loop running render_loop() only handles
+                input, timers and pane writes
+        """
         self.panes: List[Pane] = []
         self.lock: threading.RLock = threading.RLock()
         self.fps: int = fps
-        self.console: Console = Console()
+        self.terminal: Optional[OffscreenTerminal] = terminal
+        self.console: Console = terminal.console if terminal else Console()
         self.theme: Theme = get_theme(theme)
         self.event_bus: EventBus = EventBus()
-        self.input_handler: Optional[InputHandler] = InputHandler() if enable_input else None
+        self.input_handler: Optional[InputHandler] = (
+            InputHandler() if enable_input and terminal is None else None
+        )
         self.focused_pane_idx: int = 0
         self._running: bool = False
         self.layout: Layout = Layout(layout_mode)
         self.perf_monitor: Optional[PerformanceMonitor] = PerformanceMonitor() if enable_metrics else None
         self.mem_monitor: Optional[MemoryMonitor] = MemoryMonitor() if enable_metrics else None
         self._render_debouncer: Debouncer = Debouncer(0.01)  # Debounce rapid updates
+        self._renderer: PaneRenderer = PaneRenderer(self.theme, self.layout)
+        self._scheduler: FrameScheduler = FrameScheduler(fps)
+        self._backend: RenderBackend = create_backend(backend, self.console)
+        if synchronized_output is None:
+            synchronized_output = terminal is None and supports_synchronized_output(self.console)
+        self._writer: TerminalWriter = TerminalWriter(
+            self._write_raw,
+            synchronized=synchronized_output,
+            max_bytes_per_second=max_bytes_per_second,
+        )
+        self._last_size: Optional[Tuple[int, int]] = None
+        self.render_thread: bool = render_thread
+        self._render_thread: Optional[threading.Thread] = None
+        self._render_error: Optional[BaseException] = None
+        self._render_busy_ns: int = 0  # Time the render thread spent on frames
+        self._render_since_ns: int = time.perf_counter_ns()
         self.load_config(config)
         if self.panes:
             with self.lock:
@@ -64,10 +114,12 @@ class TerminalSplitter:
         """Add pane to splitter (thread-safe)"""
         with self.lock:
             self.panes.append(pane)
+        pane.add_change_listener(self._scheduler.request_frame)
+        self._scheduler.request_frame()
     
     async def aadd_pane(self, pane: Pane) -> None:
-        """Asynchronous add pane (thread-safe)"""
-        await asyncio.to_thread(self.add_pane, pane)
+        """Asynchronous add pane (thread-safe, completes inline)"""
+        self.add_pane(pane)
     
     def get_pane(self, pane_id: str) -> Optional[Pane]:
         """Get pane by ID (thread-safe)"""
@@ -75,8 +127,8 @@ class TerminalSplitter:
             return next((p for p in self.panes if p.id == pane_id), None)
     
     async def aget_pane(self, pane_id: str) -> Optional[Pane]:
-        """Asynchronous get pane (thread-safe)"""
-        return await asyncio.to_thread(self.get_pane, pane_id)
+        """Asynchronous get pane (thread-safe, completes inline)"""
+        return self.get_pane(pane_id)
     
     def get_panes(self) -> List[Pane]:
         """Get all panes (thread-safe)"""
@@ -84,46 +136,290 @@ class TerminalSplitter:
             return self.panes.copy()
     
     async def aget_panes(self) -> List[Pane]:
-        """Asynchronous get all panes (thread-safe)"""
-        return await asyncio.to_thread(self.get_panes)
+        """Asynchronous get all panes (thread-safe, completes inline)"""
+        return self.get_panes()
     
     async def render_loop(self) -> None:
-        """Main async render loop with input handling (thread-safe)"""
-        refresh_rate: float = 1 / self.fps
+        """Main async render loop with input handling (thread-safe)
         
+        Frames are drawn only when a pane changes, a key arrives, the terminal
+        is resized or a timer ticks, and never more than ``fps`` times a second.
+        """
         with self.lock:
             self._running = True
         
+        if self.render_thread:
+            await self._threaded_render_loop()
+            return
+        
+        loop = asyncio.get_running_loop()
+        self._scheduler.fps = self.fps
+        self._scheduler.bind(loop)
+        self._scheduler.request_frame()  # Initial frame
+        resize_watch = self._watch_resize(loop)
+        
         try:
-            with Live(console=self.console, refresh_per_second=self.fps, screen=True) as live:
+            if self.input_handler:
+                self.input_handler.start(on_key=self._scheduler.request_frame)
+            
+            with self.console.screen(hide_cursor=True):
+                self._backend.reset()
                 while True:
+                    await self._scheduler.wait_for_frame()
                     with self.lock:
                         if not self._running:
                             break
                     
-                    # Handle input
-                    if self.input_handler:
-                        key_event = await self.input_handler.read_key()
-                        if key_event:
-                            await self._handle_key_event(key_event)
+                    if self.perf_monitor:
+                        self.perf_monitor.start_frame()
+                    
+                    # Drain queued input without waiting for a keypress
+                    input_start = time.perf_counter_ns()
+                    await self._process_input()
                     
-                    layout = self._build_layout()
-                    live.update(layout)
-                    await asyncio.sleep(refresh_rate)
+                    self._render_frame(time.perf_counter_ns() - input_start)
+                    
+                    # Slow down instead of queueing output past the byte budget
+                    self._scheduler.fps = self._writer.effective_fps(self.fps)
         except KeyboardInterrupt:
             pass
         finally:
+            resize_watch()
+            if self.input_handler:
+                self.input_handler.stop()
+            self._scheduler.unbind()
             with self.lock:
                 self._running = False
     
+    async def _threaded_render_loop(self) -> None:
+        """Render on a background thread while this loop handles input
+        
+        The render thread owns layout, panel building and output. The event
+        loop only wakes for keys, timers and resize signals; pane writes
+        from the application just record lines and request a frame.
+        """
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        self._scheduler.fps = self.fps
+        self._scheduler.bind(loop, wake_loop=False)
+        self._scheduler.request_frame()  # Initial frame
+        resize_watch = self._watch_resize(loop)
+        self._render_error = None
+        
+        def on_key() -> None:
+            wake.set()
+        
+        def on_thread_exit() -> None:
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:
+                pass  # Loop already closed
+        
+        try:
+            if self.input_handler:
+                self.input_handler.start(on_key=on_key)
+            
+            with self.console.screen(hide_cursor=True):
+                self._backend.reset()
+                self._render_thread = threading.Thread(
+                    target=self._render_thread_main,
+                    args=(on_thread_exit,),
+                    name="consolemod-render",
+                    daemon=True,
+                )
+                self._render_thread.start()
+                try:
+                    while True:
+                        await wake.wait()
+                        wake.clear()
+                        with self.lock:
+                            if not self._running:
+                                break  # stop() was called or the render thread exited
+                        await self._process_input()
+                        self._scheduler.request_frame()
+                finally:
+                    self.stop()
+                    await asyncio.to_thread(self._render_thread.join)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            resize_watch()
+            if self.input_handler:
+                self.input_handler.stop()
+            self._scheduler.unbind()
+            with self.lock:
+                self._running = False
+        
+        if self._render_error is not None:
+            error, self._render_error = self._render_error, None
+            raise error
+    
+    def _render_thread_main(self, on_exit: Callable[[], None]) -> None:
+        """Body of the render thread: draw frames until stop() is called"""
+        self._render_since_ns = time.perf_counter_ns()
+        self._render_busy_ns = 0
+        try:
+            while True:
+                self._scheduler.wait_for_frame_blocking()
+                with self.lock:
+                    if not self._running:
+                        break
+                
+                start = time.perf_counter_ns()
+                if self.perf_monitor:
+                    self.perf_monitor.start_frame()
+                self._render_frame(0)
+                self._scheduler.fps = self._writer.effective_fps(self.fps)
+                self._render_busy_ns += time.perf_counter_ns() - start
+        except BaseException as e:
+            self._render_error = e
+        finally:
+            with self.lock:
+                self._running = False
+            on_exit()
+    
+    def get_render_thread_utilization(self) -> float:
+        """Get the fraction of time the render thread spent drawing frames
+        
+        Measured since the thread started or metrics were last reset.
+        
+        Returns:
+            Busy fraction between 0 and 1 (0 when not in render-thread mode)
+        """
+        if not self.render_thread:
+            return 0.0
+        elapsed = time.perf_counter_ns() - self._render_since_ns
+        if elapsed <= 0:
+            return 0.0
+        return min(1.0, self._render_busy_ns / elapsed)
+    
+    def render_frame(self) -> str:
+        """Render and write one frame immediately (thread-safe)
+        
+        Skips input and scheduling, which makes it suitable for headless
+        benchmarks with an OffscreenTerminal.
+        
+        Returns:
+            Output written for the frame
+        """
+        if self.perf_monitor:
+            self.perf_monitor.start_frame()
+        return self._render_frame(0)
+    
+    def _render_frame(self, input_ns: int) -> str:
+        """Run the layout, build, render and write phases of a frame
+        
+        Each phase is timed with perf_counter_ns and recorded in the
+        performance monitor when metrics are enabled.
+        
+        Args:
+            input_ns: Time already spent on input for this frame
+            
+        Returns:
+            Output written for the frame
+        """
+        panes = self.get_panes()
+        t0 = time.perf_counter_ns()
+        self._renderer.update_layout(panes, self.console.size)
+        t1 = time.perf_counter_ns()
+        self._renderer.update_panels(panes)
+        t2 = time.perf_counter_ns()
+        output = self._backend.render(self._renderer.root)
+        t3 = time.perf_counter_ns()
+        output_bytes = self._writer.write_frame(output)
+        t4 = time.perf_counter_ns()
+        
+        if self.perf_monitor:
+            self.perf_monitor.end_frame(
+                render_time=(t3 - t2) / 1_000_000,
+                input_time=input_ns / 1_000_000,
+                layout_time=(t1 - t0) / 1_000_000,
+                build_time=(t2 - t1) / 1_000_000,
+                write_time=(t4 - t3) / 1_000_000,
+                output_bytes=output_bytes,
+            )
+            self.perf_monitor.record_panes(panes)
+        return output
+    
+    def _write_raw(self, data: str) -> None:
+        """Write frame output to the terminal with a single write and flush"""
+        if self.terminal is not None:
+            self.terminal.write_frame(data)
+            return
+        out = self.console.file
+        out.write(data)
+        out.flush()
+    
+    def _watch_resize(self, loop: asyncio.AbstractEventLoop) -> Callable[[], Any]:
+        """Request frames on terminal resize
+        
+        Uses SIGWINCH where available and falls back to polling the console
+        size twice a second.
+        
+        Returns:
+            Function that removes the watch
+        """
+        if self.terminal is not None:
+            terminal = self.terminal
+            terminal.add_resize_listener(self._scheduler.request_frame)
+            return lambda: terminal.remove_resize_listener(self._scheduler.request_frame)
+        
+        sigwinch = getattr(signal, "SIGWINCH", None)
+        if sigwinch is not None:
+            try:
+                loop.add_signal_handler(sigwinch, self._scheduler.request_frame)
+                return lambda: loop.remove_signal_handler(sigwinch)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # Not the main thread, or unsupported loop
+        
+        self._last_size = self.console.size
+        timer_id = self._scheduler.add_timer(0.5, self._poll_size)
+        return lambda: self._scheduler.remove_timer(timer_id)
+    
+    def _poll_size(self) -> None:
+        """Fallback resize check used when SIGWINCH is unavailable"""
+        size = self.console.size
+        if size != self._last_size:
+            self._last_size = size
+            self._scheduler.request_frame()
+    
+    def request_frame(self) -> None:
+        """Request a redraw, e.g. after changing state outside of panes (thread-safe)"""
+        self._scheduler.request_frame()
+    
+    def add_timer(self, interval: float, callback: Optional[Callable[[], None]] = None) -> int:
+        """Redraw every ``interval`` seconds for time-driven widgets (thread-safe)
+        
+        Args:
+            interval: Seconds between ticks
+            callback: Optional function run on the event loop before each redraw,
+                e.g. to advance a Spinner
+            
+        Returns:
+            Timer id for remove_timer()
+        """
+        return self._scheduler.add_timer(interval, callback)
+    
+    def remove_timer(self, timer_id: int) -> None:
+        """Remove a timer created with add_timer() (thread-safe)"""
+        self._scheduler.remove_timer(timer_id)
+    
+    async def _process_input(self) -> None:
+        """Handle all key events queued since the last frame"""
+        if not self.input_handler:
+            return
+        for key_event in self.input_handler.get_pending_keys():
+            await self._handle_key_event(key_event)
+    
     def stop(self) -> None:
         """Stop the render loop (thread-safe)"""
         with self.lock:
             self._running = False
+        self._scheduler.request_frame()  # Wake the loop so it can exit
     
     async def astop(self) -> None:
-        """Asynchronous stop (thread-safe)"""
-        await asyncio.to_thread(self.stop)
+        """Asynchronous stop (thread-safe, completes inline)"""
+        self.stop()
     
     async def _handle_key_event(self, event: KeyEvent) -> None:
         """Handle keyboard events (thread-safe)"""
@@ -154,8 +450,8 @@ class TerminalSplitter:
             self.panes[self.focused_pane_idx].set_focus(True)
     
     async def _afocus_next(self) -> None:
-        """Asynchronous focus next (thread-safe)"""
-        await asyncio.to_thread(self._focus_next)
+        """Asynchronous focus next (thread-safe, completes inline)"""
+        self._focus_next()
     
     def _focus_previous(self) -> None:
         """Focus previous pane (thread-safe)"""
@@ -167,8 +463,8 @@ class TerminalSplitter:
             self.panes[self.focused_pane_idx].set_focus(True)
     
     async def _afocus_previous(self) -> None:
-        """Asynchronous focus previous (thread-safe)"""
-        await asyncio.to_thread(self._focus_previous)
+        """Asynchronous focus previous (thread-safe, completes inline)"""
+        self._focus_previous()
     
     def get_focused_pane(self) -> Optional[Pane]:
         """Get currently focused pane (thread-safe)"""
@@ -178,33 +474,47 @@ class TerminalSplitter:
             return None
     
     async def aget_focused_pane(self) -> Optional[Pane]:
-        """Asynchronous get focused pane (thread-safe)"""
-        return await asyncio.to_thread(self.get_focused_pane)
+        """Asynchronous get focused pane (thread-safe, completes inline)"""
+        return self.get_focused_pane()
     
     def get_performance_metrics(self) -> Optional[Dict[str, Any]]:
         """Get performance metrics (thread-safe)
         
         Returns:
-            Dict with fps, avg_frame_time, etc., or None if metrics disabled
+            Dict with fps, avg/max frame time and average time per phase
+            (input, layout, build, render, write), output byte counters,
+            the budget-limited effective fps and, in render-thread mode,
+            render_thread_utilization (0-1), or None if metrics disabled
         """
         if self.perf_monitor is None:
             return None
         
-        return {
+        metrics = {
             "fps": self.perf_monitor.get_fps(),
             "avg_frame_time_ms": self.perf_monitor.get_avg_frame_time(),
             "max_frame_time_ms": self.perf_monitor.get_max_frame_time(),
         }
+        for phase, avg in self.perf_monitor.get_phase_averages().items():
+            metrics[f"avg_{phase}_ms"] = avg
+        metrics.update(self._writer.get_stats())
+        metrics["effective_fps"] = self._writer.effective_fps(self.fps)
+        if self.render_thread:
+            metrics["render_thread_utilization"] = self.get_render_thread_utilization()
+        return metrics
     
     def get_memory_metrics(self) -> Optional[Dict[str, Any]]:
         """Get memory metrics (thread-safe)
         
+        Pane usage is refreshed from the buffers' running totals, so this is
+        cheap enough to call every frame.
+        
         Returns:
             Dict with total and per-pane memory, or None if metrics disabled
         """
         if self.mem_monitor is None:
             return None
         
+        self.mem_monitor.record_panes(self.get_panes())
         return {
             "total_bytes": self.mem_monitor.get_total_memory(),
             "pane_breakdown": self.mem_monitor.get_pane_breakdown(),
@@ -214,6 +524,9 @@ class TerminalSplitter:
         """Reset all metrics (thread-safe)"""
         if self.perf_monitor:
             self.perf_monitor.reset()
+        self._writer.reset()
+        self._render_busy_ns = 0
+        self._render_since_ns = time.perf_counter_ns()
         if self.mem_monitor:
             self.mem_monitor.reset()
     
@@ -224,10 +537,11 @@ class TerminalSplitter:
             mode: LayoutMode to use
         """
         self.layout.set_mode(mode)
+        self._scheduler.request_frame()
     
     async def aset_layout_mode(self, mode: LayoutMode) -> None:
-        """Asynchronous set layout mode (thread-safe)"""
-        await asyncio.to_thread(self.set_layout_mode, mode)
+        """Asynchronous set layout mode (thread-safe, completes inline)"""
+        self.set_layout_mode(mode)
     
     def set_pane_weight(self, pane_id: str, weight: float) -> None:
         """Set pane weight in layout (thread-safe)
@@ -239,47 +553,15 @@ class TerminalSplitter:
         constraints = self.layout.get_constraints(pane_id)
         constraints.weight = weight
         self.layout.set_constraints(pane_id, constraints)
+        self._scheduler.request_frame()
     
     async def aset_pane_weight(self, pane_id: str, weight: float) -> None:
-        """Asynchronous set pane weight (thread-safe)"""
-        await asyncio.to_thread(self.set_pane_weight, pane_id, weight)
+        """Asynchronous set pane weight (thread-safe, completes inline)"""
+        self.set_pane_weight(pane_id, weight)
     
     def _build_layout(self):
-        """Build layout with styled panes"""
-        from rich.layout import Layout
-        layout = Layout()
-        with self.lock:
-            if not self.panes:
-                return layout
-            
-            # Create sections for each pane
-            if len(self.panes) == 1:
-                layout.split_column(Layout(name=self.panes[0].id))
-            else:
-                layout.split_column(*[Layout(name=p.id) for p in self.panes])
-            
-            for i, pane in enumerate(self.panes):
-                # Get visible content
-                content_lines = [msg for msg, _ in pane.content]
-                content = "\n".join(content_lines[-100:]) if content_lines else "[dim]Empty[/dim]"
-                
-                # Choose border style based on focus
-                if pane.focused:
-                    border_style = style_to_rich(self.theme.pane_focus)
-                    title = f" {pane.id} [active] "
-                else:
-                    border_style = style_to_rich(self.theme.pane_border)
-                    title = f" {pane.id} "
-                
-                panel = Panel(
-                    content,
-                    title=title,
-                    border_style=border_style,
-                    expand=True
-                )
-                layout[pane.id].update(panel)
-        
-        return layout
+        """Build layout with styled panes, rebuilding only panes that changed"""
+        return self._renderer.render(self.get_panes(), tuple(self.console.size))
     
     async def run_async_stream(self, pane_id: str, async_gen) -> None:
         """Run async generator and write output to pane (thread-safe)
@@ -0,0 +1,90 @@
+import queue
+import threading
+from typing import Any, Optional
+
+
+class WriteDispatcher:
+    """Thread-safe background delivery of committed write batches
+
+    Panes with write listeners schedule themselves here instead of calling
+    listeners from the writing thread. A single daemon thread commits each
+    scheduled pane's staged lines and hands the resulting batches to its
+    listeners, so producers never wait on subscribers. A slow listener only
+    delays later deliveries, never ingestion.
+
+    Exceptions raised by listeners never stop delivery; they are counted
+    in ``errors`` and the latest one is kept in ``last_error``.
+    """
+
+    def __init__(self) -> None:
+        self.lock: threading.RLock = threading.RLock()
+        self.errors: int = 0
+        self.last_error: Optional[BaseException] = None
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, pane: Any) -> None:
+        """Queue a pane for delivery (thread-safe)
+
+        Args:
+            pane: Pane whose pending batches should be delivered
+        """
+        self._ensure_thread()
+        self._queue.put(pane)
+
+    def record_error(self, error: BaseException) -> None:
+        """Count an exception raised while delivering (thread-safe)
+
+        Args:
+            error: Exception raised by a listener or pane
+        """
+        with self.lock:
+            self.errors += 1
+            self.last_error = error
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything scheduled so far has been delivered (thread-safe)
+
+        Args:
+            timeout: Maximum seconds to wait (None = forever)
+
+        Returns:
+            True if delivery caught up, False on timeout
+        """
+        if threading.current_thread() is self._thread:
+            return True  # Called from a listener; waiting would deadlock
+        done = threading.Event()
+        self._ensure_thread()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _ensure_thread(self) -> None:
+        """Start the delivery thread on first use"""
+        if self._thread is not None:
+            return
+        with self.lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="consolemod-dispatch", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Deliver scheduled panes forever (runs on the delivery thread)"""
+        while True:
+            item = self._queue.get()
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            try:
+                item._deliver_batches()
+            except Exception as e:
+                self.record_error(e)  # A failing pane must not stop delivery for the others
+
+
+# Shared by all panes
+DISPATCHER = WriteDispatcher()
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
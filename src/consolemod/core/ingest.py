@@ -0,0 +1,186 @@
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class IngestPolicy:
+    """Thread-safe rate limit for lines written to a pane
+
+    A token bucket refills at ``rate`` lines per second up to ``burst``
+    lines. Lines within the budget are staged as usual; what happens to
+    lines over it depends on the mode:
+
+    - ``block``: the writer waits until its lines fit the rate (write()
+      sleeps, awrite() awaits), so producers slow down and nothing is lost;
+      write() on a running event loop stages its lines without sleeping
+    - ``drop_newest``: lines over the rate are discarded
+    - ``drop_oldest``: lines over the rate displace the oldest lines not
+      yet committed, so each frame shows the most recent lines
+    - ``sample``: lines over the rate are kept with probability
+      rate / arrival rate, so the kept lines are spread across the burst
+
+    Either way a pane under overload commits about ``rate`` lines per
+    second, which keeps commit and render cost per frame bounded.
+
+    Counters: ``received`` lines written while the policy was set,
+    ``dropped`` lines discarded by any mode, ``sampled`` lines kept by
+    sampling while over the rate, ``blocked`` writes that had to wait and
+    ``blocked_time`` seconds spent waiting.
+
+    Usage:
+        pane.set_ingest_policy(IngestPolicy("drop_oldest", rate=2000))
+    """
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    SAMPLE = "sample"
+    MODES = (BLOCK, DROP_OLDEST, DROP_NEWEST, SAMPLE)
+
+    def __init__(self, mode: str, rate: float, burst: Optional[float] = None) -> None:
+        """Initialize policy
+
+        Args:
+            mode: "block", "drop_oldest", "drop_newest" or "sample"
+            rate: Lines per second allowed through
+            burst: Lines allowed at once after a quiet period (default: rate)
+
+        Raises:
+            ValueError: If the mode is unknown, rate is not positive or burst is below 1
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown ingest policy: {mode!r}")
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        burst = rate if burst is None else burst
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.lock: threading.RLock = threading.RLock()
+        self.mode: str = mode
+        self.rate: float = float(rate)
+        self.burst: float = float(burst)
+        self.received: int = 0
+        self.dropped: int = 0
+        self.sampled: int = 0
+        self.blocked: int = 0
+        self.blocked_time: float = 0.0
+        self._tokens: float = self.burst
+        self._refilled: float = time.monotonic()
+        self._window_start: float = self._refilled  # Arrival rate measurement for sampling
+        self._window_arrivals: int = 0
+        self._arrival_rate: float = 0.0
+        self._random: random.Random = random.Random()
+
+    def reserve(self, count: int, wait: bool = True) -> float:
+        """Take budget for ``count`` lines, going into debt if needed (thread-safe)
+
+        Used by the block mode: later writers queue behind the debt, so the
+        rate holds across threads.
+
+        Args:
+            count: Lines being written
+            wait: False if the caller stages the lines without waiting; the
+                write still counts as blocked, but not toward blocked_time
+
+        Returns:
+            Seconds the caller must wait before staging the lines
+        """
+        with self.lock:
+            self._refill()
+            self.received += count
+            self._tokens -= count
+            if self._tokens >= 0:
+                return 0.0
+            delay = -self._tokens / self.rate
+            self.blocked += 1
+            if wait:
+                self.blocked_time += delay
+            return delay
+
+    def select(self, items: List[tuple]) -> Tuple[List[tuple], int]:
+        """Apply a non-blocking mode to lines being written (thread-safe)
+
+        Args:
+            items: Lines being written, oldest first
+
+        Returns:
+            (lines to stage, number of the oldest staged lines to discard
+            first; only drop_oldest discards staged lines)
+        """
+        with self.lock:
+            self._refill()
+            count = len(items)
+            self.received += count
+            allowed = min(count, max(0, int(self._tokens)))
+            self._tokens -= allowed
+            excess = count - allowed
+            if not excess:
+                return items, 0
+            self.dropped += excess
+            if self.mode == self.DROP_OLDEST:
+                return items, excess
+            if self.mode == self.DROP_NEWEST:
+                return items[:allowed], 0
+            kept = items[:allowed] + self._sample(items[allowed:])
+            return kept, 0
+
+    def get_stats(self) -> Dict:
+        """Get counters and settings (thread-safe)
+
+        Returns:
+            Dict with mode, rate, received, dropped, sampled, blocked and blocked_time
+        """
+        with self.lock:
+            return {
+                "mode": self.mode,
+                "rate": self.rate,
+                "received": self.received,
+                "dropped": self.dropped,
+                "sampled": self.sampled,
+                "blocked": self.blocked,
+                "blocked_time": self.blocked_time,
+            }
+
+    def reset_stats(self) -> None:
+        """Zero the counters (thread-safe)"""
+        with self.lock:
+            self.received = self.dropped = self.sampled = self.blocked = 0
+            self.blocked_time = 0.0
+
+    def _refill(self) -> None:
+        """Add tokens earned since the last call (call with lock held)"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def _sample(self, items: List[tuple]) -> List[tuple]:
+        """Keep over-rate lines with probability rate / arrival rate (call with lock held)
+
+        Kept lines are charged to the bucket, and nothing is kept once the
+        debt reaches a full burst, so sampling cannot exceed the rate for long.
+        """
+        now = self._refilled
+        self._window_arrivals += len(items)
+        # The current window counts from its first line, with a floor so one line cannot spike the rate
+        elapsed = max(now - self._window_start, 1 / self.rate)
+        arrival_rate = max(self._arrival_rate, self._window_arrivals / elapsed)
+        if now - self._window_start >= 1.0:
+            self._arrival_rate = self._window_arrivals / elapsed
+            self._window_start = now
+            self._window_arrivals = 0
+        chance = self.rate / max(self.rate, arrival_rate)
+        kept = []
+        for item in items:
+            if self._tokens - 1 < -self.burst:
+                break
+            if self._random.random() < chance:
+                kept.append(item)
+                self._tokens -= 1
+        self.sampled += len(kept)
+        self.dropped -= len(kept)
+        return kept
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
@@ -0,0 +1,221 @@
+import hashlib
+import re
+import threading
+from collections import deque
+from typing import IO, Callable, Deque, Dict, List, Optional, cast
+from rich.cells import get_character_cell_size
+from rich.console import Console
+
+# CSI sequences, other two-byte escapes, or a single character
+_TOKEN_RE = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]|\x1b[^\[]|[^\x1b]", re.S)
+
+
+class OffscreenTerminal:
+    """Thread-safe in-memory terminal for headless rendering
+
+    Stands in for a real TTY so a TerminalSplitter can render frames on CI
+    boxes and in benchmarks. Every frame is recorded (bounded by
+    ``max_frames``) along with byte counts, and the output is replayed onto
+    a character grid so the visible screen can be inspected and hashed.
+
+    Usage:
+        terminal = OffscreenTerminal(120, 40)
+        splitter = TerminalSplitter(terminal=terminal)
+        splitter.render_frame()
+        print(terminal.get_text())
+    """
+
+    def __init__(
+        self,
+        width: int = 80,
+        height: int = 24,
+        max_frames: int = 100,
+        emulate: bool = True
+    ) -> None:
+        """Initialize offscreen terminal
+
+        Args:
+            width: Columns
+            height: Rows
+            max_frames: Number of recent frames to keep
+            emulate: Whether to replay output onto the screen grid
+                (disable for pure throughput benchmarks)
+        """
+        self.width: int = width
+        self.height: int = height
+        self.emulate: bool = emulate
+        self.lock: threading.RLock = threading.RLock()
+        self.frames: Deque[str] = deque(maxlen=max_frames)
+        self.frame_count: int = 0
+        self.bytes_written: int = 0  # All output, including non-frame control codes
+        self.frame_bytes: int = 0    # Output written as frames
+        self.console: Console = Console(
+            file=cast(IO[str], self),  # Console only needs write(), flush() and isatty()
+            width=width,
+            height=height,
+            force_terminal=True,
+            force_interactive=False,
+            color_system="truecolor",
+            legacy_windows=False,
+        )
+        self._screen: List[List[str]] = self._blank(width, height)
+        self._row: int = 0
+        self._col: int = 0
+        self._resize_listeners: List[Callable[[], None]] = []
+
+    # File-like interface used by the Console -------------------------------
+
+    def write(self, data: str) -> int:
+        """Write raw output (thread-safe)"""
+        with self.lock:
+            self.bytes_written += len(data.encode("utf-8"))
+            if self.emulate:
+                self._apply(data)
+        return len(data)
+
+    def flush(self) -> None:
+        """No-op flush"""
+
+    def isatty(self) -> bool:
+        """Offscreen terminals are not TTYs"""
+        return False
+
+    # Frame recording --------------------------------------------------------
+
+    def write_frame(self, data: str) -> None:
+        """Write one rendered frame (thread-safe)
+
+        Args:
+            data: Output for the whole frame
+        """
+        with self.lock:
+            self.write(data)
+            self.frames.append(data)
+            self.frame_count += 1
+            self.frame_bytes += len(data.encode("utf-8"))
+
+    def get_last_frame(self) -> Optional[str]:
+        """Get the output of the most recent frame (thread-safe)"""
+        with self.lock:
+            return self.frames[-1] if self.frames else None
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get output statistics (thread-safe)
+
+        Returns:
+            Dict with frames, bytes and average bytes per frame
+        """
+        with self.lock:
+            return {
+                "frames": self.frame_count,
+                "bytes_written": self.bytes_written,
+                "frame_bytes": self.frame_bytes,
+                "avg_bytes_per_frame": (
+                    self.frame_bytes / self.frame_count if self.frame_count else 0
+                ),
+            }
+
+    def reset_stats(self) -> None:
+        """Clear recorded frames and counters, keeping the screen (thread-safe)"""
+        with self.lock:
+            self.frames.clear()
+            self.frame_count = 0
+            self.bytes_written = 0
+            self.frame_bytes = 0
+
+    # Screen inspection ------------------------------------------------------
+
+    def get_text(self) -> List[str]:
+        """Get the visible screen as plain text lines (thread-safe)
+
+        Returns:
+            One string per row
+        """
+        with self.lock:
+            return ["".join(row) for row in self._screen]
+
+    def screen_hash(self) -> str:
+        """Get a stable hash of the visible screen text (thread-safe)
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        return hashlib.sha256("\n".join(self.get_text()).encode("utf-8")).hexdigest()
+
+    def resize(self, width: int, height: int) -> None:
+        """Resize the terminal and notify listeners (thread-safe)
+
+        Args:
+            width: New column count
+            height: New row count
+        """
+        with self.lock:
+            self.width, self.height = width, height
+            self.console.size = (width, height)
+            self._screen = self._blank(width, height)
+            self._row = self._col = 0
+            listeners = list(self._resize_listeners)
+        for listener in listeners:
+            listener()
+
+    def add_resize_listener(self, listener: Callable[[], None]) -> None:
+        """Register a callback fired after resize() (thread-safe)"""
+        with self.lock:
+            self._resize_listeners.append(listener)
+
+    def remove_resize_listener(self, listener: Callable[[], None]) -> None:
+        """Unregister a resize callback (thread-safe)"""
+        with self.lock:
+            if listener in self._resize_listeners:
+                self._resize_listeners.remove(listener)
+
+    # Minimal VT emulation ---------------------------------------------------
+
+    @staticmethod
+    def _blank(width: int, height: int) -> List[List[str]]:
+        return [[" "] * width for _ in range(height)]
+
+    def _apply(self, data: str) -> None:
+        """Replay cursor movement, clears and text onto the screen grid"""
+        screen = self._screen
+        width, height = self.width, self.height
+        row, col = self._row, self._col
+
+        for token in _TOKEN_RE.findall(data):
+            if token[0] == "\x1b":
+                final = token[-1]
+                params = token[2:-1]
+                if final == "H":
+                    parts = params.split(";") if params else []
+                    row = int(parts[0] or 1) - 1 if parts else 0
+                    col = int(parts[1] or 1) - 1 if len(parts) > 1 else 0
+                    row = min(max(row, 0), height - 1)
+                    col = min(max(col, 0), width - 1)
+                elif final == "J" and params == "2":
+                    for line in screen:
+                        line[:] = [" "] * width
+                continue  # SGR and other modes do not affect text
+            if token == "\n":
+                row = min(row + 1, height - 1)
+                col = 0
+                continue
+            if token == "\r":
+                col = 0
+                continue
+            cell_width = get_character_cell_size(token)
+            if cell_width == 0:
+                if col > 0:
+                    screen[row][col - 1] += token
+                continue
+            if col + cell_width > width:
+                continue
+            screen[row][col] = token
+            if cell_width == 2:
+                screen[row][col + 1] = ""
+            col = min(col + cell_width, width - 1)
+
+        self._row, self._col = row, col
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+class TerminalWriter:
+    """Thread-safe frame writer with byte accounting and a bandwidth budget
+
+    Each frame is written with a single call, optionally wrapped in the
+    synchronized-output sequences (DEC mode 2026) so terminals that support
+    them swap the whole frame in at once. Bytes are counted per frame and over
+    a sliding window; when a bytes-per-second budget is set, effective_fps()
+    tells the render loop how far to slow down so output never queues up on a
+    congested link.
+    """
+
+    SYNC_BEGIN = "\x1b[?2026h"
+    SYNC_END = "\x1b[?2026l"
+    SMOOTHING = 0.3  # Weight of the newest frame in the moving average of frame sizes
+
+    def __init__(
+        self,
+        write: Callable[[str], Any],
+        synchronized: bool = False,
+        max_bytes_per_second: Optional[int] = None,
+        window: float = 1.0,
+        min_fps: float = 1.0
+    ) -> None:
+        """Initialize writer
+
+        Args:
+            write: Function that writes and flushes a string to the terminal
+            synchronized: Wrap frames in synchronized-output sequences
+            max_bytes_per_second: Output budget, or None for unlimited
+            window: Seconds of history used for the bytes-per-second rate
+            min_fps: Lowest frame rate the budget may throttle down to
+        """
+        self._write: Callable[[str], Any] = write
+        self.synchronized: bool = synchronized
+        self.max_bytes_per_second: Optional[int] = max_bytes_per_second
+        self.window: float = window
+        self.min_fps: float = min_fps
+        self.lock: threading.RLock = threading.RLock()
+        self.frames: int = 0
+        self.total_bytes: int = 0
+        self.last_frame_bytes: int = 0
+        self._recent: Deque[Tuple[float, int]] = deque()  # (monotonic time, bytes)
+        self._recent_bytes: int = 0
+        self._avg_frame_bytes: float = 0.0  # Moving average used for throttling
+
+    def write_frame(self, data: str) -> int:
+        """Write one frame in a single call (thread-safe)
+
+        Args:
+            data: Rendered frame output; empty frames are counted but not written
+
+        Returns:
+            Bytes written
+        """
+        if data:
+            if self.synchronized:
+                data = f"{self.SYNC_BEGIN}{data}{self.SYNC_END}"
+            size = len(data) if data.isascii() else len(data.encode("utf-8"))
+            self._write(data)
+        else:
+            size = 0
+
+        now = time.monotonic()
+        with self.lock:
+            self.frames += 1
+            self.total_bytes += size
+            self.last_frame_bytes = size
+            self._recent.append((now, size))
+            self._recent_bytes += size
+            self._expire(now)
+            if self.frames == 1:
+                self._avg_frame_bytes = size
+            else:
+                self._avg_frame_bytes += self.SMOOTHING * (size - self._avg_frame_bytes)
+        return size
+
+    def get_bytes_per_second(self) -> float:
+        """Get output rate over the sliding window (thread-safe)
+
+        Returns:
+            Bytes per second
+        """
+        with self.lock:
+            self._expire(time.monotonic())
+            return self._recent_bytes / self.window
+
+    def get_avg_frame_bytes(self) -> float:
+        """Get the moving average of bytes per frame (thread-safe)"""
+        with self.lock:
+            return self._avg_frame_bytes
+
+    def effective_fps(self, fps: float) -> float:
+        """Get the frame rate that keeps output within the budget (thread-safe)
+
+        Args:
+            fps: Requested maximum frames per second
+
+        Returns:
+            fps, lowered when recent frames are too large for the budget
+        """
+        if not self.max_bytes_per_second:
+            return fps
+        avg_frame = self.get_avg_frame_bytes()
+        if avg_frame <= 0:
+            return fps
+        allowed = self.max_bytes_per_second / avg_frame
+        return max(self.min_fps, min(fps, allowed))
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get output statistics (thread-safe)
+
+        Returns:
+            Dict with frame and byte counters
+        """
+        with self.lock:
+            return {
+                "frames_written": self.frames,
+                "total_bytes": self.total_bytes,
+                "bytes_last_frame": self.last_frame_bytes,
+                "avg_bytes_per_frame": self.get_avg_frame_bytes(),
+                "bytes_per_second": self.get_bytes_per_second(),
+            }
+
+    def reset(self) -> None:
+        """Reset counters (thread-safe)"""
+        with self.lock:
+            self.frames = 0
+            self.total_bytes = 0
+            self.last_frame_bytes = 0
+            self._recent.clear()
+            self._recent_bytes = 0
+            self._avg_frame_bytes = 0.0
+
+    def _expire(self, now: float) -> None:
+        """Drop samples older than the window (call with lock held)"""
+        cutoff = now - self.window
+        recent = self._recent
+        while recent and recent[0][0] < cutoff:
+            self._recent_bytes -= recent.popleft()[1]
+
+
+def supports_synchronized_output(console) -> bool:
+    """Guess whether a console's terminal understands synchronized output
+
+    Terminals ignore unknown private modes, so this only rules out targets
+    where the sequences would be visible or pointless.
+
+    Args:
+        console: Rich Console
+
+    Returns:
+        True if frames should be wrapped in DEC mode 2026
+    """
+    if not console.is_terminal or console.legacy_windows:
+        return False
+    term = os.environ.get("TERM", "")
+    return term not in ("", "dumb", "linux")
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
@@ -1,11 +1,70 @@
 import threading
 import asyncio
-from typing import Optional, List, Tuple, Callable
+import concurrent.futures
+import time
+from collections import deque
+from itertools import chain, repeat
+from typing import TYPE_CHECKING, Optional, List, Tuple, Callable, Dict, Set
+from .dispatch import DISPATCHER
+from .wrap import measure_rows
 from ..ui.themes import Theme, get_theme
 from ..utils.buffer import CircularBuffer
+from ..utils.scrollback import ScrollbackTier
+from ..utils.log_index import LogIndex
+from ..utils.row_index import RowIndex
+from ..utils.collapse import RepeatCollapser
+from .ingest import IngestPolicy
+
+if TYPE_CHECKING:
+    from .view import PaneView
+
+# Listener receiving (lines, start_seq, end_seq) for each committed batch
+WriteListener = Callable[[List[Tuple[str, str]], int, int], None]
+
+
+def _record_listener_failure(future: "concurrent.futures.Future") -> None:
+    """Count the exception of a finished async write listener on the dispatcher"""
+    error = None if future.cancelled() else future.exception()
+    if error is not None:
+        DISPATCHER.record_error(error)
+
 
 class Pane:
-    """Thread-safe pane for displaying content with circular buffer"""
+    """Thread-safe pane for displaying content with circular buffer
+    
+    Writes go to a lock-free staging queue and are committed into the buffer
+    in one batch (one lock, one version bump) the next time the pane is
+    read, e.g. once per rendered frame, or when the queue reaches
+    ``STAGE_LIMIT`` lines. Many threads can write to the same pane without
+    handing the pane lock back and forth.
+    
+    Write listeners receive each committed batch from a background
+    dispatcher thread, outside the pane lock, so slow subscribers never
+    hold up writers.
+    
+    Each line gets a sequence number when committed that stays fixed as
+    older lines are evicted (see CircularBuffer). Listeners, by_seq search
+    and filter results, and get_lines_since() all use these numbers.
+    
+    Once the renderer reports the pane's content width (set_viewport()),
+    ``scrollback`` counts screen rows of wrapped lines rather than logical
+    lines. Row counts are measured once per line and kept in a RowIndex, so
+    scrolling, percentage jumps and the visible window are O(log n); only a
+    width change remeasures. Row scrolling covers the lines held in memory;
+    lines moved to a history tier stay reachable by sequence number and
+    search.
+    
+    With enable_collapse(), consecutive repeated lines are merged at commit
+    time into one line carrying a repeat counter (see RepeatCollapser). The
+    run's line is rewritten in place, keeping its sequence number; write
+    listeners only receive the first occurrence.
+    
+    An IngestPolicy (set_ingest_policy()) caps how many lines per second
+    are staged, by blocking, dropping or sampling writers over the rate.
+    """
+    
+    STAGE_LIMIT = 1024  # Staged lines that force a commit without waiting for a read
+    MEASURE_CHUNK = 256  # History lines measured together when scrolling reaches them
     
     def __init__(
         self,
@@ -15,7 +74,10 @@ class Pane:
         color: str = "white",
         border: bool = True,
         theme_name: str = "dark",
-        max_lines: int = 1000
+        max_lines: int = 1000,
+        compact: bool = False,
+        history: Optional[ScrollbackTier] = None,
+        indexed: bool = False
     ) -> None:
         self.id: str = id
         self.width: float = width
@@ -24,22 +86,412 @@ class Pane:
         self.border: bool = border
         self.lock: threading.RLock = threading.RLock()
         self.theme: Theme = get_theme(theme_name)
-        self.buffer: CircularBuffer = CircularBuffer(max_size=max_lines)
+        self.buffer: CircularBuffer = CircularBuffer(
+            max_size=max_lines, compact=compact, history=history, indexed=indexed
+        )
         self.focused: bool = False
-        self.scrollback: int = 0  # Current scroll position
+        self.scrollback: int = 0  # Current scroll position (rows once wrap_width is set)
+        self.wrap_width: Optional[int] = None  # Content width in cells, set by the renderer
+        self.viewport_rows: int = 0  # Content rows on screen, set by the renderer
+        self._row_index: Optional[RowIndex] = None  # Wrapped rows per line at wrap_width
+        self._estimated_end: int = 0  # History lines below this seq start as one estimated row
+        self._measured_chunks: Set[int] = set()  # seq // MEASURE_CHUNK of measured history chunks
         self.last_rendered_version: int = 0  # Track changes for optimization
         self.on_write_callback: Optional[Callable] = None  # Optional callback
+        self._change_listeners: List[Callable[[], None]] = []  # Render wakeups
+        self._staged: deque = deque()  # Lines written but not yet committed to the buffer
+        self._write_listeners: List[Tuple[Callable, Optional[asyncio.AbstractEventLoop]]] = []
+        self._batches: deque = deque()  # (lines, start_seq, end_seq) awaiting delivery
+        self._dispatch_pending: bool = False
+        self._views: Dict[str, "PaneView"] = {}  # Named PaneViews filtering this pane
+        self.log_index: Optional[LogIndex] = None  # Level/time index for write_record() lines
+        self.collapser: Optional[RepeatCollapser] = None  # Merges repeated lines when enabled
+        self.ingest_policy: Optional[IngestPolicy] = None  # Rate limit for writes
     
-    def write(self, message: str, style: Optional[str] = None) -> None:
-        """Synchronous write to pane (thread-safe)"""
+    def add_change_listener(self, listener: Callable[[], None]) -> None:
+        """Register a callback fired after any visible change (thread-safe)
+        
+        Listeners are called outside the pane lock, from the thread that made
+        the change, and must be cheap (e.g. FrameScheduler.request_frame).
+        
+        Args:
+            listener: Function taking no arguments
+        """
+        with self.lock:
+            if listener not in self._change_listeners:
+                self._change_listeners = self._change_listeners + [listener]
+    
+    def remove_change_listener(self, listener: Callable[[], None]) -> None:
+        """Unregister a change listener (thread-safe)
+        
+        Args:
+            listener: Previously registered function
+        """
+        with self.lock:
+            self._change_listeners = [l for l in self._change_listeners if l != listener]
+    
+    def _notify_change(self) -> None:
+        """Fire change listeners (call without holding the pane lock)"""
+        for listener in self._change_listeners:
+            listener()
+    
+    def add_write_listener(
+        self,
+        listener: Callable,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> None:
+        """Subscribe to batches of newly written lines (thread-safe)
+        
+        The listener is called as ``listener(lines, start_seq, end_seq)``
+        with the (message, style) lines of each committed batch and their
+        sequence range ``[start_seq, end_seq)``. Sync listeners run on the
+        dispatcher thread; coroutine functions are scheduled on ``loop``.
+        
+        Args:
+            listener: Function or coroutine function
+            loop: Event loop for a coroutine listener (defaults to the running loop)
+            
+        Raises:
+            ValueError: If an async listener is added without an event loop
+        """
+        if asyncio.iscoroutinefunction(listener):
+            if loop is None:
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    raise ValueError("Async write listeners need an event loop") from None
+        else:
+            loop = None
+        with self.lock:
+            self._commit_staged()  # Listeners only see lines written after subscribing
+            if all(l != listener for l, _ in self._write_listeners):
+                self._write_listeners = self._write_listeners + [(listener, loop)]
+    
+    def remove_write_listener(self, listener: Callable) -> None:
+        """Unsubscribe a write listener (thread-safe)
+        
+        Args:
+            listener: Previously added listener
+        """
+        with self.lock:
+            self._write_listeners = [(l, loop) for l, loop in self._write_listeners if l != listener]
+    
+    def flush_listeners(self, timeout: Optional[float] = None) -> bool:
+        """Commit staged lines and wait until listeners have received them (thread-safe)
+        
+        Args:
+            timeout: Maximum seconds to wait (None = forever)
+            
+        Returns:
+            True if delivery caught up, False on timeout
+        """
+        self._commit_staged()
+        return DISPATCHER.wait_idle(timeout)
+    
+    def _has_subscribers(self) -> bool:
+        return bool(self._write_listeners) or self.on_write_callback is not None
+    
+    def _request_dispatch(self) -> None:
+        """Schedule delivery of pending batches unless already scheduled"""
+        if not self._dispatch_pending:
+            self._dispatch_pending = True
+            DISPATCHER.schedule(self)
+    
+    def _commit_staged(self) -> None:
+        """Move staged lines into the buffer in one batch (thread-safe)"""
+        staged = self._staged
+        if not staged:
+            return
         with self.lock:
-            self.buffer.append(message, style or self.color)
-            if self.on_write_callback:
-                self.on_write_callback(message, style or self.color)
+            # popleft is atomic, so producers can keep appending meanwhile
+            batch = [staged.popleft() for _ in range(len(staged))]
+            if self.collapser is not None and batch:
+                replaced, batch = self.collapser.collapse(batch)
+                if replaced is not None:
+                    self._replace_last(*replaced)
+            if not batch:
+                return
+            start = self.buffer.appended
+            log_index = self.log_index
+            if log_index is not None:
+                batch = self._index_records(log_index, batch, start)
+            self.buffer.extend(batch)
+            if log_index is not None:
+                log_index.discard_before(self.buffer.get_first_seq())
+            if self._has_subscribers():
+                self._batches.append((batch, start, self.buffer.appended))
+                self._request_dispatch()
+    
+    def _replace_last(self, message: str, style: str) -> None:
+        """Rewrite the newest committed line, keeping row counts current (call with lock held)"""
+        seq = self.buffer.replace_last(message, style)
+        index = self._row_index
+        width = self.wrap_width
+        if seq is not None and index is not None and width is not None and index.next_seq == seq + 1:
+            index.set_last(measure_rows(message, style, width))
+    
+    def _index_records(self, log_index: LogIndex, batch: list, start: int) -> List[Tuple[str, str]]:
+        """Index (message, style, level, timestamp) records of a batch (call with lock held)
+        
+        Returns:
+            The batch as plain (message, style) lines
+        """
+        records = []
+        lines = []
+        for seq, item in enumerate(batch, start):
+            if len(item) == 4:
+                records.append((seq, item[2], item[3]))
+                item = item[:2]
+            lines.append(item)
+        log_index.add_many(records)
+        return lines
+    
+    def _deliver_batches(self) -> None:
+        """Commit staged lines and hand pending batches to listeners (dispatcher thread)"""
+        self._dispatch_pending = False  # Clear first so later writes reschedule
+        self._commit_staged()
+        batches = self._batches
+        while batches:
+            lines, start, end = batches.popleft()
+            callback = self.on_write_callback
+            for listener, loop in self._write_listeners:
+                try:
+                    if loop is None:
+                        listener(lines, start, end)
+                    else:
+                        future = asyncio.run_coroutine_threadsafe(listener(lines, start, end), loop)
+                        future.add_done_callback(_record_listener_failure)
+                except Exception as e:
+                    DISPATCHER.record_error(e)  # Subscriber errors must not stop delivery
+            if callback is not None:
+                for message, style in lines:
+                    try:
+                        callback(message, style)
+                    except Exception as e:
+                        DISPATCHER.record_error(e)
+    
+    def write(self, message: str, style: Optional[str] = None) -> None:
+        """Synchronous write to pane (thread-safe)
+        
+        The line is staged without taking the pane lock; readers see it as
+        soon as they next read the pane. With a block ingest policy the call
+        may sleep until the line fits the rate, except on a running event
+        loop, where it never sleeps; use awrite() there to wait.
+        """
+        items = [(message, style or self.color)]
+        if self.ingest_policy is not None:
+            items = self._admit(items)
+        self._stage(items)
     
     async def awrite(self, message: str, style: Optional[str] = None) -> None:
-        """Asynchronous write to pane (thread-safe)"""
-        await asyncio.to_thread(self.write, message, style)
+        """Asynchronous write to pane (thread-safe, completes inline)
+        
+        With a block ingest policy this awaits instead of blocking the loop.
+        """
+        items = [(message, style or self.color)]
+        if self.ingest_policy is not None:
+            items = await self._aadmit(items)
+        self._stage(items)
+    
+    def set_ingest_policy(self, policy: Optional[IngestPolicy]) -> None:
+        """Set or remove the rate limit applied to writes (thread-safe)
+        
+        Args:
+            policy: IngestPolicy, or None to accept every write
+        """
+        with self.lock:
+            self.ingest_policy = policy
+    
+    def get_ingest_stats(self) -> Dict:
+        """Get the ingest policy's counters (thread-safe)
+        
+        Returns:
+            IngestPolicy.get_stats() dict, or an empty dict without a policy
+        """
+        policy = self.ingest_policy
+        return policy.get_stats() if policy is not None else {}
+    
+    def _admit(self, items: list) -> list:
+        """Apply the ingest policy to lines being written, sleeping in block mode
+        
+        On a running event loop, where time.sleep() would stall every other
+        task, block mode stages the lines without waiting. They still count
+        as blocked, and their debt delays later writers.
+        
+        Returns:
+            Lines to stage
+        """
+        policy = self.ingest_policy
+        if policy is None:
+            return items
+        if policy.mode == IngestPolicy.BLOCK:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                on_loop = False
+            else:
+                on_loop = True
+            delay = policy.reserve(len(items), wait=not on_loop)
+            if delay > 0 and not on_loop:
+                time.sleep(delay)
+            return items
+        return self._select(policy, items)
+    
+    async def _aadmit(self, items: list) -> list:
+        """Apply the ingest policy to lines being written, awaiting in block mode"""
+        policy = self.ingest_policy
+        if policy is None:
+            return items
+        if policy.mode == IngestPolicy.BLOCK:
+            delay = policy.reserve(len(items))
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return items
+        return self._select(policy, items)
+    
+    def _select(self, policy: IngestPolicy, items: list) -> list:
+        """Apply a non-blocking policy, discarding the oldest staged lines for drop_oldest"""
+        items, evict = policy.select(items)
+        if evict:
+            with self.lock:
+                # Under the lock so a commit cannot pop the same lines
+                staged = self._staged
+                while evict and staged:
+                    staged.popleft()
+                    evict -= 1
+            items = items[evict:]
+        return items
+    
+    def _stage(self, items: list) -> None:
+        """Stage admitted lines, committing if the queue is full (thread-safe)
+        
+        Every write method ends here, without taking the pane lock unless the
+        queue is full.
+        """
+        if not items:
+            return
+        self._staged.extend(items)
+        if len(self._staged) >= self.STAGE_LIMIT:
+            self._commit_staged()
+        elif self._has_subscribers():
+            self._request_dispatch()
+        self._notify_change()
+    
+    def enable_log_index(self) -> LogIndex:
+        """Start indexing write_record() lines by level and time (thread-safe)
+        
+        Returns:
+            The pane's LogIndex (created on first call)
+        """
+        with self.lock:
+            if self.log_index is None:
+                self.log_index = LogIndex()
+            return self.log_index
+    
+    def enable_collapse(self, template: bool = False) -> RepeatCollapser:
+        """Start merging consecutive repeated lines into one line (thread-safe)
+        
+        Lines already staged are committed first, so only later writes are
+        merged.
+        
+        Args:
+            template: Also merge lines that differ only in digits
+            
+        Returns:
+            The pane's RepeatCollapser
+        """
+        with self.lock:
+            self._commit_staged()
+            if self.collapser is None or self.collapser.template != template:
+                self.collapser = RepeatCollapser(template)
+            return self.collapser
+    
+    def disable_collapse(self) -> None:
+        """Stop merging repeated lines (thread-safe)"""
+        with self.lock:
+            self._commit_staged()
+            self.collapser = None
+    
+    def write_record(self, message: str, style: Optional[str], level: int, timestamp: float) -> None:
+        """Write a line with its level id and epoch timestamp (thread-safe)
+        
+        With a log index (see enable_log_index()) the level and timestamp are
+        indexed when the line is committed; otherwise this is write().
+        
+        Args:
+            message: Message text
+            style: Style/color identifier (None = pane color)
+            level: Level id (0-255)
+            timestamp: Epoch seconds
+        """
+        items = [self._record(message, style, level, timestamp)]
+        if self.ingest_policy is not None:
+            items = self._admit(items)
+        self._stage(items)
+    
+    async def awrite_record(self, message: str, style: Optional[str], level: int, timestamp: float) -> None:
+        """Asynchronous write_record (thread-safe, completes inline)"""
+        items = [self._record(message, style, level, timestamp)]
+        if self.ingest_policy is not None:
+            items = await self._aadmit(items)
+        self._stage(items)
+    
+    def _record(self, message: str, style: Optional[str], level: int, timestamp: float) -> tuple:
+        """Build the staged item for write_record(): a plain line unless a log index is set"""
+        if self.log_index is None:
+            return message, style or self.color
+        return message, style or self.color, level, timestamp
+    
+    def count_log_lines(
+        self,
+        level: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> int:
+        """Count indexed lines by level id and time range (thread-safe)
+        
+        Args:
+            level: Level id, or None for all levels
+            since: Earliest epoch timestamp, inclusive (None = no bound)
+            until: Latest epoch timestamp, exclusive (None = no bound)
+            
+        Returns:
+            Number of matching lines still in the pane (0 without a log index)
+        """
+        with self.lock:
+            self._commit_staged()
+            if self.log_index is None:
+                return 0
+            return self.log_index.count(level, since, until)
+    
+    def get_log_lines(
+        self,
+        level: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[int, str, str]]:
+        """Get indexed lines by level id and time range (thread-safe)
+        
+        Args:
+            level: Level id, or None for all levels
+            since: Earliest epoch timestamp, inclusive (None = no bound)
+            until: Latest epoch timestamp, exclusive (None = no bound)
+            limit: Return only the most recent ``limit`` lines (None = all)
+            
+        Returns:
+            List of (seq, message, style) tuples, oldest first
+        """
+        with self.lock:
+            self._commit_staged()
+            if self.log_index is None:
+                return []
+            lines = []
+            for seq in self.log_index.seqs(level, since, until, limit):
+                line = self.buffer.get_by_seq(seq)
+                if line is not None:
+                    lines.append((seq, line[0], line[1]))
+            return lines
     
     def write_many(self, messages: List[Tuple[str, str]]) -> None:
         """Write multiple messages efficiently (thread-safe)
@@ -47,112 +499,391 @@ class Pane:
         Args:
             messages: List of (message, style) tuples
         """
-        with self.lock:
-            for message, style in messages:
-                self.buffer.append(message, style)
-                if self.on_write_callback:
-                    self.on_write_callback(message, style)
+        items = messages
+        if self.ingest_policy is not None:
+            items = self._admit(list(messages))
+        self._stage(items)
     
     async def awrite_many(self, messages: List[Tuple[str, str]]) -> None:
-        """Asynchronous write multiple messages (thread-safe)"""
-        await asyncio.to_thread(self.write_many, messages)
+        """Asynchronous write multiple messages (thread-safe, completes inline)"""
+        items = messages
+        if self.ingest_policy is not None:
+            items = await self._aadmit(list(messages))
+        self._stage(items)
     
     def clear(self) -> None:
         """Clear pane content (thread-safe)"""
         with self.lock:
+            self._staged.clear()
             self.buffer.clear()
+            if self.log_index is not None:
+                self.log_index.clear()
+            if self.collapser is not None:
+                self.collapser.reset()
             self.scrollback = 0
             self.last_rendered_version = 0
+        self._notify_change()
     
     async def aclear(self) -> None:
-        """Asynchronous clear (thread-safe)"""
-        await asyncio.to_thread(self.clear)
+        """Asynchronous clear (thread-safe, completes inline)"""
+        self.clear()
     
     def set_focus(self, focused: bool) -> None:
         """Set focus state (thread-safe)"""
         with self.lock:
             self.focused = focused
+        self._notify_change()
     
     async def aset_focus(self, focused: bool) -> None:
-        """Asynchronous set focus (thread-safe)"""
-        await asyncio.to_thread(self.set_focus, focused)
+        """Asynchronous set focus (thread-safe, completes inline)"""
+        self.set_focus(focused)
+    
+    def set_viewport(self, width: int, rows: int) -> None:
+        """Record the pane's on-screen content size (thread-safe)
+        
+        Called by the renderer each time the pane is laid out. The first
+        call switches scrolling to wrapped screen rows; cached row counts are
+        dropped only when the width changes.
+        
+        Args:
+            width: Content width in cells
+            rows: Content rows
+        """
+        width = max(1, width)
+        with self.lock:
+            if width != self.wrap_width:
+                self.wrap_width = width
+                self._row_index = None
+            self.viewport_rows = max(0, rows)
+    
+    def _sync_rows(self) -> Optional[RowIndex]:
+        """Measure lines committed since the last call (call with lock held)
+        
+        Only lines in the buffer's in-memory ring are measured up front, so a
+        large history tier costs nothing on a width change. History lines
+        count as one row each until scrolling reaches them (see
+        ``_measure_history``). A new index is bulk-loaded in one pass.
+        
+        Returns:
+            Up-to-date RowIndex, or None if no wrap width is set
+        """
+        self._commit_staged()
+        if self.wrap_width is None:
+            return None
+        buffer = self.buffer
+        first_seq = buffer.get_first_seq()
+        width = self.wrap_width
+        index = self._row_index
+        if index is None or index.next_seq < first_seq:
+            ring_seq = buffer.get_ring_first_seq()
+            lines = buffer.get_since(ring_seq)
+            index = self._row_index = RowIndex(
+                first_seq,
+                chain(
+                    repeat(1, ring_seq - first_seq),
+                    (measure_rows(message, style, width) for _, message, style in lines),
+                ),
+            )
+            self._estimated_end = ring_seq
+            self._measured_chunks = set()
+            return index
+        new_lines = buffer.get_since(index.next_seq)
+        if new_lines:
+            index.extend(measure_rows(message, style, width) for _, message, style in new_lines)
+        index.discard_before(first_seq)
+        return index
+    
+    def _measure_window(self, index: RowIndex, height: int) -> bool:
+        """Measure estimated history lines under the current window (call with lock held)
+        
+        History lines are read MEASURE_CHUNK at a time, so scrolling row by
+        row does not re-read the history tier on every step. Measuring only
+        changes rows above the bottom of the window, which stays put, so
+        callers repeat until nothing new is measured.
+        
+        Returns:
+            True if any row counts changed
+        """
+        first_seq = self.buffer.get_first_seq()
+        if first_seq >= self._estimated_end:
+            return False
+        total = index.rows_between(first_seq, index.next_seq)
+        bottom = max(0, total - self.scrollback)
+        top = max(0, bottom - height)
+        if bottom <= top:
+            return False
+        top_seq, _ = index.find(first_seq, top)
+        end_seq = min(index.find(first_seq, bottom - 1)[0], self._estimated_end - 1)
+        chunk = self.MEASURE_CHUNK
+        width = self.wrap_width or 1
+        measured = False
+        for number in range(top_seq // chunk, end_seq // chunk + 1):
+            if number in self._measured_chunks:
+                continue
+            self._measured_chunks.add(number)
+            start = max(first_seq, number * chunk)
+            end = min(self._estimated_end, (number + 1) * chunk)
+            lines = self.buffer.get_since(start, limit=end - start)
+            if lines:
+                index.assign(lines[0][0], (measure_rows(message, style, width) for _, message, style in lines))
+                measured = True
+        return measured
+    
+    def _scroll_extent(self) -> int:
+        """Get total rows (or lines without a wrap width) (call with lock held)"""
+        index = self._sync_rows()
+        if index is None:
+            return len(self.buffer)
+        return index.rows_between(self.buffer.get_first_seq(), index.next_seq)
+    
+    def get_total_rows(self) -> int:
+        """Get the screen rows of all content at the current width, or lines if none is set (thread-safe)"""
+        with self.lock:
+            return self._scroll_extent()
     
     def scroll(self, direction: int, amount: int = 1) -> None:
         """Scroll pane content (thread-safe)
         
         Args:
             direction: -1 for up, +1 for down
-            amount: Number of lines to scroll
+            amount: Number of screen rows to scroll (lines until a width is set)
         """
         with self.lock:
-            buffer_len = len(self.buffer)
-            self.scrollback = max(0, min(self.scrollback + (direction * amount), buffer_len))
+            extent = self._scroll_extent()
+            self.scrollback = max(0, min(self.scrollback + (direction * amount), extent))
+        self._notify_change()
     
     async def ascroll(self, direction: int, amount: int = 1) -> None:
-        """Asynchronous scroll (thread-safe)"""
-        await asyncio.to_thread(self.scroll, direction, amount)
+        """Asynchronous scroll (thread-safe, completes inline)"""
+        self.scroll(direction, amount)
+    
+    def scroll_to_fraction(self, fraction: float) -> None:
+        """Jump to a relative position, 0.0 = oldest content, 1.0 = newest (thread-safe)
+        
+        Args:
+            fraction: Position between 0.0 and 1.0
+        """
+        fraction = min(1.0, max(0.0, fraction))
+        with self.lock:
+            # Measuring the target may grow the extent, so settle the position
+            while True:
+                extent = max(0, self._scroll_extent() - self.viewport_rows)
+                self.scrollback = round((1.0 - fraction) * extent)
+                index = self._row_index
+                if index is None or not self._measure_window(index, self.viewport_rows):
+                    break
+        self._notify_change()
+    
+    async def ascroll_to_fraction(self, fraction: float) -> None:
+        """Asynchronous scroll to fraction (thread-safe, completes inline)"""
+        self.scroll_to_fraction(fraction)
+    
+    def get_scroll_fraction(self) -> float:
+        """Get the relative scroll position, 0.0 = oldest content, 1.0 = newest (thread-safe)"""
+        with self.lock:
+            extent = max(0, self._scroll_extent() - self.viewport_rows)
+            if not extent:
+                return 1.0
+            return 1.0 - min(self.scrollback, extent) / extent
+    
+    def get_visible_window(self, height: int, with_seq: bool = False) -> Tuple[List[tuple], int]:
+        """Get the lines covering the visible rows (thread-safe)
+        
+        With a wrap width set, ``height`` and the scroll position count
+        screen rows, and the first line may be partly scrolled out.
+        
+        Args:
+            height: Content rows
+            with_seq: Return (seq, message, style) lines instead of (message, style)
+            
+        Returns:
+            (lines, rows of the first line above the viewport)
+        """
+        with self.lock:
+            index = self._sync_rows()
+            if index is None:
+                buffer_len = len(self.buffer)
+                start = max(0, buffer_len - height - self.scrollback)
+                end = max(0, buffer_len - self.scrollback)
+                if start >= buffer_len:
+                    return [], 0
+                return self.buffer.get_slice(start, end, with_seq=with_seq), 0
+            while self._measure_window(index, height):
+                pass
+            first_seq = self.buffer.get_first_seq()
+            total = index.rows_between(first_seq, index.next_seq)
+            bottom = max(0, total - self.scrollback)
+            top = max(0, bottom - height)
+            if bottom <= top:
+                return [], 0
+            top_seq, skip = index.find(first_seq, top)
+            end_seq, _ = index.find(first_seq, bottom - 1)
+            lines = self.buffer.get_slice(top_seq - first_seq, end_seq - first_seq + 1, with_seq=with_seq)
+            return lines, skip
     
     def get_visible_content(self, height: int) -> List[Tuple[str, str]]:
         """Get visible content based on scroll position (thread-safe)"""
-        with self.lock:
-            buffer_len = len(self.buffer)
-            start = max(0, buffer_len - height - self.scrollback)
-            end = max(0, buffer_len - self.scrollback)
-            return self.buffer.get_slice(start, end) if start < buffer_len else []
+        return self.get_visible_window(height)[0]
     
     async def aget_visible_content(self, height: int) -> List[Tuple[str, str]]:
-        """Asynchronous get visible content (thread-safe)"""
-        return await asyncio.to_thread(self.get_visible_content, height)
+        """Asynchronous get visible content (thread-safe, completes inline)"""
+        return self.get_visible_content(height)
     
     def get_content_snapshot(self) -> List[Tuple[str, str]]:
         """Get entire content snapshot (thread-safe)"""
         with self.lock:
+            self._commit_staged()
             return self.buffer.get_all()
     
     async def aget_content_snapshot(self) -> List[Tuple[str, str]]:
         """Asynchronous get content snapshot (thread-safe)"""
         return await asyncio.to_thread(self.get_content_snapshot)
     
-    def search(self, query: str, case_sensitive: bool = False) -> List[Tuple[int, str, str]]:
+    def search(
+        self,
+        query: str,
+        case_sensitive: bool = False,
+        by_seq: bool = False
+    ) -> List[Tuple[int, str, str]]:
         """Search for text in pane content (thread-safe)
         
         Args:
             query: Search query
             case_sensitive: Whether to match case
+            by_seq: Return stable sequence numbers instead of positions
             
         Returns:
             List of (line_number, message, style) tuples
         """
         with self.lock:
-            return self.buffer.search(query, case_sensitive)
+            self._commit_staged()
+            return self.buffer.search(query, case_sensitive, by_seq)
     
-    async def asearch(self, query: str, case_sensitive: bool = False) -> List[Tuple[int, str, str]]:
+    async def asearch(
+        self,
+        query: str,
+        case_sensitive: bool = False,
+        by_seq: bool = False
+    ) -> List[Tuple[int, str, str]]:
         """Asynchronous search (thread-safe)"""
-        return await asyncio.to_thread(self.search, query, case_sensitive)
+        return await asyncio.to_thread(self.search, query, case_sensitive, by_seq)
     
-    def filter_content(self, predicate: Callable) -> List[Tuple[int, str, str]]:
+    def filter_content(self, predicate: Callable, by_seq: bool = False) -> List[Tuple[int, str, str]]:
         """Filter content with predicate (thread-safe)
         
         Args:
             predicate: Function that takes (message, style) and returns bool
+            by_seq: Return stable sequence numbers instead of positions
             
         Returns:
             List of (line_number, message, style) tuples
         """
         with self.lock:
-            return self.buffer.filter(predicate)
+            self._commit_staged()
+            return self.buffer.filter(predicate, by_seq)
     
-    async def afilter_content(self, predicate: Callable) -> List[Tuple[int, str, str]]:
+    async def afilter_content(self, predicate: Callable, by_seq: bool = False) -> List[Tuple[int, str, str]]:
         """Asynchronous filter (thread-safe)"""
-        return await asyncio.to_thread(self.filter_content, predicate)
+        return await asyncio.to_thread(self.filter_content, predicate, by_seq)
+    
+    def get_line_by_seq(self, seq: int) -> Optional[Tuple[str, str]]:
+        """Get a line by sequence number (thread-safe)
+        
+        Args:
+            seq: Sequence number
+            
+        Returns:
+            (message, style) tuple, or None if evicted or not yet written
+        """
+        with self.lock:
+            self._commit_staged()
+            return self.buffer.get_by_seq(seq)
+    
+    def get_lines_since(self, seq: int, limit: Optional[int] = None) -> List[Tuple[int, str, str]]:
+        """Get lines with sequence numbers >= seq, for incremental consumers (thread-safe)
+        
+        Usage:
+            lines = pane.get_lines_since(next_seq)
+            if lines:
+                next_seq = lines[-1][0] + 1
+        
+        Args:
+            seq: First sequence number wanted (e.g. the last one seen + 1)
+            limit: Maximum number of lines (None = all)
+            
+        Returns:
+            List of (seq, message, style) tuples, oldest first
+        """
+        with self.lock:
+            self._commit_staged()
+            return self.buffer.get_since(seq, limit)
+    
+    async def aget_lines_since(self, seq: int, limit: Optional[int] = None) -> List[Tuple[int, str, str]]:
+        """Asynchronous get lines since (thread-safe)"""
+        return await asyncio.to_thread(self.get_lines_since, seq, limit)
+    
+    def get_next_seq(self) -> int:
+        """Get the sequence number the next committed line will get (thread-safe)"""
+        with self.lock:
+            self._commit_staged()
+            return self.buffer.get_next_seq()
+    
+    def add_view(
+        self,
+        name: str,
+        predicate: Callable[[str, str], bool],
+        width: float = 0.5,
+        height: float = 0.5,
+        border: bool = True
+    ) -> "PaneView":
+        """Register a named, incrementally maintained filtered view (thread-safe)
+        
+        Use the returned PaneView instead of calling filter_content() with the
+        same predicate every frame. Adding a name again replaces the old view.
+        
+        Args:
+            name: View name, unique per pane
+            predicate: Function that takes (message, style) and returns bool
+            width: Layout width weight of the view
+            height: Layout height weight of the view
+            border: Whether the view draws a border
+            
+        Returns:
+            PaneView that can be added to a TerminalSplitter like any pane
+        """
+        from .view import PaneView  # Imported here: view.py subclasses Pane
+        view = PaneView(self, name, predicate, width=width, height=height, border=border)
+        with self.lock:
+            old = self._views.get(name)
+            self._views = {**self._views, name: view}
+        if old is not None:
+            old.detach()
+        return view
+    
+    def get_view(self, name: str) -> Optional["PaneView"]:
+        """Get a registered view by name (thread-safe)"""
+        with self.lock:
+            return self._views.get(name)
+    
+    def remove_view(self, name: str) -> None:
+        """Unregister a view; it stops following this pane (thread-safe)"""
+        with self.lock:
+            view = self._views.get(name)
+            self._views = {k: v for k, v in self._views.items() if k != name}
+        if view is not None:
+            view.detach()
     
     def set_write_callback(self, callback: Optional[Callable]) -> None:
         """Set callback for write events (thread-safe)
         
+        The callback is called once per line from the dispatcher thread, after
+        the line is committed. Prefer add_write_listener() for batches.
+        
         Args:
             callback: Function called on each write with (message, style)
         """
         with self.lock:
+            self._commit_staged()  # Keep order with lines written before the callback
             self.on_write_callback = callback
     
     def has_changes(self) -> bool:
@@ -162,6 +893,7 @@ class Pane:
             True if buffer was updated
         """
         with self.lock:
+            self._commit_staged()
             current_version = self.buffer.get_version()
             return current_version != self.last_rendered_version
     
@@ -177,7 +909,11 @@ class Pane:
             Approximate bytes used
         """
         with self.lock:
-            return self.buffer.get_memory_usage()
+            self._commit_staged()
+            usage = self.buffer.get_memory_usage()
+            if self.log_index is not None:
+                usage += self.log_index.get_memory_usage()
+            return usage
 
 if __name__ == '__main__':
     raise ImportError("This module is for import only and cannot be executed directly.")
\ No newline at end of file
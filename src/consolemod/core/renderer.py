@@ -0,0 +1,305 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from rich.layout import Layout as RichLayout
+from rich.panel import Panel
+from rich.text import Text
+from .pane import Pane
+from .wrap import TextCache, drop_rows
+from ..ui.layout import Layout, LayoutMode
+from ..ui.themes import Theme, style_to_rich
+
+Geometry = Dict[str, Tuple[int, int, int, int]]
+
+
+@dataclass
+class _PaneRenderState:
+    """State a pane's panel was last built from"""
+    scrollback: int
+    focused: bool
+    size: Tuple[int, int]
+
+
+class PaneRenderer:
+    """Thread-safe incremental renderer for pane layouts
+
+    Keeps the Rich layout tree and each pane's panel alive between frames and
+    only rebuilds panels whose content, scroll position, focus or size changed.
+    Pane sizes come from ``Layout.calculate_layout`` so each pane formats
+    exactly the rows it has on screen. Parsed lines are kept per pane in a
+    ``TextCache`` keyed by sequence number, so a rebuild only parses the
+    markup of lines that were not on screen recently.
+    """
+
+    def __init__(self, theme: Theme, layout: Optional[Layout] = None, text_cache_lines: int = 1024) -> None:
+        """Initialize renderer
+
+        Args:
+            theme: Theme used for pane borders
+            layout: Layout manager providing pane geometry (default: vertical)
+            text_cache_lines: Parsed lines cached per pane beyond its visible window
+        """
+        self.theme: Theme = theme
+        self.layout: Layout = layout or Layout()
+        self.lock: threading.RLock = threading.RLock()
+        self.root: RichLayout = RichLayout()
+        self.geometry: Geometry = {}  # pane_id -> (x, y, width, height) on screen
+        self._tree_key: Optional[tuple] = None
+        self._sections: Dict[str, RichLayout] = {}
+        self._states: Dict[str, _PaneRenderState] = {}
+        self._text_caches: Dict[str, Tuple[Pane, TextCache]] = {}
+        self.text_cache_lines: int = text_cache_lines
+        self.last_rebuilt: int = 0  # Panels rebuilt during the last render
+
+    def render(self, panes: List[Pane], size: Tuple[int, int]) -> RichLayout:
+        """Update the layout tree for the given panes (thread-safe)
+
+        Args:
+            panes: Panes to render, in display order
+            size: Terminal (width, height)
+
+        Returns:
+            Root Rich layout, reused across calls
+        """
+        with self.lock:
+            self.update_layout(panes, size)
+            self.update_panels(panes)
+            return self.root
+
+    def update_layout(self, panes: List[Pane], size: Tuple[int, int]) -> None:
+        """Recompute pane geometry and the layout tree (thread-safe)
+
+        Args:
+            panes: Panes to render, in display order
+            size: Terminal (width, height)
+        """
+        with self.lock:
+            self._sync_tree(panes, size)
+
+    def update_panels(self, panes: List[Pane]) -> int:
+        """Rebuild renderables for dirty panes (thread-safe)
+
+        Call after update_layout() for the same panes.
+
+        Args:
+            panes: Panes to render, in display order
+
+        Returns:
+            Number of panels rebuilt
+        """
+        with self.lock:
+            rebuilt = 0
+            for pane in panes:
+                if self._update_pane(pane):
+                    rebuilt += 1
+            self.last_rebuilt = rebuilt
+            return rebuilt
+
+    def invalidate(self, pane_id: Optional[str] = None) -> None:
+        """Force panels to be rebuilt on the next render (thread-safe)
+
+        Args:
+            pane_id: Pane to invalidate, or None for all panes
+        """
+        with self.lock:
+            if pane_id is None:
+                self._states.clear()
+            else:
+                self._states.pop(pane_id, None)
+
+    def get_pane_rows(self, pane: Pane) -> int:
+        """Get the number of content rows a pane has on screen
+
+        Args:
+            pane: Pane from the last render
+
+        Returns:
+            Visible rows inside the pane's border (0 if not laid out)
+        """
+        with self.lock:
+            geometry = self.geometry.get(pane.id)
+        if geometry is None:
+            return 0
+        return max(0, geometry[3] - (2 if pane.border else 0))
+
+    def get_pane_width(self, pane: Pane) -> int:
+        """Get the number of content cells per row a pane has on screen
+
+        Args:
+            pane: Pane from the last render
+
+        Returns:
+            Cells inside the border and padding (0 if not laid out)
+        """
+        with self.lock:
+            geometry = self.geometry.get(pane.id)
+        if geometry is None:
+            return 0
+        return max(0, geometry[2] - (4 if pane.border else 0))
+
+    def _sync_tree(self, panes: List[Pane], size: Tuple[int, int]) -> None:
+        """Recompute geometry and rebuild the layout tree if it changed"""
+        pane_ids = [p.id for p in panes]
+        width, height = size
+        mode = self.layout.mode
+        geometry = self._fill_screen(
+            mode, pane_ids, self.layout.calculate_layout(pane_ids, width, height), size
+        )
+        self.geometry = geometry
+        if len(self._text_caches) > len(pane_ids):
+            self._text_caches = {
+                pid: entry for pid, entry in self._text_caches.items() if pid in geometry
+            }
+
+        tree_key = (mode, tuple((pid, geometry[pid]) for pid in pane_ids))
+        if tree_key == self._tree_key:
+            return
+
+        old_sections = self._sections
+        self._sections = {pid: RichLayout(name=pid) for pid in pane_ids}
+        for pid, section in self._sections.items():
+            if pid in old_sections:
+                section.update(old_sections[pid].renderable)
+        self.root = self._build_tree(mode, pane_ids, geometry)
+        self._tree_key = tree_key
+
+    @staticmethod
+    def _fill_screen(
+        mode: LayoutMode,
+        pane_ids: List[str],
+        geometry: Geometry,
+        size: Tuple[int, int]
+    ) -> Geometry:
+        """Give rows/columns lost to integer rounding to the last pane on each axis"""
+        width, height = size
+        result = dict(geometry)
+        if not pane_ids:
+            return result
+
+        if mode == LayoutMode.VERTICAL:
+            x, y, w, h = result[pane_ids[-1]]
+            result[pane_ids[-1]] = (x, y, w, max(h, height - y))
+        elif mode == LayoutMode.HORIZONTAL:
+            x, y, w, h = result[pane_ids[-1]]
+            result[pane_ids[-1]] = (x, y, max(w, width - x), h)
+        elif mode == LayoutMode.GRID:
+            last_y = max(result[pid][1] for pid in pane_ids)
+            row_ends: Dict[int, str] = {}
+            for pid in pane_ids:
+                row_ends[result[pid][1]] = pid  # Last pane in each row
+            for pid in pane_ids:
+                x, y, w, h = result[pid]
+                if y == last_y:
+                    h = max(h, height - y)
+                if row_ends[y] == pid:
+                    w = max(w, width - x)
+                result[pid] = (x, y, w, h)
+        return result
+
+    def _build_tree(self, mode: LayoutMode, pane_ids: List[str], geometry: Geometry) -> RichLayout:
+        """Build a Rich layout tree with fixed section sizes from the geometry"""
+        root = RichLayout()
+        if not pane_ids:
+            return root
+
+        if mode == LayoutMode.HORIZONTAL:
+            for pid in pane_ids:
+                self._sections[pid].size = geometry[pid][2]
+            root.split_row(*(self._sections[pid] for pid in pane_ids))
+        elif mode == LayoutMode.GRID:
+            rows: Dict[int, List[str]] = {}
+            for pid in pane_ids:
+                rows.setdefault(geometry[pid][1], []).append(pid)
+            row_layouts = []
+            for row_ids in rows.values():
+                row = RichLayout(size=geometry[row_ids[0]][3])
+                for pid in row_ids:
+                    self._sections[pid].size = geometry[pid][2]
+                row.split_row(*(self._sections[pid] for pid in row_ids))
+                row_layouts.append(row)
+            root.split_column(*row_layouts)
+        else:
+            for pid in pane_ids:
+                self._sections[pid].size = geometry[pid][3]
+            root.split_column(*(self._sections[pid] for pid in pane_ids))
+        return root
+
+    def _update_pane(self, pane: Pane) -> bool:
+        """Rebuild a pane's panel if it is dirty
+
+        Returns:
+            True if the panel was rebuilt
+        """
+        size = self.geometry[pane.id][2:]
+        rows = self.get_pane_rows(pane)
+        width = self.get_pane_width(pane)
+        with pane.lock:
+            pane.set_viewport(width, rows)
+            state = self._states.get(pane.id)
+            if (
+                state is not None
+                and not pane.has_changes()
+                and state.scrollback == pane.scrollback
+                and state.focused == pane.focused
+                and state.size == size
+            ):
+                return False
+
+            lines, skip = pane.get_visible_window(rows, with_seq=True) if rows > 0 else ([], 0)
+            focused = pane.focused
+            self._states[pane.id] = _PaneRenderState(pane.scrollback, focused, size)
+            pane.mark_rendered()
+
+        self._sections[pane.id].update(self._build_panel(pane, lines, focused, skip, width))
+        return True
+
+    def _build_panel(
+        self,
+        pane: Pane,
+        lines: List[Tuple[int, str, str]],
+        focused: bool,
+        skip: int = 0,
+        width: int = 0
+    ):
+        """Build the renderable for a pane's visible lines
+
+        Args:
+            pane: Pane being rendered
+            lines: Visible (seq, message, style) lines
+            focused: Whether the pane has focus
+            skip: Wrapped rows of the first line scrolled out above the viewport
+            width: Content width used to wrap the first line when skipping
+        """
+        if lines:
+            texts = self.get_text_cache(pane).get_texts(lines)
+            if skip:
+                texts[0] = drop_rows(texts[0], width, skip)
+            content = Text("\n").join(texts)  # Copies, so cached texts stay unmodified
+        else:
+            content = Text.from_markup("[dim]Empty[/dim]")
+
+        if not pane.border:
+            return content
+
+        # Choose border style based on focus
+        if focused:
+            border_style = style_to_rich(self.theme.pane_focus)
+            title = f" {pane.id} [active] "
+        else:
+            border_style = style_to_rich(self.theme.pane_border)
+            title = f" {pane.id} "
+
+        return Panel(content, title=title, border_style=border_style, expand=True)
+
+    def get_text_cache(self, pane: Pane) -> TextCache:
+        """Get the parsed-line cache of a pane, creating it on first use (thread-safe)"""
+        with self.lock:
+            entry = self._text_caches.get(pane.id)
+            if entry is None or entry[0] is not pane:
+                # A new pane under a reused id starts its sequence numbers over
+                entry = self._text_caches[pane.id] = (pane, TextCache(self.text_cache_lines))
+            return entry[1]
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
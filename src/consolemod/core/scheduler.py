@@ -0,0 +1,218 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+class FrameScheduler:
+    """Thread-safe, event-driven frame scheduler
+
+    Frames are only produced after something requests one (a pane write, a
+    key, a resize or a timer tick). Requests that arrive before the next frame
+    is drawn are coalesced, and frames are spaced at least ``1 / fps`` apart.
+    When nothing requests a frame the render loop sleeps without any work.
+
+    Frames can be awaited on an event loop (wait_for_frame) or from a
+    dedicated render thread (wait_for_frame_blocking).
+    """
+
+    def __init__(self, fps: float = 30) -> None:
+        """Initialize scheduler
+
+        Args:
+            fps: Maximum frames per second
+        """
+        self.fps: float = fps
+        self.lock: threading.RLock = threading.RLock()
+        self._cond: threading.Condition = threading.Condition(self.lock)
+        self.requests: int = 0  # Frame requests received (including coalesced)
+        self.frames: int = 0    # Frames released to the render loop
+        self._pending: bool = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._event: Optional[asyncio.Event] = None
+        self._last_frame: float = 0.0
+        self._timers: Dict[int, tuple] = {}  # timer_id -> (interval, callback)
+        self._timer_handles: Dict[int, asyncio.TimerHandle] = {}
+        self._next_timer_id: int = 1
+
+    def bind(
+        self,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        wake_loop: bool = True
+    ) -> None:
+        """Attach the scheduler to an event loop (call from the loop's thread)
+
+        Args:
+            loop: Event loop that runs timers (defaults to the running loop)
+            wake_loop: Whether frame requests wake wait_for_frame() on the loop;
+                pass False when frames are consumed by a render thread
+        """
+        loop = loop or asyncio.get_running_loop()
+        with self.lock:
+            self._loop = loop
+            self._loop_thread = threading.get_ident()
+            self._event = asyncio.Event() if wake_loop else None
+            if self._pending and self._event is not None:
+                self._event.set()
+            for timer_id in list(self._timers):
+                self._schedule_timer(timer_id)
+
+    def unbind(self) -> None:
+        """Detach from the event loop and cancel running timers"""
+        with self.lock:
+            for handle in self._timer_handles.values():
+                handle.cancel()
+            self._timer_handles.clear()
+            self._loop = None
+            self._loop_thread = None
+            self._event = None
+
+    def request_frame(self) -> None:
+        """Request a frame; safe to call from any thread
+
+        Repeated requests before the next frame collapse into one.
+        """
+        if self._pending:
+            # Fast path for hot writers: a frame is already on its way and
+            # will see this change (the counter may undercount under contention)
+            self.requests += 1
+            return
+        with self.lock:
+            self.requests += 1
+            if self._pending:
+                return
+            self._pending = True
+            self._cond.notify_all()
+            loop = self._loop
+            event = self._event
+            on_loop = self._loop_thread == threading.get_ident()
+
+        if loop is None or event is None:
+            return
+        if on_loop:
+            event.set()
+        else:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # Loop already closed
+
+    def is_pending(self) -> bool:
+        """Check whether a frame has been requested but not yet released"""
+        with self.lock:
+            return self._pending
+
+    async def wait_for_frame(self) -> None:
+        """Wait until a frame is requested and the fps cap allows drawing it"""
+        if self._event is None:
+            self.bind()
+        event = self._event
+        if event is None:
+            raise RuntimeError("wait_for_frame() needs a scheduler bound with wake_loop=True")
+        await event.wait()
+
+        # Cap the frame rate; requests arriving meanwhile join this frame
+        min_interval = 1 / self.fps if self.fps > 0 else 0
+        delay = self._last_frame + min_interval - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        with self.lock:
+            self._pending = False
+            event.clear()
+            self.frames += 1
+        self._last_frame = time.monotonic()
+
+    def wait_for_frame_blocking(self, timeout: Optional[float] = None) -> bool:
+        """Block until a frame is requested and the fps cap allows drawing it
+
+        Used by render threads; the thread sleeps while nothing changes.
+
+        Args:
+            timeout: Maximum seconds to wait for a request (None = forever)
+
+        Returns:
+            True if a frame was released, False on timeout
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._pending, timeout):
+                return False
+
+        min_interval = 1 / self.fps if self.fps > 0 else 0
+        delay = self._last_frame + min_interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        with self.lock:
+            self._pending = False
+            self.frames += 1
+        self._last_frame = time.monotonic()
+        return True
+
+    def add_timer(self, interval: float, callback: Optional[Callable[[], None]] = None) -> int:
+        """Request a frame every ``interval`` seconds (e.g. for spinners)
+
+        Args:
+            interval: Seconds between ticks
+            callback: Optional function called on the loop before each tick's frame
+
+        Returns:
+            Timer id for remove_timer()
+        """
+        if interval <= 0:
+            raise ValueError("Timer interval must be positive")
+        with self.lock:
+            timer_id = self._next_timer_id
+            self._next_timer_id += 1
+            self._timers[timer_id] = (interval, callback)
+            loop = self._loop
+            on_loop = self._loop_thread == threading.get_ident()
+
+        if loop is not None:
+            if on_loop:
+                self._schedule_timer(timer_id)
+            else:
+                loop.call_soon_threadsafe(self._schedule_timer, timer_id)
+        return timer_id
+
+    def remove_timer(self, timer_id: int) -> None:
+        """Stop a timer created with add_timer()
+
+        Args:
+            timer_id: Timer id
+        """
+        with self.lock:
+            self._timers.pop(timer_id, None)
+            handle = self._timer_handles.pop(timer_id, None)
+        if handle is not None:
+            handle.cancel()
+
+    def _schedule_timer(self, timer_id: int) -> None:
+        """Arm the next tick of a timer (runs on the loop)"""
+        with self.lock:
+            timer = self._timers.get(timer_id)
+            if timer is None or self._loop is None:
+                return
+            self._timer_handles[timer_id] = self._loop.call_later(
+                timer[0], self._fire_timer, timer_id
+            )
+
+    def _fire_timer(self, timer_id: int) -> None:
+        """Run a timer tick and re-arm it (runs on the loop)"""
+        with self.lock:
+            timer = self._timers.get(timer_id)
+        if timer is None:
+            return
+        callback = timer[1]
+        if callback is not None:
+            try:
+                callback()
+            except Exception:
+                pass  # Timer callbacks must not break the render loop
+        self.request_frame()
+        self._schedule_timer(timer_id)
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
@@ -0,0 +1,274 @@
+from array import array
+from bisect import bisect_left
+from typing import Callable, List, Optional, Tuple, Union
+from .pane import Pane
+from ..utils.buffer import CircularBuffer
+
+
+class _ViewBuffer(CircularBuffer):
+    """Read-only buffer over the source lines a view's predicate matched
+
+    Stores only the sequence numbers of matching lines, oldest first, in an
+    ``array('Q')`` starting at ``_start``. Each read first catches up with
+    the source: lines committed since the last read are checked once against
+    the predicate, and sequence numbers the source has dropped are trimmed
+    from the front. Lines themselves are read from the source buffer.
+
+    Every CircularBuffer read is answered from the matches, and every
+    write raises RuntimeError, so the view can stand in for a pane buffer.
+    """
+
+    def __init__(self, source: Pane, predicate: Callable[[str, str], bool]) -> None:
+        super().__init__(max_size=0)
+        self.source: Pane = source
+        self.predicate: Callable[[str, str], bool] = predicate
+        self._seqs: array = array("Q")
+        self._start: int = 0
+        self._cursor: int = 0  # Next source sequence number to check
+
+    def _sync(self) -> None:
+        """Check new source lines and trim dropped ones (call with lock held)"""
+        self.source._commit_staged()
+        source = self.source.buffer
+        new_lines = source.get_since(self._cursor)
+        changed = False
+        predicate = self.predicate
+        for seq, message, style in new_lines:
+            try:
+                matched = predicate(message, style)
+            except Exception:
+                matched = False  # A failing predicate hides the line, like a non-match
+            if matched:
+                self._seqs.append(seq)
+                changed = True
+        if new_lines:
+            self._cursor = new_lines[-1][0] + 1
+        first_seq = source.get_first_seq()
+        if len(self._seqs) > self._start and self._seqs[self._start] < first_seq:
+            self._start = bisect_left(self._seqs, first_seq, self._start)
+            if self._start > len(self._seqs) // 2:
+                del self._seqs[:self._start]
+                self._start = 0
+            changed = True
+        if changed:
+            self.version += 1
+
+    def _lines(self, start: int, end: int) -> List[Tuple[int, str, str]]:
+        """Read matches at view positions [start, end) as (seq, message, style) (call with lock held)"""
+        source = self.source.buffer
+        seqs = self._seqs[self._start + start:self._start + end]
+        with source.lock:
+            # The source may have evicted lines since _sync; skip those
+            lines = []
+            for seq in seqs:
+                line = source.get_by_seq(seq)
+                if line is not None:
+                    lines.append((seq, line[0], line[1]))
+            return lines
+
+    def append(self, message: str, style: str = "white") -> None:
+        raise RuntimeError("Pane views are read-only; write to the source pane")
+
+    def extend(self, items: List[Tuple[str, str]]) -> None:
+        raise RuntimeError("Pane views are read-only; write to the source pane")
+
+    def replace_last(self, message: str, style: str) -> Optional[int]:
+        raise RuntimeError("Pane views are read-only; write to the source pane")
+
+    def is_full(self) -> bool:
+        return False
+
+    def clear(self) -> None:
+        """Forget current matches; later source lines are still checked (thread-safe)"""
+        with self.lock:
+            self._sync()
+            self._seqs = array("Q")
+            self._start = 0
+            self.version += 1
+
+    def get_all(self) -> List[Tuple[str, str]]:
+        with self.lock:
+            self._sync()
+            return [(m, s) for _, m, s in self._lines(0, self._len())]
+
+    def get_slice(self, start: int = 0, end: Optional[int] = None, with_seq: bool = False) -> List[tuple]:
+        with self.lock:
+            self._sync()
+            start, end, _ = slice(start, end).indices(self._len())
+            lines = self._lines(start, end)
+            return lines if with_seq else [(m, s) for _, m, s in lines]
+
+    def get_last(self, count: int) -> List[Tuple[str, str]]:
+        with self.lock:
+            self._sync()
+            length = self._len()
+            return [(m, s) for _, m, s in self._lines(max(0, length - max(0, count)), length)]
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                return self.get_all()[index]
+            return self.get_slice(index.start or 0, index.stop)
+        with self.lock:
+            self._sync()
+            length = self._len()
+            if index < 0:
+                index += length
+            if not 0 <= index < length:
+                raise IndexError("CircularBuffer index out of range")
+            lines = self._lines(index, index + 1)
+            if not lines:
+                raise IndexError("CircularBuffer index out of range")
+            return lines[0][1], lines[0][2]
+
+    def get_first_seq(self) -> int:
+        """Get the source sequence number of the oldest match, or the next one to check if none"""
+        with self.lock:
+            self._sync()
+            return self._seqs[self._start] if self._len() else self._cursor
+
+    def get_ring_first_seq(self) -> int:
+        """All matches are held in memory, so this is get_first_seq()"""
+        return self.get_first_seq()
+
+    def get_by_seq(self, seq: int) -> Optional[Tuple[str, str]]:
+        """Get a matching line by its source sequence number"""
+        with self.lock:
+            self._sync()
+            position = bisect_left(self._seqs, seq, self._start)
+            if position == len(self._seqs) or self._seqs[position] != seq:
+                return None
+            return self.source.buffer.get_by_seq(seq)
+
+    def get_since(self, seq: int, limit: Optional[int] = None) -> List[Tuple[int, str, str]]:
+        """Get matching lines with source sequence numbers >= seq"""
+        with self.lock:
+            self._sync()
+            start = bisect_left(self._seqs, seq, self._start) - self._start
+            end = self._len() if limit is None else min(self._len(), start + max(0, limit))
+            return self._lines(start, end)
+
+    def get_next_seq(self) -> int:
+        """Get the source sequence number the next checked line will have"""
+        with self.lock:
+            self._sync()
+            return self._cursor
+
+    def search(self, query: str, case_sensitive: bool = False, by_seq: bool = False) -> List[Tuple[int, str, str]]:
+        needle = query if case_sensitive else query.lower()
+        if case_sensitive:
+            return self.filter(lambda message, style: needle in message, by_seq)
+        return self.filter(lambda message, style: needle in message.lower(), by_seq)
+
+    def filter(self, predicate, by_seq: bool = False) -> List[Tuple[int, str, str]]:
+        with self.lock:
+            self._sync()
+            results = []
+            for idx, (seq, message, style) in enumerate(self._lines(0, self._len())):
+                if predicate(message, style):
+                    results.append((seq if by_seq else idx, message, style))
+            return results
+
+    def get_version(self) -> int:
+        with self.lock:
+            self._sync()
+            return self.version
+
+    def get_memory_usage(self) -> int:
+        with self.lock:
+            return self._seqs.buffer_info()[1] * self._seqs.itemsize
+
+    def _len(self) -> int:
+        return len(self._seqs) - self._start
+
+    def __len__(self) -> int:
+        with self.lock:
+            self._sync()
+            return self._len()
+
+
+class PaneView(Pane):
+    """Thread-safe live filtered view of another pane
+
+    A view is a read-only pane showing the source pane's lines that match a
+    predicate. It stores only the matching lines' sequence numbers and
+    checks each source line against the predicate once, when the view is
+    next read, so keeping a filter on screen costs time in proportion to
+    ingestion rather than to buffer size on every frame. Lines leave the
+    view when the source evicts them. Views scroll, search and render like
+    any other pane, except that they scroll by logical lines rather than
+    wrapped rows.
+
+    Usage:
+        errors = logs.add_view("errors", lambda message, style: "ERROR" in message)
+        splitter.add_pane(errors)
+    """
+
+    def __init__(
+        self,
+        source: Pane,
+        name: str,
+        predicate: Callable[[str, str], bool],
+        width: float = 0.5,
+        height: float = 0.5,
+        border: bool = True
+    ) -> None:
+        """Initialize view
+
+        Args:
+            source: Pane whose lines are filtered
+            name: View name, unique per source pane
+            predicate: Function taking (message, style) and returning bool
+            width: Layout width weight
+            height: Layout height weight
+            border: Whether to draw a border
+        """
+        super().__init__(
+            f"{source.id}:{name}", width=width, height=height, color=source.color,
+            border=border, max_lines=0
+        )
+        self.theme = source.theme
+        self.name: str = name
+        self.source: Pane = source
+        self.buffer = _ViewBuffer(source, predicate)
+        source.add_change_listener(self._notify_change)
+
+    def _stage(self, items: list) -> None:
+        """Views are read-only; every write path ends here
+
+        Raises:
+            RuntimeError: Always; write to the source pane instead
+        """
+        raise RuntimeError("Pane views are read-only; write to the source pane")
+
+    def _commit_staged(self) -> None:
+        """Nothing is ever staged on a view; reads catch up with the source instead"""
+
+    def write(self, message: str, style: Optional[str] = None) -> None:
+        """Views are read-only
+
+        Raises:
+            RuntimeError: Always; write to the source pane instead
+        """
+        raise RuntimeError("Pane views are read-only; write to the source pane")
+
+    def write_many(self, messages: List[Tuple[str, str]]) -> None:
+        """Views are read-only
+
+        Raises:
+            RuntimeError: Always; write to the source pane instead
+        """
+        raise RuntimeError("Pane views are read-only; write to the source pane")
+
+    def set_viewport(self, width: int, rows: int) -> None:
+        """Record the on-screen size; views keep scrolling by logical lines (thread-safe)"""
+        with self.lock:
+            self.viewport_rows = max(0, rows)
+
+    def detach(self) -> None:
+        """Stop following the source pane's change notifications (thread-safe)"""
+        self.source.remove_change_listener(self._notify_change)
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
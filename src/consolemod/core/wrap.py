@@ -0,0 +1,175 @@
+import io
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Tuple, Union
+from rich.cells import cell_len
+from rich.console import Console
+from rich.errors import MarkupError, StyleSyntaxError
+from rich.style import Style
+from rich.text import Text
+
+# Only used for its wrapping settings; never printed to
+_CONSOLE = Console(file=io.StringIO(), width=80, color_system=None)
+
+# Start of the next word in printable ASCII, where space is the only whitespace
+_NON_SPACE = re.compile(r"[^ ]")
+
+
+@lru_cache(maxsize=1024)
+def resolve_style(style: str) -> Union[Style, str]:
+    """Parse a style string once; names Rich cannot parse are left for the console theme"""
+    try:
+        return Style.parse(style)
+    except StyleSyntaxError:
+        return style
+
+
+def parse_line(message: str, style: str) -> Text:
+    """Parse one line's markup, falling back to plain text on bad markup"""
+    resolved = resolve_style(str(style))
+    try:
+        return Text.from_markup(message, style=resolved)
+    except MarkupError:
+        return Text(message, style=resolved)
+
+
+class TextCache:
+    """Thread-safe LRU of parsed lines keyed by sequence number
+
+    Lines rarely change once written, so a line's parsed ``Text`` is reused
+    for as long as its message is unchanged (a collapsed repeat's counter
+    rewrites its line in place). Rendering a frame only parses lines it
+    has not seen recently. The cache holds at least the lines
+    of the last lookup (the visible window) and up to ``capacity`` lines
+    in total.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        """Initialize empty cache
+
+        Args:
+            capacity: Lines kept beyond the current window
+        """
+        self.lock: threading.RLock = threading.RLock()
+        self.capacity: int = max(0, capacity)
+        self.hits: int = 0
+        self.misses: int = 0
+        self._texts: "OrderedDict[int, Tuple[str, str, Text]]" = OrderedDict()
+
+    def get_texts(self, lines: List[Tuple[int, str, str]]) -> List[Text]:
+        """Get parsed text for (seq, message, style) lines, parsing misses (thread-safe)
+
+        The returned texts are shared with the cache and must not be modified.
+        """
+        with self.lock:
+            texts = self._texts
+            result = []
+            for seq, message, style in lines:
+                cached = texts.get(seq)
+                if cached is None or cached[0] != message or cached[1] != style:
+                    text = parse_line(message, style)
+                    texts[seq] = (message, style, text)
+                    texts.move_to_end(seq)
+                    self.misses += 1
+                else:
+                    text = cached[2]
+                    texts.move_to_end(seq)
+                    self.hits += 1
+                result.append(text)
+            limit = max(self.capacity, len(lines))
+            while len(texts) > limit:
+                texts.popitem(last=False)
+            return result
+
+    def clear(self) -> None:
+        """Drop all cached lines (thread-safe)"""
+        with self.lock:
+            self._texts.clear()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self._texts)
+
+
+def measure_rows(message: str, style: str, width: int) -> int:
+    """Get the screen rows a line wraps to at ``width`` cells
+
+    Matches how panes render: the line's markup is parsed and word-wrapped
+    by Rich. Lines that fit are detected from the raw text, since markup
+    only makes the visible text shorter, so the full wrap only runs for
+    long lines.
+
+    Args:
+        message: Line text with optional markup
+        style: Line style
+        width: Content width in cells
+
+    Returns:
+        Rows, at least 1
+    """
+    message = str(message)
+    width = max(1, width)
+    if "\n" not in message and "\t" not in message and cell_len(message) <= width:
+        return 1
+    if "[" not in message and message.isascii() and message.isprintable():
+        return _count_ascii_rows(message, width)
+    return max(1, len(parse_line(message, style).wrap(_CONSOLE, width)))
+
+
+def _count_ascii_rows(text: str, width: int) -> int:
+    """Count rows of Rich's word wrap for printable ASCII, where every character is one cell
+
+    Equivalent to rich._wrap.divide_line with folding, one step per row
+    rather than per word: a row holds every word whose last non-space
+    character is within ``width`` cells of the row start, and the next row
+    starts at the first word that is not (or inside it, if it is folded).
+    """
+    length = len(text)
+    content_end = len(text.rstrip(" "))
+    lead = length - len(text.lstrip(" "))  # The first word includes leading spaces
+    rows = 1
+    row_start = 0
+    while content_end > row_start + width:
+        limit = row_start + width
+        if text[limit] == " ":
+            match = _NON_SPACE.search(text, limit)  # Always found: content continues past limit
+            word_start = match.start() if match else content_end
+        else:
+            word_start = text.rfind(" ", row_start, limit) + 1 or row_start
+        if word_start <= lead:
+            word_start = 0
+        word_end = text.find(" ", max(word_start, lead))
+        if word_end < 0:
+            word_end = length
+        if word_end - word_start > width:
+            # Too long for any row: folded into ``width``-cell chunks, trailing spaces included
+            match = _NON_SPACE.search(text, word_end)
+            chunks = -(-((match.start() if match else length) - word_start) // width)
+            rows += chunks if word_start else chunks - 1
+            row_start = word_start + (chunks - 1) * width
+        else:
+            rows += 1
+            row_start = word_start
+    return rows
+
+
+def drop_rows(text: Text, width: int, rows: int) -> Text:
+    """Drop the first ``rows`` wrapped rows of a line's text
+
+    Args:
+        text: Parsed line
+        width: Content width in cells
+        rows: Rows scrolled out above the viewport
+
+    Returns:
+        Text of the remaining rows
+    """
+    if rows <= 0:
+        return text
+    return Text("\n").join(text.wrap(_CONSOLE, max(1, width))[rows:])
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
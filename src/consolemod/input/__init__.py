@@ -1,10 +1,11 @@
 """Input module - Keyboard input and keybindings"""
 from .input_handler import InputHandler
+from ..core.events import KeyCode
 from .input import InputField, InputType, SelectField, CheckboxField
 from .keybindings import KeyBinding, KeyBindingManager, KeyBindingPreset
 
 __all__ = [
-    "InputHandler",
+    "InputHandler", "KeyCode",
     "InputField", "InputType", "SelectField", "CheckboxField",
     "KeyBinding", "KeyBindingManager", "KeyBindingPreset",
 ]
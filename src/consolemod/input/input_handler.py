@@ -1,6 +1,9 @@
 import asyncio
+import codecs
+import os
 import sys
-from typing import Optional, Dict
+import threading
+from typing import Optional, Dict, List, Callable
 try:
     import readchar
 except ImportError:
@@ -32,12 +35,228 @@ class InputHandler:
         '\x04': KeyCode.CTRL_D,
     }
     
-    def __init__(self) -> None:
+    def __init__(self, max_pending: int = 256) -> None:
+        """Initialize input handler
+        
+        Args:
+            max_pending: Maximum queued key events before new keys are dropped
+        """
         self.running: bool = False
+        self.max_pending: int = max_pending
+        self.lock: threading.RLock = threading.RLock()
+        self._queue: Optional["asyncio.Queue[KeyEvent]"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._on_key: Optional[Callable[[], None]] = None
+        self._fd: Optional[int] = None
+        self._saved_tty_attrs: Optional[list] = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        self._reader_thread: Optional[threading.Thread] = None
+    
+    def start(self, on_key: Optional[Callable[[], None]] = None) -> None:
+        """Start the persistent keyboard reader on the running event loop
+        
+        On POSIX terminals stdin is switched to cbreak mode and registered with
+        ``loop.add_reader`` so keys are read without blocking or thread hops.
+        Elsewhere a daemon thread reads keys and hands them to the loop.
+        
+        Args:
+            on_key: Optional callback invoked on the loop after keys are queued
+        """
+        with self.lock:
+            if self.running:
+                return
+            self._loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._on_key = on_key
+            self.running = True
+        
+        if not self._start_fd_reader():
+            self._start_thread_reader()
+    
+    def stop(self) -> None:
+        """Stop the keyboard reader and restore terminal settings"""
+        with self.lock:
+            if not self.running:
+                return
+            self.running = False
+            fd = self._fd
+            self._fd = None
+        
+        if fd is not None:
+            try:
+                if self._loop is not None and not self._loop.is_closed():
+                    self._loop.remove_reader(fd)
+            finally:
+                self._restore_tty(fd)
+    
+    def get_pending_keys(self) -> List[KeyEvent]:
+        """Drain all queued key events without blocking
+        
+        Returns:
+            List of KeyEvents in arrival order (empty if none)
+        """
+        events: List[KeyEvent] = []
+        if self._queue is None:
+            return events
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return events
+    
+    async def get_key(self) -> KeyEvent:
+        """Wait for the next queued key event (requires start())
+        
+        Returns:
+            Next KeyEvent
+        """
+        if self._queue is None:
+            raise RuntimeError("InputHandler.start() must be called before get_key()")
+        return await self._queue.get()
+    
+    def _start_fd_reader(self) -> bool:
+        """Register stdin with the event loop (POSIX terminals only)
+        
+        Returns:
+            True if the reader was registered
+        """
+        loop = self._loop
+        if sys.platform == 'win32' or loop is None:
+            return False
+        try:
+            import termios
+            import tty
+            fd = sys.stdin.fileno()
+            if not os.isatty(fd):
+                return False
+            self._saved_tty_attrs = termios.tcgetattr(fd)
+            tty.setcbreak(fd)
+            # cbreak leaves ISIG on; clear it so Ctrl+C arrives as a key, not SIGINT
+            attrs = termios.tcgetattr(fd)
+            attrs[3] &= ~termios.ISIG
+            termios.tcsetattr(fd, termios.TCSANOW, attrs)
+            loop.add_reader(fd, self._on_fd_readable, fd)
+        except (ImportError, OSError, ValueError, NotImplementedError, AttributeError):
+            # The thread reader takes over, so put the terminal back as it was
+            if self._saved_tty_attrs is not None:
+                self._restore_tty(fd)
+            return False
+        self._fd = fd
+        return True
+    
+    def _restore_tty(self, fd: int) -> None:
+        """Restore terminal attributes saved by _start_fd_reader"""
+        if self._saved_tty_attrs is None:
+            return
+        try:
+            import termios
+            termios.tcsetattr(fd, termios.TCSADRAIN, self._saved_tty_attrs)
+        except (ImportError, OSError):
+            pass
+        self._saved_tty_attrs = None
+    
+    def _on_fd_readable(self, fd: int) -> None:
+        """Read whatever stdin has buffered (runs on the event loop)"""
+        try:
+            data = os.read(fd, 1024)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self.stop()
+            return
+        if not data:
+            self.stop()
+            return
+        
+        text = self._decoder.decode(data)
+        queued = False
+        for raw in self._split_keys(text):
+            event = self._parse_key(raw)
+            if event is not None:
+                queued = self._push(event) or queued
+        if queued and self._on_key:
+            self._on_key()
+    
+    def _start_thread_reader(self) -> None:
+        """Start a daemon thread that reads keys and forwards them to the loop"""
+        if not readchar and sys.platform != 'win32':
+            return
+        self._reader_thread = threading.Thread(
+            target=self._thread_reader, name="consolemod-input", daemon=True
+        )
+        self._reader_thread.start()
+    
+    def _thread_reader(self) -> None:
+        """Blocking key reader loop (runs in the reader thread)"""
+        import time
+        
+        while self.running:
+            key = self._read_raw_key()
+            if key is None:
+                time.sleep(0.01)  # Windows kbhit() polling
+                continue
+            event = self._parse_key(key)
+            loop = self._loop
+            if event is None or loop is None or loop.is_closed():
+                continue
+            try:
+                loop.call_soon_threadsafe(self._deliver, event)
+            except RuntimeError:
+                return  # Loop closed while we were blocked
+    
+    def _deliver(self, event: KeyEvent) -> None:
+        """Queue a key event from the reader thread (runs on the event loop)"""
+        if self._push(event) and self._on_key:
+            self._on_key()
+    
+    def _push(self, event: KeyEvent) -> bool:
+        """Queue a key event, dropping it if the queue is full
+        
+        Returns:
+            True if the event was queued
+        """
+        if self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            return False
+    
+    @staticmethod
+    def _split_keys(text: str) -> List[str]:
+        """Split a chunk of terminal input into individual key sequences
+        
+        Args:
+            text: Decoded input chunk (may hold several keys)
+            
+        Returns:
+            List of raw key strings
+        """
+        keys: List[str] = []
+        i = 0
+        n = len(text)
+        while i < n:
+            ch = text[i]
+            if ch == '\x1b' and i + 1 < n and text[i + 1] in '[O':
+                # CSI/SS3 sequence: runs until a final byte in 0x40-0x7E
+                j = i + 2
+                while j < n and not ('\x40' <= text[j] <= '\x7e'):
+                    j += 1
+                seq = text[i:j + 1]
+                keys.append(seq.replace('\x1bO', '\x1b[', 1))
+                i = j + 1
+            else:
+                keys.append(ch)
+                i += 1
+        return keys
     
     async def read_key(self) -> Optional[KeyEvent]:
         """Read a single key asynchronously (thread-safe)
         
+        Blocks until a key is pressed; prefer start() and get_pending_keys()
+        inside render loops.
+        
         Returns:
             KeyEvent if key was read, None otherwise
         """
@@ -1,9 +1,13 @@
 import asyncio
 import logging
+import time
 from enum import Enum
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from ..core.pane import Pane
+
 
 class LogLevel(Enum):
     """Log levels with colors"""
@@ -14,25 +18,41 @@ class LogLevel(Enum):
     CRITICAL = ("CRITICAL", "bright_red")
 
 
+# Level ids stored in a pane's LogIndex, and back
+_LEVEL_IDS: Dict[LogLevel, int] = {level: i for i, level in enumerate(LogLevel)}
+_LEVELS: List[LogLevel] = list(LogLevel)
+
+
 class PaneLogger:
-    """Logger that writes to a Pane (thread-safe)"""
+    """Logger that writes to a Pane (thread-safe)
     
-    def __init__(self, pane, include_timestamp: bool = True) -> None:
+    With ``index=True`` every line's level and epoch timestamp are recorded
+    in the pane's LogIndex, so count() and get_lines() answer level and
+    time-range queries (e.g. errors in the last 5 minutes) in O(log n)
+    instead of parsing the formatted text.
+    """
+    
+    def __init__(self, pane, include_timestamp: bool = True, index: bool = False) -> None:
         """Initialize pane logger
         
         Args:
             pane: Pane instance to write to
             include_timestamp: Whether to include timestamps
+            index: Index lines by level and time in the pane's LogIndex
         """
-        self.pane = pane
+        self.pane: "Pane" = pane
         self.include_timestamp = include_timestamp
+        self.index = index
+        if index:
+            pane.enable_log_index()
     
-    def _format_message(self, message: str, level: LogLevel) -> str:
+    def _format_message(self, message: str, level: LogLevel, timestamp: Optional[float] = None) -> str:
         """Format message with timestamp and level
         
         Args:
             message: Message text
             level: Log level
+            timestamp: Epoch seconds to show (None = now)
             
         Returns:
             Formatted message
@@ -40,19 +60,38 @@ class PaneLogger:
         prefix = f"[{level.value[0]}]"
         
         if self.include_timestamp:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            prefix = f"[{timestamp}] {prefix}"
+            when = datetime.now() if timestamp is None else datetime.fromtimestamp(timestamp)
+            prefix = f"[{when.strftime('%H:%M:%S')}] {prefix}"
         
         return f"{prefix} {message}"
     
+    def _write(self, message: str, level: LogLevel, timestamp: Optional[float] = None) -> None:
+        """Format and write one line, indexing it if enabled"""
+        if not self.index:
+            self.pane.write(self._format_message(message, level, timestamp), level.value[1])
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        formatted = self._format_message(message, level, timestamp)
+        self.pane.write_record(formatted, level.value[1], _LEVEL_IDS[level], timestamp)
+    
+    async def _awrite(self, message: str, level: LogLevel, timestamp: Optional[float] = None) -> None:
+        """Format and write one line asynchronously, indexing it if enabled"""
+        if not self.index:
+            await self.pane.awrite(self._format_message(message, level, timestamp), level.value[1])
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        formatted = self._format_message(message, level, timestamp)
+        await self.pane.awrite_record(formatted, level.value[1], _LEVEL_IDS[level], timestamp)
+    
     def debug(self, message: str) -> None:
         """Write debug message (synchronous)
         
         Args:
             message: Message text
         """
-        formatted = self._format_message(message, LogLevel.DEBUG)
-        self.pane.write(formatted, LogLevel.DEBUG.value[1])
+        self._write(message, LogLevel.DEBUG)
     
     async def adebug(self, message: str) -> None:
         """Write debug message (asynchronous)
@@ -60,8 +99,7 @@ class PaneLogger:
         Args:
             message: Message text
         """
-        formatted = self._format_message(message, LogLevel.DEBUG)
-        await self.pane.awrite(formatted, LogLevel.DEBUG.value[1])
+        await self._awrite(message, LogLevel.DEBUG)
     
     def info(self, message: str) -> None:
         """Write info message (synchronous)
@@ -69,8 +107,7 @@ class PaneLogger:
         Args:
             message: Message text
         """
-        formatted = self._format_message(message, LogLevel.INFO)
-        self.pane.write(formatted, LogLevel.INFO.value[1])
+        self._write(message, LogLevel.INFO)
     
     async def ainfo(self, message: str) -> None:
         """Write info message (asynchronous)
@@ -78,8 +115,7 @@ class PaneLogger:
         Args:
             message: Message text
         """
-        formatted = self._format_message(message, LogLevel.INFO)
-        await self.pane.awrite(formatted, LogLevel.INFO.value[1])
+        await self._awrite(message, LogLevel.INFO)
     
     def warning(self, message: str) -> None:
         """Write warning message (synchronous)
@@ -87,8 +123,7 @@ class PaneLogger:
         Args:
             message: Message text
         """
-        formatted = self._format_message(message, LogLevel.WARNING)
-        self.pane.write(formatted, LogLevel.WARNING.value[1])
+        self._write(message, LogLevel.WARNING)
     
     async def awarning(self, message: str) -> None:
         """Write warning message (asynchronous)
@@ -96,8 +131,7 @@ class PaneLogger:
         Args:
             message: Message text
         """
-        formatted = self._format_message(message, LogLevel.WARNING)
-        await self.pane.awrite(formatted, LogLevel.WARNING.value[1])
+        await self._awrite(message, LogLevel.WARNING)
     
     def error(self, message: str) -> None:
         """Write error message (synchronous)
@@ -105,8 +139,7 @@ class PaneLogger:
         Args:
             message: Message text
         """
-        formatted = self._format_message(message, LogLevel.ERROR)
-        self.pane.write(formatted, LogLevel.ERROR.value[1])
+        self._write(message, LogLevel.ERROR)
     
     async def aerror(self, message: str) -> None:
         """Write error message (asynchronous)
@@ -114,8 +147,7 @@ class PaneLogger:
         Args:
             message: Message text
         """
-        formatted = self._format_message(message, LogLevel.ERROR)
-        await self.pane.awrite(formatted, LogLevel.ERROR.value[1])
+        await self._awrite(message, LogLevel.ERROR)
     
     def critical(self, message: str) -> None:
         """Write critical message (synchronous)
@@ -123,8 +155,7 @@ class PaneLogger:
         Args:
             message: Message text
         """
-        formatted = self._format_message(message, LogLevel.CRITICAL)
-        self.pane.write(formatted, LogLevel.CRITICAL.value[1])
+        self._write(message, LogLevel.CRITICAL)
     
     async def acritical(self, message: str) -> None:
         """Write critical message (asynchronous)
@@ -132,28 +163,74 @@ class PaneLogger:
         Args:
             message: Message text
         """
-        formatted = self._format_message(message, LogLevel.CRITICAL)
-        await self.pane.awrite(formatted, LogLevel.CRITICAL.value[1])
+        await self._awrite(message, LogLevel.CRITICAL)
     
-    def log(self, message: str, level: LogLevel = LogLevel.INFO) -> None:
+    def log(self, message: str, level: LogLevel = LogLevel.INFO, timestamp: Optional[float] = None) -> None:
         """Write message at specified level (synchronous)
         
         Args:
             message: Message text
             level: Log level
+            timestamp: Epoch seconds the event happened (None = now)
         """
-        formatted = self._format_message(message, level)
-        self.pane.write(formatted, level.value[1])
+        self._write(message, level, timestamp)
     
-    async def alog(self, message: str, level: LogLevel = LogLevel.INFO) -> None:
+    async def alog(self, message: str, level: LogLevel = LogLevel.INFO, timestamp: Optional[float] = None) -> None:
         """Write message at specified level (asynchronous)
         
         Args:
             message: Message text
             level: Log level
+            timestamp: Epoch seconds the event happened (None = now)
+        """
+        await self._awrite(message, level, timestamp)
+    
+    def count(
+        self,
+        level: Optional[LogLevel] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> int:
+        """Count lines by level and time range, in O(log n) (thread-safe)
+        
+        Usage:
+            recent_errors = logger.count(LogLevel.ERROR, since=time.time() - 300)
+        
+        Args:
+            level: Log level, or None for all levels
+            since: Earliest epoch timestamp, inclusive (None = no bound)
+            until: Latest epoch timestamp, exclusive (None = no bound)
+            
+        Returns:
+            Number of indexed lines still in the pane (0 unless index=True)
+        """
+        level_id = None if level is None else _LEVEL_IDS[level]
+        return self.pane.count_log_lines(level_id, since, until)
+    
+    def level_counts(self) -> Dict[LogLevel, int]:
+        """Count lines of each level still in the pane (thread-safe)"""
+        return {level: self.count(level) for level in _LEVELS}
+    
+    def get_lines(
+        self,
+        level: Optional[LogLevel] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[int, str, str]]:
+        """Get lines by level and time range (thread-safe)
+        
+        Args:
+            level: Log level, or None for all levels
+            since: Earliest epoch timestamp, inclusive (None = no bound)
+            until: Latest epoch timestamp, exclusive (None = no bound)
+            limit: Return only the most recent ``limit`` lines (None = all)
+            
+        Returns:
+            List of (seq, message, style) tuples, oldest first (empty unless index=True)
         """
-        formatted = self._format_message(message, level)
-        await self.pane.awrite(formatted, level.value[1])
+        level_id = None if level is None else _LEVEL_IDS[level]
+        return self.pane.get_log_lines(level_id, since, until, limit)
 
 
 class StdoutPaneAdapter(logging.Handler):
@@ -165,15 +242,16 @@ class StdoutPaneAdapter(logging.Handler):
         logger.addHandler(handler)
     """
     
-    def __init__(self, pane) -> None:
+    def __init__(self, pane, index: bool = False) -> None:
         """Initialize adapter
         
         Args:
             pane: Pane instance to write to
+            index: Index lines by level and record time in the pane's LogIndex
         """
         super().__init__()
         self.pane = pane
-        self.pane_logger = PaneLogger(pane, include_timestamp=False)
+        self.pane_logger = PaneLogger(pane, include_timestamp=False, index=index)
     
     def emit(self, record: logging.LogRecord) -> None:
         """Emit log record to pane
@@ -194,7 +272,7 @@ class StdoutPaneAdapter(logging.Handler):
             }
             
             log_level = level_map.get(record.levelno, LogLevel.INFO)
-            self.pane_logger.log(msg, log_level)
+            self.pane_logger.log(msg, log_level, record.created)
         except Exception:
             self.handleError(record)
 
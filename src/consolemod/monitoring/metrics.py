@@ -9,9 +9,17 @@ from collections import deque
 class FrameMetrics:
     """Frame timing metrics"""
     timestamp: float
-    render_time: float  # milliseconds
-    input_time: float   # milliseconds
-    total_time: float   # milliseconds
+    render_time: float        # milliseconds, Rich rendering to terminal output
+    input_time: float         # milliseconds, draining and handling key events
+    total_time: float         # milliseconds
+    layout_time: float = 0.0  # milliseconds, geometry and layout tree update
+    build_time: float = 0.0   # milliseconds, rebuilding dirty pane renderables
+    write_time: float = 0.0   # milliseconds, writing output to the terminal
+    output_bytes: int = 0     # bytes written to the terminal
+
+
+# FrameMetrics fields reported as per-phase averages
+FRAME_PHASES = ("input_time", "layout_time", "build_time", "render_time", "write_time")
 
 
 class PerformanceMonitor:
@@ -27,31 +35,47 @@ class PerformanceMonitor:
         self.frames: deque = deque(maxlen=max_history)
         self.pane_metrics: Dict[str, dict] = {}  # pane_id -> metrics
         self._current_frame: Optional[FrameMetrics] = None
-        self._frame_start: Optional[float] = None
+        self._frame_start: Optional[int] = None  # perf_counter_ns() at frame start
     
     def start_frame(self) -> None:
         """Mark start of frame (thread-safe)"""
         with self.lock:
-            self._frame_start = time.time()
+            self._frame_start = time.perf_counter_ns()
     
-    def end_frame(self, render_time: float = 0, input_time: float = 0) -> None:
+    def end_frame(
+        self,
+        render_time: float = 0,
+        input_time: float = 0,
+        layout_time: float = 0,
+        build_time: float = 0,
+        write_time: float = 0,
+        output_bytes: int = 0
+    ) -> None:
         """Mark end of frame and record metrics (thread-safe)
         
         Args:
             render_time: Time spent rendering (ms)
             input_time: Time spent on input (ms)
+            layout_time: Time spent computing layout (ms)
+            build_time: Time spent building renderables (ms)
+            write_time: Time spent writing to the terminal (ms)
+            output_bytes: Bytes written to the terminal
         """
         with self.lock:
             if self._frame_start is None:
                 return
             
-            total_time = (time.time() - self._frame_start) * 1000  # Convert to ms
+            total_time = (time.perf_counter_ns() - self._frame_start) / 1_000_000  # ns to ms
             
             frame = FrameMetrics(
                 timestamp=time.time(),
                 render_time=render_time,
                 input_time=input_time,
-                total_time=total_time
+                total_time=total_time,
+                layout_time=layout_time,
+                build_time=build_time,
+                write_time=write_time,
+                output_bytes=output_bytes
             )
             
             self.frames.append(frame)
@@ -65,16 +89,37 @@ class PerformanceMonitor:
             message_count: Number of messages written
         """
         with self.lock:
-            if pane_id not in self.pane_metrics:
-                self.pane_metrics[pane_id] = {
-                    "writes": 0,
-                    "messages": 0,
-                    "last_write": 0
-                }
-            
-            self.pane_metrics[pane_id]["writes"] += 1
-            self.pane_metrics[pane_id]["messages"] += message_count
-            self.pane_metrics[pane_id]["last_write"] = time.time()
+            metrics = self._pane_entry(pane_id)
+            metrics["writes"] += 1
+            metrics["messages"] += message_count
+            metrics["last_write"] = time.time()
+    
+    def record_panes(self, panes) -> None:
+        """Record ingest policy counters of each pane that has one (thread-safe)
+        
+        The counters (received, dropped, sampled, blocked, blocked_time,
+        plus the policy's mode and rate) are merged into get_pane_stats().
+        Policies keep running totals, so this costs O(1) per pane.
+        
+        Args:
+            panes: Iterable of Pane objects
+        """
+        counters = [(pane.id, pane.get_ingest_stats()) for pane in panes]
+        with self.lock:
+            for pane_id, stats in counters:
+                if stats:
+                    self._pane_entry(pane_id).update(stats)
+    
+    def _pane_entry(self, pane_id: str) -> dict:
+        """Get a pane's metrics dict, creating it if needed (call with lock held)"""
+        metrics = self.pane_metrics.get(pane_id)
+        if metrics is None:
+            metrics = self.pane_metrics[pane_id] = {
+                "writes": 0,
+                "messages": 0,
+                "last_write": 0
+            }
+        return metrics
     
     def get_fps(self) -> float:
         """Get current FPS (thread-safe)
@@ -117,6 +162,21 @@ class PerformanceMonitor:
             
             return max(f.total_time for f in self.frames)
     
+    def get_phase_averages(self) -> Dict[str, float]:
+        """Get average time per frame phase (thread-safe)
+        
+        Returns:
+            Dict of phase name (e.g. "render_time") -> average milliseconds
+        """
+        with self.lock:
+            count = len(self.frames)
+            if not count:
+                return {phase: 0 for phase in FRAME_PHASES}
+            return {
+                phase: sum(getattr(f, phase) for f in self.frames) / count
+                for phase in FRAME_PHASES
+            }
+    
     def get_pane_stats(self, pane_id: str) -> Optional[Dict]:
         """Get pane statistics (thread-safe)
         
@@ -138,7 +198,11 @@ class PerformanceMonitor:
 
 
 class MemoryMonitor:
-    """Thread-safe memory usage monitoring"""
+    """Thread-safe memory usage monitoring
+    
+    The total is adjusted by the difference on each update rather than
+    re-summed, so recording one pane is O(1) regardless of pane count.
+    """
     
     def __init__(self) -> None:
         """Initialize memory monitor"""
@@ -156,9 +220,29 @@ class MemoryMonitor:
         with self.lock:
             old_value = self.pane_memory.get(pane_id, 0)
             self.pane_memory[pane_id] = bytes_used
-            
-            # Update total
-            self.total_memory = sum(self.pane_memory.values())
+            self.total_memory += bytes_used - old_value
+    
+    def record_panes(self, panes) -> None:
+        """Record current usage for each pane (thread-safe)
+        
+        Pane buffers keep running byte totals, so this costs O(1) per pane.
+        
+        Args:
+            panes: Iterable of Pane objects
+        """
+        usage = [(pane.id, pane.get_memory_usage()) for pane in panes]
+        with self.lock:
+            for pane_id, bytes_used in usage:
+                self.record_pane_memory(pane_id, bytes_used)
+    
+    def remove_pane(self, pane_id: str) -> None:
+        """Stop tracking a pane (thread-safe)
+        
+        Args:
+            pane_id: Pane ID
+        """
+        with self.lock:
+            self.total_memory -= self.pane_memory.pop(pane_id, 0)
     
     def get_pane_memory(self, pane_id: str) -> int:
         """Get pane memory usage (thread-safe)
@@ -5,7 +5,12 @@ from .formatter import (
 )
 from .config import load_config
 from .export import PaneExporter
-from .buffer import CircularBuffer
+from .buffer import CircularBuffer, StyleTable
+from .scrollback import ScrollbackTier, SpillTier, CompressedTier
+from .search_index import TrigramIndex
+from .log_index import LogIndex
+from .row_index import RowIndex
+from .collapse import RepeatCollapser
 from .history import CommandHistory, UndoRedoStack, StateSnapshot
 
 # Templates are imported lazily to avoid circular imports
@@ -20,7 +25,13 @@ __all__ = [
     # Export
     "PaneExporter",
     # Buffer
-    "CircularBuffer",
+    "CircularBuffer", "StyleTable",
+    # Scrollback tiers
+    "ScrollbackTier", "SpillTier", "CompressedTier",
+    # Indexes
+    "TrigramIndex", "LogIndex", "RowIndex",
+    # Repeated-line collapsing
+    "RepeatCollapser",
     # History
     "CommandHistory", "UndoRedoStack", "StateSnapshot",
     # Note: Templates in .templates submodule to avoid circular imports
@@ -1,39 +1,333 @@
-from typing import List, Tuple, Optional, Deque
-from collections import deque
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Union
 import threading
+from .scrollback import ScrollbackTier
+from .search_index import TrigramIndex
+
+
+class StyleTable:
+    """Thread-safe intern table mapping style strings to small integer ids
+    
+    Panes use only a handful of distinct styles, so compact buffers store a
+    style id per line instead of a style string.
+    """
+    
+    def __init__(self) -> None:
+        self.lock: threading.RLock = threading.RLock()
+        self._ids: Dict[str, int] = {}
+        self._styles: List[str] = []
+    
+    def intern(self, style: str) -> int:
+        """Get the id for a style, adding it if new (thread-safe)
+        
+        Args:
+            style: Style/color identifier
+            
+        Returns:
+            Style id
+        """
+        style_id = self._ids.get(style)
+        if style_id is None:
+            with self.lock:
+                style_id = self._ids.get(style)
+                if style_id is None:
+                    style_id = len(self._styles)
+                    self._styles.append(style)
+                    self._ids[style] = style_id
+        return style_id
+    
+    def get(self, style_id: int) -> str:
+        """Get the style for an id
+        
+        Args:
+            style_id: Id returned by intern()
+            
+        Returns:
+            Style/color identifier
+        """
+        return self._styles[style_id]
+    
+    def __len__(self) -> int:
+        """Get number of interned styles"""
+        return len(self._styles)
+
+
+# Shared by all compact buffers
+STYLE_TABLE = StyleTable()
+
+# Marks an unused _TupleStore slot
+_EMPTY: Tuple[str, str] = ("", "")
+
+
+class _TupleStore:
+    """Slot storage keeping each line as a (message, style) tuple
+    
+    Tracks a running byte total: the slot list plus each line's tuple and
+    message object as reported by ``sys.getsizeof``. Style strings are
+    shared between lines and are not counted per line.
+    """
+    
+    def __init__(self, capacity: int) -> None:
+        self.capacity: int = capacity
+        self.clear()
+    
+    def set(self, slot: int, message: str, style: str) -> None:
+        old = self._items[slot]
+        if old is not _EMPTY:
+            self._bytes -= self._line_size(old)
+        item = (message, style)
+        self._items[slot] = item
+        self._bytes += self._line_size(item)
+    
+    def replace_newest(self, slot: int, message: str, style: str) -> None:
+        """Overwrite the slot of the newest line"""
+        self.set(slot, message, style)
+    
+    @staticmethod
+    def _line_size(item: Tuple[str, str]) -> int:
+        return sys.getsizeof(item) + sys.getsizeof(item[0])
+    
+    def get(self, slot: int) -> Tuple[str, str]:
+        return self._items[slot]
+    
+    def get_run(self, slot: int, count: int) -> List[Tuple[str, str]]:
+        """Get ``count`` consecutive slots starting at ``slot`` (no wrapping)"""
+        return self._items[slot:slot + count]
+    
+    def clear(self) -> None:
+        self._items: List[Tuple[str, str]] = [_EMPTY] * self.capacity
+        self._bytes: int = sys.getsizeof(self._items)
+    
+    def get_memory_usage(self) -> int:
+        return self._bytes
+
+
+class _CompactStore:
+    """Slot storage keeping messages in a UTF-8 arena with columnar metadata
+    
+    Each slot holds an offset and length into one bytearray plus an interned
+    style id, kept in ``array`` columns. The ring always overwrites its
+    oldest line, whose bytes sit at the front of the arena, so they are
+    trimmed from the front and the arena stays close to the live payload.
+    """
+    
+    def __init__(self, capacity: int, styles: StyleTable) -> None:
+        self.capacity: int = capacity
+        self.styles: StyleTable = styles
+        self.clear()
+    
+    def set(self, slot: int, message: str, style: str) -> None:
+        data = str(message).encode("utf-8")
+        dropped = self._lengths[slot]
+        if dropped:
+            # Overwriting the oldest line: its bytes are at the arena front
+            del self._arena[:dropped]
+            self._base += dropped
+        self._offsets[slot] = self._base + len(self._arena)
+        self._lengths[slot] = len(data)
+        self._style_ids[slot] = self.styles.intern(style)
+        self._arena += data
+    
+    def replace_newest(self, slot: int, message: str, style: str) -> None:
+        """Overwrite the slot of the newest line, whose bytes end the arena"""
+        data = str(message).encode("utf-8")
+        del self._arena[len(self._arena) - self._lengths[slot]:]
+        self._offsets[slot] = self._base + len(self._arena)
+        self._lengths[slot] = len(data)
+        self._style_ids[slot] = self.styles.intern(style)
+        self._arena += data
+    
+    def get(self, slot: int) -> Tuple[str, str]:
+        start = self._offsets[slot] - self._base
+        message = self._arena[start:start + self._lengths[slot]].decode("utf-8")
+        return message, self.styles.get(self._style_ids[slot])
+    
+    def get_run(self, slot: int, count: int) -> List[Tuple[str, str]]:
+        """Get ``count`` consecutive slots starting at ``slot`` (no wrapping)"""
+        get = self.get
+        return [get(s) for s in range(slot, slot + count)]
+    
+    def clear(self) -> None:
+        self._arena: bytearray = bytearray()
+        self._base: int = 0  # Absolute offset of the arena's first byte
+        self._offsets: array = array("Q", bytes(8 * self.capacity))
+        self._lengths: array = array("I", bytes(4 * self.capacity))
+        self._style_ids: array = array("I", bytes(4 * self.capacity))
+    
+    def get_memory_usage(self) -> int:
+        return (
+            sys.getsizeof(self._arena)
+            + sys.getsizeof(self._offsets)
+            + sys.getsizeof(self._lengths)
+            + sys.getsizeof(self._style_ids)
+        )
 
 
 class CircularBuffer:
-    """Thread-safe circular buffer with size limits and search capabilities"""
+    """Thread-safe circular buffer with size limits and search capabilities
     
-    def __init__(self, max_size: int = 10000) -> None:
+    Lines live in preallocated slots used as a ring: ``_head`` is the slot of
+    the oldest line and ``_count`` the number of lines stored. Appending
+    overwrites the oldest slot once the buffer is full, and slices, tail
+    reads and indexing copy only the lines they return.
+    
+    With ``compact=True`` lines are stored as UTF-8 bytes in a contiguous
+    arena with interned style ids instead of Python tuples, which costs
+    little more than the message payload per line.
+    
+    With a ``history`` tier, lines evicted from the ring move into the tier
+    instead of being dropped. Positions then span the tier (oldest) and the
+    ring, and ``len()``, slices, search and filter cover both.
+    
+    With ``indexed=True`` a TrigramIndex is kept up to date as lines are
+    appended and dropped, and search() verifies only the lines whose
+    trigrams match the query instead of scanning every line.
+    
+    Every appended line gets a sequence number (0 for the first line ever
+    appended) that never changes, unlike its position, which shifts as old
+    lines are evicted. get_by_seq() and get_since() address lines by
+    sequence, so consumers can process only lines they have not seen yet.
+    """
+    
+    def __init__(
+        self,
+        max_size: int = 10000,
+        compact: bool = False,
+        history: Optional[ScrollbackTier] = None,
+        indexed: bool = False
+    ) -> None:
         """Initialize circular buffer
         
         Args:
-            max_size: Maximum number of items to store
+            max_size: Maximum number of items to keep in memory
+            compact: Store lines in a UTF-8 arena with interned styles
+                (lower memory, slightly slower reads)
+            history: Tier receiving evicted lines (e.g. SpillTier), or None
+                to drop them
+            indexed: Maintain a trigram index for fast search (costs
+                about 8 bytes per distinct trigram per line)
         """
         self.max_size: int = max_size
-        self.buffer: Deque[Tuple[str, str]] = deque(maxlen=max_size)
+        self.compact: bool = compact
+        self.history: Optional[ScrollbackTier] = history
+        capacity = max(0, max_size)
+        self._store = _CompactStore(capacity, STYLE_TABLE) if compact else _TupleStore(capacity)
+        self._head: int = 0   # Slot of the oldest item
+        self._count: int = 0  # Items currently stored
         self.lock: threading.RLock = threading.RLock()
         self.version: int = 0  # Bumped on each write for change detection
+        self.appended: int = 0  # Items ever appended, including evicted and cleared ones
+        self.index: Optional[TrigramIndex] = TrigramIndex() if indexed else None
     
     def append(self, message: str, style: str = "white") -> None:
-        """Add message to buffer (thread-safe)
+        """Add message to buffer, overwriting the oldest when full (thread-safe)
         
         Args:
             message: Message text
             style: Style/color identifier
         """
         with self.lock:
-            self.buffer.append((message, style))
+            capacity = self._store.capacity
+            if capacity:
+                if self._count < capacity:
+                    self._store.set((self._head + self._count) % capacity, message, style)
+                    self._count += 1
+                else:
+                    if self.history is not None:
+                        self.history.append(*self._store.get(self._head))
+                    self._store.set(self._head, message, style)
+                    self._head = (self._head + 1) % capacity
+            elif self.history is not None:
+                self.history.append(message, style)
+            if self.index is not None:
+                self.index.add(self.appended, message)
+            self.appended += 1
+            if self.index is not None:
+                self.index.discard_before(self._first_seq())
             self.version += 1
     
+    def extend(self, items: List[Tuple[str, str]]) -> None:
+        """Add many (message, style) items with one lock and one version bump (thread-safe)
+        
+        Args:
+            items: Items in order, oldest first
+        """
+        if not items:
+            return
+        with self.lock:
+            if self.index is not None:
+                self.index.add_many(self.appended, [message for message, _ in items])
+            self.appended += len(items)
+            store = self._store
+            capacity = store.capacity
+            history = self.history
+            if not capacity:
+                if history is not None:
+                    history.extend(items)
+            else:
+                if len(items) > capacity:
+                    # Older items would be overwritten anyway
+                    if history is not None:
+                        history.extend(self._ring_range(0, self._count) + items[:-capacity])
+                        store.clear()
+                        self._head = self._count = 0
+                    items = items[-capacity:]
+                evicted = []
+                for message, style in items:
+                    if self._count < capacity:
+                        store.set((self._head + self._count) % capacity, message, style)
+                        self._count += 1
+                    else:
+                        if history is not None:
+                            evicted.append(store.get(self._head))
+                        store.set(self._head, message, style)
+                        self._head = (self._head + 1) % capacity
+                if evicted and history is not None:
+                    history.extend(evicted)
+            if self.index is not None:
+                self.index.discard_before(self._first_seq())
+            self.version += 1
+    
+    def replace_last(self, message: str, style: str) -> Optional[int]:
+        """Rewrite the newest line in place, keeping its sequence number (thread-safe)
+        
+        Args:
+            message: New message text
+            style: New style/color identifier
+            
+        Returns:
+            Sequence number of the rewritten line, or None if the newest
+            line is not in the in-memory ring (empty, or max_size 0)
+        """
+        with self.lock:
+            if not self._count:
+                return None
+            slot = (self._head + self._count - 1) % self._store.capacity
+            self._store.replace_newest(slot, message, style)
+            seq = self.appended - 1
+            if self.index is not None:
+                self.index.update_last(seq, message)
+            self.version += 1
+            return seq
+    
     def clear(self) -> None:
         """Clear buffer (thread-safe)"""
         with self.lock:
-            self.buffer.clear()
+            self._store.clear()
+            if self.history is not None:
+                self.history.clear()
+            if self.index is not None:
+                self.index.clear()
+            self._head = 0
+            self._count = 0
             self.version += 1
     
+    def is_full(self) -> bool:
+        """Check whether the next append will evict the oldest in-memory item (thread-safe)"""
+        with self.lock:
+            return self._count >= self._store.capacity
+    
     def get_all(self) -> List[Tuple[str, str]]:
         """Get all messages (thread-safe)
         
@@ -41,20 +335,26 @@ class CircularBuffer:
             List of (message, style) tuples
         """
         with self.lock:
-            return list(self.buffer)
+            return self._copy_range(0, self._total())
     
-    def get_slice(self, start: int = 0, end: Optional[int] = None) -> List[Tuple[str, str]]:
-        """Get slice of buffer (thread-safe)
+    def get_slice(self, start: int = 0, end: Optional[int] = None, with_seq: bool = False) -> List[tuple]:
+        """Get slice of buffer, O(k) in the items returned (thread-safe)
         
         Args:
-            start: Start index
+            start: Start index (negative counts from the end)
             end: End index (None = end of buffer)
+            with_seq: Prefix each line with its sequence number
             
         Returns:
-            List of (message, style) tuples
+            List of (message, style) tuples, or (seq, message, style) with with_seq
         """
         with self.lock:
-            return list(self.buffer)[start:end]
+            start, end, _ = slice(start, end).indices(self._total())
+            lines = self._copy_range(start, end)
+            if not with_seq:
+                return lines
+            base = self._first_seq() + start
+            return [(base + i, message, style) for i, (message, style) in enumerate(lines)]
     
     def get_last(self, count: int) -> List[Tuple[str, str]]:
         """Get last N messages (thread-safe)
@@ -68,36 +368,185 @@ class CircularBuffer:
         with self.lock:
             if count <= 0:
                 return []
-            return list(self.buffer)[-count:]
+            total = self._total()
+            return self._copy_range(max(0, total - count), total)
+    
+    def __getitem__(self, index: Union[int, slice]):
+        """Get an item by position (0 = oldest) or a slice (thread-safe)
+        
+        Raises:
+            IndexError: If the index is out of range
+        """
+        with self.lock:
+            if isinstance(index, slice):
+                if index.step not in (None, 1):
+                    return self.get_all()[index]
+                return self.get_slice(index.start or 0, index.stop)
+            total = self._total()
+            if index < 0:
+                index += total
+            if not 0 <= index < total:
+                raise IndexError("CircularBuffer index out of range")
+            return self._copy_range(index, index + 1)[0]
+    
+    def get_first_seq(self) -> int:
+        """Get the sequence number of the oldest stored line (thread-safe)"""
+        with self.lock:
+            return self._first_seq()
+    
+    def get_ring_first_seq(self) -> int:
+        """Get the sequence number of the oldest line held in memory, not in the history tier (thread-safe)"""
+        with self.lock:
+            return self.appended - self._count
+    
+    def get_next_seq(self) -> int:
+        """Get the sequence number the next appended line will get (thread-safe)"""
+        with self.lock:
+            return self.appended
     
-    def search(self, query: str, case_sensitive: bool = False) -> List[Tuple[int, str, str]]:
+    def get_by_seq(self, seq: int) -> Optional[Tuple[str, str]]:
+        """Get a line by sequence number (thread-safe)
+        
+        Args:
+            seq: Sequence number
+            
+        Returns:
+            (message, style) tuple, or None if the line was dropped or not yet written
+        """
+        with self.lock:
+            position = seq - self._first_seq()
+            if not 0 <= position < self._total():
+                return None
+            return self._line_at(position)
+    
+    def get_since(self, seq: int, limit: Optional[int] = None) -> List[Tuple[int, str, str]]:
+        """Get stored lines with sequence numbers >= seq (thread-safe)
+        
+        Lines already dropped are skipped, so a consumer that falls behind
+        resumes from the oldest line still available.
+        
+        Args:
+            seq: First sequence number wanted (e.g. the last one seen + 1)
+            limit: Maximum number of lines (None = all)
+            
+        Returns:
+            List of (seq, message, style) tuples, oldest first
+        """
+        with self.lock:
+            first_seq = self._first_seq()
+            start = max(0, seq - first_seq)
+            end = self._total()
+            if limit is not None:
+                end = min(end, start + max(0, limit))
+            lines = self._copy_range(start, end)
+            base = first_seq + start
+            return [(base + i, message, style) for i, (message, style) in enumerate(lines)]
+    
+    def _total(self) -> int:
+        """Lines in the history tier plus the ring (call with lock held)"""
+        if self.history is None:
+            return self._count
+        return len(self.history) + self._count
+    
+    def _first_seq(self) -> int:
+        """Sequence number of the oldest line still stored (call with lock held)"""
+        return self.appended - self._total()
+    
+    def _copy_range(self, start: int, end: int) -> List[Tuple[str, str]]:
+        """Copy positions [start, end) across history and ring (call with lock held)"""
+        if self.history is None:
+            return self._ring_range(start, end)
+        spilled = len(self.history)
+        if start >= spilled:
+            return self._ring_range(start - spilled, end - spilled)
+        lines = self.history.get_range(start, min(end, spilled))
+        if end > spilled:
+            lines += self._ring_range(0, end - spilled)
+        return lines
+    
+    def _line_at(self, position: int) -> Tuple[str, str]:
+        """Get the line at a valid position (call with lock held)"""
+        history = self.history
+        spilled = len(history) if history is not None else 0
+        if history is not None and position < spilled:
+            return history.get_range(position, position + 1)[0]
+        capacity = self._store.capacity
+        return self._store.get((self._head + position - spilled) % capacity)
+    
+    def _ring_range(self, start: int, end: int) -> List[Tuple[str, str]]:
+        """Copy ring positions [start, end) in order (call with lock held)"""
+        if end <= start:
+            return []
+        capacity = self._store.capacity
+        first = (self._head + start) % capacity
+        count = end - start
+        if first + count <= capacity:
+            return self._store.get_run(first, count)
+        head_count = capacity - first
+        return self._store.get_run(first, head_count) + self._store.get_run(0, count - head_count)
+    
+    def _slots(self) -> Iterator[int]:
+        """Iterate occupied slots oldest first (call with lock held)"""
+        capacity = self._store.capacity
+        for offset in range(self._count):
+            yield (self._head + offset) % capacity
+    
+    def _iter_items(self) -> Iterator[Tuple[str, str]]:
+        """Iterate items oldest first without copying (call with lock held)"""
+        if self.history is not None:
+            yield from self.history.iter_range(0, len(self.history))
+        get = self._store.get
+        for slot in self._slots():
+            yield get(slot)
+    
+    def search(
+        self,
+        query: str,
+        case_sensitive: bool = False,
+        by_seq: bool = False
+    ) -> List[Tuple[int, str, str]]:
         """Search for query in buffer (thread-safe)
         
+        Indexed buffers answer queries of three or more characters from the
+        trigram index and check only the candidate lines.
+        
         Args:
             query: Search query
             case_sensitive: Whether search is case-sensitive
+            by_seq: Return sequence numbers instead of positions
             
         Returns:
             List of (line_number, message, style) tuples
         """
+        needle = query if case_sensitive else query.lower()
         with self.lock:
             results = []
+            candidates = self.index.candidates(query) if self.index is not None else None
             
-            for idx, (message, style) in enumerate(self.buffer):
+            lines: Iterable[Tuple[int, Tuple[str, str]]]
+            if candidates is not None:
+                first_seq = self._first_seq()
+                positions = [seq - first_seq for seq in candidates]
+                lines = zip(positions, map(self._line_at, positions))
+            else:
+                lines = enumerate(self._iter_items())
+            
+            for idx, (message, style) in lines:
                 if case_sensitive:
-                    if query in message:
+                    if needle in message:
                         results.append((idx, message, style))
                 else:
-                    if query.lower() in message.lower():
+                    if needle in message.lower():
                         results.append((idx, message, style))
             
-            return results
+            return self._to_seq(results) if by_seq else results
     
-    def filter(self, predicate) -> List[Tuple[int, str, str]]:
+    def filter(self, predicate, by_seq: bool = False) -> List[Tuple[int, str, str]]:
         """Filter buffer with predicate function (thread-safe)
         
         Args:
             predicate: Function that returns True for matching items
+            by_seq: Return sequence numbers instead of positions
             
         Returns:
             List of (line_number, message, style) tuples
@@ -105,16 +554,21 @@ class CircularBuffer:
         with self.lock:
             results = []
             
-            for idx, (message, style) in enumerate(self.buffer):
+            for idx, (message, style) in enumerate(self._iter_items()):
                 if predicate(message, style):
                     results.append((idx, message, style))
             
-            return results
+            return self._to_seq(results) if by_seq else results
+    
+    def _to_seq(self, results: List[Tuple[int, str, str]]) -> List[Tuple[int, str, str]]:
+        """Turn result positions into sequence numbers (call with lock held)"""
+        first_seq = self._first_seq()
+        return [(first_seq + idx, message, style) for idx, message, style in results]
     
     def __len__(self) -> int:
-        """Get buffer length (thread-safe)"""
+        """Get buffer length, including history tier lines (thread-safe)"""
         with self.lock:
-            return len(self.buffer)
+            return self._total()
     
     def get_version(self) -> int:
         """Get version number for change detection (thread-safe)
@@ -126,17 +580,21 @@ class CircularBuffer:
             return self.version
     
     def get_memory_usage(self) -> int:
-        """Estimate memory usage in bytes (thread-safe)
+        """Get memory used by stored lines in bytes, in O(1) (thread-safe)
+        
+        The total is kept up to date on append, eviction and clear from
+        ``sys.getsizeof`` sizes, so polling it never scans the buffer.
         
         Returns:
-            Approximate memory usage
+            Bytes used
         """
         with self.lock:
-            total = 0
-            for message, style in self.buffer:
-                total += len(message) * 2  # Unicode
-                total += len(style) * 2
-            return total
+            usage = self._store.get_memory_usage()
+            if self.history is not None:
+                usage += self.history.get_memory_usage()
+            if self.index is not None:
+                usage += self.index.get_memory_usage()
+            return usage
 
 
 if __name__ == '__main__':
@@ -0,0 +1,127 @@
+import re
+import threading
+import time
+from typing import Optional, Tuple
+
+# Digit runs masked out of messages in template mode
+_DIGITS = re.compile(r"\d+")
+
+
+def _clock(timestamp: float) -> str:
+    """Format an epoch timestamp as local HH:MM:SS"""
+    return time.strftime("%H:%M:%S", time.localtime(timestamp))
+
+
+class RepeatCollapser:
+    """Thread-safe merger of consecutive repeated lines
+
+    Fed every committed batch in order, it drops lines that repeat the
+    line before them and counts them against the line that started the
+    run. A line repeats the previous one if both have the same style and
+    the same text, or in template mode the same text once digit runs are
+    masked (so "retry 3 of 10" repeats "retry 2 of 10"). When a run grows,
+    its first line is rewritten as ``message (xN, first - last)`` with the
+    local times of the first and latest occurrence, so a flood of
+    identical lines takes a single buffer slot.
+
+    Matching costs one string comparison per line, plus one regex
+    substitution in template mode.
+    """
+
+    def __init__(self, template: bool = False) -> None:
+        """Initialize collapser
+
+        Args:
+            template: Treat messages differing only in digits as repeats
+        """
+        self.lock: threading.RLock = threading.RLock()
+        self.template: bool = template
+        self.collapsed: int = 0  # Lines merged into an earlier line
+        self._key: Optional[str] = None
+        self._message: str = ""  # Text of the line that started the current run
+        self._style: str = ""
+        self._count: int = 0     # Occurrences in the current run (0 = no run)
+        self._first: float = 0.0
+        self._last: float = 0.0
+
+    def collapse(
+        self,
+        batch: list,
+        now: Optional[float] = None
+    ) -> Tuple[Optional[Tuple[str, str]], list]:
+        """Merge repeated lines of a batch, continuing the previous batch's run (thread-safe)
+
+        Args:
+            batch: Staged (message, style) lines or
+                (message, style, level, timestamp) records, oldest first
+            now: Time of lines without a timestamp (default: time.time())
+
+        Returns:
+            (new (message, style) for the previously committed last line, or
+            None if it is unchanged; lines to commit)
+        """
+        with self.lock:
+            if now is None:
+                now = time.time()
+            lines: list = []
+            replaced = None
+            position = -1  # Run's line in ``lines``; -1 = already committed
+            grown = False  # Only set while a run exists, so position is valid then
+            for item in batch:
+                message, style = item[0], item[1]
+                timestamp = item[3] if len(item) == 4 else now
+                key = _DIGITS.sub("#", str(message)) if self.template else message
+                if self._count and key == self._key and style == self._style:
+                    self._count += 1
+                    self._last = timestamp
+                    self.collapsed += 1
+                    grown = True
+                    continue
+                if grown:
+                    replaced = self._write_run(lines, position) or replaced
+                self._key = key
+                self._message = message
+                self._style = style
+                self._count = 1
+                self._first = self._last = timestamp
+                position = len(lines)
+                grown = False
+                lines.append(item)
+            if grown:
+                replaced = self._write_run(lines, position) or replaced
+            return replaced, lines
+
+    def get_run(self) -> Optional[Tuple[str, int, float, float]]:
+        """Get the current run (thread-safe)
+
+        Returns:
+            (first message, occurrences, first timestamp, latest timestamp),
+            or None before the first line
+        """
+        with self.lock:
+            if not self._count:
+                return None
+            return self._message, self._count, self._first, self._last
+
+    def reset(self) -> None:
+        """End the current run, e.g. after the pane is cleared (thread-safe)"""
+        with self.lock:
+            self._key = None
+            self._count = 0
+
+    def _write_run(self, lines: list, position: int) -> Optional[Tuple[str, str]]:
+        """Put the current run's counter into its line (call with lock held)
+
+        Returns:
+            The new (message, style) if the line was committed in an earlier
+            batch (position -1), else None after rewriting ``lines`` in place
+        """
+        text = f"{self._message} (x{self._count}, {_clock(self._first)} - {_clock(self._last)})"
+        if position == -1:
+            return text, self._style
+        lines[position] = (text,) + tuple(lines[position][1:])
+        return None
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
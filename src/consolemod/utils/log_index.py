@@ -0,0 +1,188 @@
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class LogIndex:
+    """Thread-safe level and timestamp index over logger-written lines
+
+    Each indexed line is one entry in parallel ``array`` columns: sequence
+    number, level id and epoch timestamp. Every level also keeps its own
+    array of sequence numbers. All columns are in commit order and entries
+    for dropped lines are trimmed from the front, so counting and fetching
+    by level or time range are binary searches rather than scans.
+
+    Timestamps are clamped to be non-decreasing in commit order, so a clock
+    step backwards or writers racing each other cannot break the search.
+    Level ids are small integers chosen by the caller (PaneLogger uses the
+    position of each LogLevel).
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty index"""
+        self.lock: threading.RLock = threading.RLock()
+        self._seqs: "array[int]" = array("Q")
+        self._times: "array[float]" = array("d")
+        self._levels: "array[int]" = array("B")
+        self._start: int = 0                        # First live entry in the columns
+        self._level_seqs: Dict[int, "array[int]"] = {}  # Level id -> sequence numbers
+        self._level_start: Dict[int, int] = {}      # Level id -> first live entry
+        self._last_time: float = 0.0
+
+    def add(self, seq: int, level: int, timestamp: float) -> None:
+        """Index one line (thread-safe)
+
+        Args:
+            seq: Line sequence number, higher than any indexed so far
+            level: Level id (0-255)
+            timestamp: Epoch seconds
+        """
+        self.add_many([(seq, level, timestamp)])
+
+    def add_many(self, records: Iterable[Tuple[int, int, float]]) -> None:
+        """Index (seq, level, timestamp) records in commit order (thread-safe)"""
+        with self.lock:
+            last_time = self._last_time
+            for seq, level, timestamp in records:
+                last_time = max(last_time, timestamp)
+                self._seqs.append(seq)
+                self._times.append(last_time)
+                self._levels.append(level)
+                level_seqs = self._level_seqs.get(level)
+                if level_seqs is None:
+                    level_seqs = self._level_seqs[level] = array("Q")
+                    self._level_start[level] = 0
+                level_seqs.append(seq)
+            self._last_time = last_time
+
+    def discard_before(self, seq: int) -> None:
+        """Forget lines with sequence numbers below ``seq`` (thread-safe)"""
+        with self.lock:
+            self._start = self._trim(self._start, seq, self._seqs, self._times, self._levels)
+            for level, level_seqs in self._level_seqs.items():
+                self._level_start[level] = self._trim(self._level_start[level], seq, level_seqs)
+
+    def count(
+        self,
+        level: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> int:
+        """Count indexed lines by level and time range in O(log n) (thread-safe)
+
+        Args:
+            level: Level id, or None for all levels
+            since: Earliest timestamp, inclusive (None = no lower bound)
+            until: Latest timestamp, exclusive (None = no upper bound)
+
+        Returns:
+            Number of matching lines
+        """
+        with self.lock:
+            lo, hi = self._bounds(level, since, until)
+            return hi - lo
+
+    def seqs(
+        self,
+        level: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> List[int]:
+        """Get sequence numbers of matching lines, oldest first (thread-safe)
+
+        Args:
+            level: Level id, or None for all levels
+            since: Earliest timestamp, inclusive (None = no lower bound)
+            until: Latest timestamp, exclusive (None = no upper bound)
+            limit: Return only the most recent ``limit`` lines (None = all)
+
+        Returns:
+            Ascending sequence numbers
+        """
+        with self.lock:
+            lo, hi = self._bounds(level, since, until)
+            if limit is not None:
+                lo = max(lo, hi - max(0, limit))
+            column = self._seqs if level is None else self._level_seqs.get(level, array("Q"))
+            return column[lo:hi].tolist()
+
+    def get_level(self, seq: int) -> Optional[int]:
+        """Get the level id of an indexed line (thread-safe)
+
+        Returns:
+            Level id, or None if the line is not indexed
+        """
+        with self.lock:
+            position = bisect_left(self._seqs, seq, self._start)
+            if position == len(self._seqs) or self._seqs[position] != seq:
+                return None
+            return self._levels[position]
+
+    def clear(self) -> None:
+        """Drop all entries (thread-safe)"""
+        with self.lock:
+            self._seqs = array("Q")
+            self._times = array("d")
+            self._levels = array("B")
+            self._start = 0
+            self._level_seqs.clear()
+            self._level_start.clear()
+
+    def get_memory_usage(self) -> int:
+        """Get bytes used by the index columns (thread-safe)"""
+        with self.lock:
+            columns: List[array] = [self._seqs, self._times, self._levels, *self._level_seqs.values()]
+            return sum(column.buffer_info()[1] * column.itemsize for column in columns)
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self._seqs) - self._start
+
+    def _bounds(self, level: Optional[int], since: Optional[float], until: Optional[float]) -> Tuple[int, int]:
+        """Get the [lo, hi) entry range of a query in the level's column (call with lock held)"""
+        start, end = self._start, len(self._seqs)
+        lo_seq = None if since is None else self._seq_at(bisect_left(self._times, since, start, end))
+        hi_seq = None if until is None else self._seq_at(bisect_left(self._times, until, start, end))
+        if level is None:
+            column, lo, hi = self._seqs, start, end
+        else:
+            level_seqs = self._level_seqs.get(level)
+            if level_seqs is None:
+                return 0, 0
+            column, lo, hi = level_seqs, self._level_start[level], len(level_seqs)
+        if lo_seq is not None:
+            lo = bisect_left(column, lo_seq, lo, hi)
+        if hi_seq is not None:
+            hi = bisect_left(column, hi_seq, lo, hi)
+        return lo, max(lo, hi)
+
+    def _seq_at(self, position: int) -> int:
+        """Sequence number at a column position, or past the end (call with lock held)"""
+        if position < len(self._seqs):
+            return self._seqs[position]
+        return self._seqs[-1] + 1 if self._seqs else 0
+
+    @staticmethod
+    def _trim(start: int, seq: int, *columns: array) -> int:
+        """Advance a live-entry offset past sequence numbers below ``seq``
+
+        Compacts the columns in place once most of them are dead.
+
+        Returns:
+            New offset
+        """
+        seqs = columns[0]
+        if start >= len(seqs) or seqs[start] >= seq:
+            return start
+        start = bisect_left(seqs, seq, start)
+        if start > len(seqs) // 2:
+            for column in columns:
+                del column[:start]
+            start = 0
+        return start
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
@@ -0,0 +1,138 @@
+import threading
+from array import array
+from typing import Iterable, Tuple
+
+
+class RowIndex:
+    """Thread-safe Fenwick tree of wrapped row counts keyed by sequence number
+
+    Entry ``i`` holds the screen rows of line ``base_seq + i``. Prefix sums,
+    appends and "which line holds row r" lookups are O(log n). Dropped lines
+    need no update: queries take differences of prefix sums starting at the
+    oldest live line, and the arrays are rebuilt from that line once most
+    of them are dead.
+    """
+
+    MIN_COMPACT = 1024  # Never compact for fewer dead entries than this
+
+    def __init__(self, base_seq: int = 0, heights: Iterable[int] = ()) -> None:
+        """Initialize index, bulk-loading any initial row counts in O(n)
+
+        Args:
+            base_seq: Sequence number of the first line
+            heights: Row counts of lines from base_seq on, oldest first
+        """
+        self.lock: threading.RLock = threading.RLock()
+        self._reset(base_seq, heights)
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number the next added line must have"""
+        return self.base_seq + len(self._heights)
+
+    def extend(self, heights: Iterable[int]) -> None:
+        """Append row counts of the next lines in sequence order (thread-safe)"""
+        with self.lock:
+            tree = self._tree
+            for height in heights:
+                self._heights.append(height)
+                i = len(self._heights)
+                # Node i covers (i - lowbit(i), i]; everything before i is already in the tree
+                low = i - (i & -i)
+                tree.append(height + self._prefix(i - 1) - self._prefix(low))
+
+    def set_last(self, height: int) -> None:
+        """Change the row count of the newest line (thread-safe)"""
+        with self.lock:
+            if self._heights:
+                # No tree node past the last one, so only its own node covers it
+                self._tree[-1] += height - self._heights[-1]
+                self._heights[-1] = height
+
+    def assign(self, start_seq: int, heights: Iterable[int]) -> None:
+        """Overwrite row counts of lines from ``start_seq`` on, O(log n) each (thread-safe)
+
+        Lines outside the index are ignored.
+        """
+        with self.lock:
+            tree = self._tree
+            count = len(self._heights)
+            for i, height in enumerate(heights, start_seq - self.base_seq):
+                if i >= count:
+                    break
+                if i < 0:
+                    continue
+                delta = height - self._heights[i]
+                if not delta:
+                    continue
+                self._heights[i] = height
+                node = i + 1
+                while node <= count:
+                    tree[node] += delta
+                    node += node & -node
+
+    def rows_before(self, seq: int) -> int:
+        """Get total rows of lines from base_seq up to, not including, ``seq`` (thread-safe)"""
+        with self.lock:
+            return self._prefix(max(0, min(seq - self.base_seq, len(self._heights))))
+
+    def rows_between(self, start_seq: int, end_seq: int) -> int:
+        """Get total rows of lines [start_seq, end_seq) (thread-safe)"""
+        with self.lock:
+            return max(0, self.rows_before(end_seq) - self.rows_before(start_seq))
+
+    def find(self, start_seq: int, row: int) -> Tuple[int, int]:
+        """Find the line holding a row, counting rows from ``start_seq`` (thread-safe)
+
+        Args:
+            start_seq: Line whose first row is row 0
+            row: Row to look up
+
+        Returns:
+            (seq, row within that line); seq is next_seq if the row is past the end
+        """
+        with self.lock:
+            remaining = self.rows_before(start_seq) + max(0, row)
+            tree = self._tree
+            count = len(self._heights)
+            position = 0
+            step = 1 << count.bit_length() if count else 0
+            while step:
+                probe = position + step
+                if probe <= count and tree[probe] <= remaining:
+                    position = probe
+                    remaining -= tree[probe]
+                step >>= 1
+            return self.base_seq + position, remaining
+
+    def discard_before(self, seq: int) -> None:
+        """Allow entries of lines below ``seq`` to be freed (thread-safe)"""
+        with self.lock:
+            dead = seq - self.base_seq
+            if dead > self.MIN_COMPACT and dead > len(self._heights) // 2:
+                self._reset(seq, self._heights[dead:])
+
+    def _prefix(self, count: int) -> int:
+        """Sum of the first ``count`` heights (call with lock held)"""
+        tree = self._tree
+        total = 0
+        while count > 0:
+            total += tree[count]
+            count &= count - 1
+        return total
+
+    def _reset(self, base_seq: int, heights: Iterable[int]) -> None:
+        """Rebuild from ``heights`` starting at ``base_seq`` in O(n) (call with lock held)"""
+        self.base_seq: int = base_seq
+        self._heights: array = array("I", heights)
+        tree = array("Q", [0, *self._heights])
+        size = len(self._heights)
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree: array = tree  # 1-based; tree[0] unused
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
@@ -0,0 +1,373 @@
+import abc
+import lzma
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import weakref
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Record header shared by the tiers: message bytes, style bytes
+_RECORD = struct.Struct("<IH")
+
+
+def _pack_record(message: str, style: str) -> bytes:
+    """Encode one line as a length-prefixed UTF-8 record"""
+    payload = str(message).encode("utf-8")
+    style_bytes = str(style).encode("utf-8")
+    return _RECORD.pack(len(payload), len(style_bytes)) + payload + style_bytes
+
+
+def _unpack_records(data: bytes) -> List[Tuple[str, str]]:
+    """Decode a run of records back into (message, style) lines"""
+    lines = []
+    offset = 0
+    end = len(data)
+    header = _RECORD.size
+    while offset < end:
+        msg_len, style_len = _RECORD.unpack_from(data, offset)
+        body = offset + header
+        lines.append((
+            data[body:body + msg_len].decode("utf-8"),
+            data[body + msg_len:body + msg_len + style_len].decode("utf-8"),
+        ))
+        offset = body + msg_len + style_len
+    return lines
+
+
+def _zlib_compress(data: bytes, level: Optional[int]) -> bytes:
+    """Compress with zlib at ``level`` (None = default)"""
+    return zlib.compress(data) if level is None else zlib.compress(data, level)
+
+
+def _lzma_compress(data: bytes, level: Optional[int]) -> bytes:
+    """Compress with lzma at preset ``level`` (None = default)"""
+    return lzma.compress(data) if level is None else lzma.compress(data, preset=level)
+
+
+class ScrollbackTier(abc.ABC):
+    """Base class for storage that holds lines evicted from a CircularBuffer
+
+    Lines are appended oldest first and addressed by position, where 0 is
+    the oldest line in the tier. The owning buffer places the tier's lines
+    in front of its in-memory ring, so they stay reachable for scrolling,
+    search and export.
+    """
+
+    def __init__(self) -> None:
+        self.lock: threading.RLock = threading.RLock()
+
+    def append(self, message: str, style: str) -> None:
+        """Add one evicted line (thread-safe)"""
+        self.extend([(message, style)])
+
+    @abc.abstractmethod
+    def extend(self, items: List[Tuple[str, str]]) -> None:
+        """Add evicted lines, oldest first (thread-safe)"""
+
+    @abc.abstractmethod
+    def get_range(self, start: int, end: int) -> List[Tuple[str, str]]:
+        """Get lines at positions [start, end) (thread-safe)"""
+
+    def iter_range(self, start: int, end: int, chunk: int = 4096) -> Iterator[Tuple[str, str]]:
+        """Iterate lines at positions [start, end) in chunks (call with the buffer lock held)"""
+        for chunk_start in range(start, end, chunk):
+            yield from self.get_range(chunk_start, min(end, chunk_start + chunk))
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Drop all lines (thread-safe)"""
+
+    def close(self) -> None:
+        """Release files or other resources (thread-safe)"""
+
+    def get_memory_usage(self) -> int:
+        """Get bytes of RAM used by the tier (thread-safe)"""
+        return 0
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Get number of lines held"""
+
+
+def _remove_files(*paths: str) -> None:
+    """Best-effort removal of spill files"""
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class SpillTier(ScrollbackTier):
+    """Thread-safe disk tier read through memory-mapped files
+
+    Evicted lines are appended to a segment file as length-prefixed UTF-8
+    records, and each record's offset goes to a fixed-width index file.
+    Reads map both files, so RAM use stays constant however long the
+    scrollback grows. The files are deleted on close() or when the tier
+    is garbage collected.
+
+    Usage:
+        pane = Pane("logs", max_lines=5000, history=SpillTier())
+    """
+
+    RECORD = _RECORD
+    OFFSET = struct.Struct("<Q")   # Record offset in the segment file
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        """Initialize spill tier
+
+        Args:
+            directory: Where to create the segment files (default: system temp dir)
+        """
+        super().__init__()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix="consolemod-", suffix=".seg", dir=directory)
+        self._data = os.fdopen(fd, "w+b")
+        fd, self.index_path = tempfile.mkstemp(prefix="consolemod-", suffix=".idx", dir=directory)
+        self._index = os.fdopen(fd, "w+b")
+        self._finalizer = weakref.finalize(self, _remove_files, self.path, self.index_path)
+        self._count: int = 0
+        self._data_size: int = 0
+        self._data_map: Optional[mmap.mmap] = None
+        self._index_map: Optional[mmap.mmap] = None
+        self._mapped_count: int = 0  # Lines covered by the current maps
+
+    def extend(self, items: List[Tuple[str, str]]) -> None:
+        """Append evicted lines to the segment file (thread-safe)"""
+        if not items:
+            return
+        records = [_pack_record(message, style) for message, style in items]
+        with self.lock:
+            offsets = []
+            offset = self._data_size
+            for record in records:
+                offsets.append(self.OFFSET.pack(offset))
+                offset += len(record)
+            self._data.write(b"".join(records))
+            self._index.write(b"".join(offsets))
+            self._data_size = offset
+            self._count += len(items)
+
+    def get_range(self, start: int, end: int) -> List[Tuple[str, str]]:
+        """Read lines at positions [start, end) from the mapped files (thread-safe)"""
+        with self.lock:
+            start, end = max(0, start), min(end, self._count)
+            if end <= start:
+                return []
+            data, index = self._data_map, self._index_map
+            if data is None or index is None or end > self._mapped_count:
+                data, index = self._remap()
+            header = self.RECORD
+            read_offset = self.OFFSET.unpack_from
+            lines = []
+            for position in range(start, end):
+                offset = read_offset(index, position * self.OFFSET.size)[0]
+                msg_len, style_len = header.unpack_from(data, offset)
+                body = offset + header.size
+                lines.append((
+                    data[body:body + msg_len].decode("utf-8"),
+                    data[body + msg_len:body + msg_len + style_len].decode("utf-8"),
+                ))
+            return lines
+
+    def clear(self) -> None:
+        """Truncate the segment files (thread-safe)"""
+        with self.lock:
+            self._unmap()
+            for f in (self._data, self._index):
+                f.seek(0)
+                f.truncate()
+            self._count = 0
+            self._data_size = 0
+
+    def close(self) -> None:
+        """Close and delete the segment files (thread-safe)"""
+        with self.lock:
+            self._unmap()
+            self._data.close()
+            self._index.close()
+            self._count = 0
+            self._finalizer()
+
+    def get_disk_usage(self) -> int:
+        """Get bytes written to the segment and index files (thread-safe)"""
+        with self.lock:
+            return self._data_size + self._count * self.OFFSET.size
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self._count
+
+    def _remap(self) -> Tuple[mmap.mmap, mmap.mmap]:
+        """Map the files as they are now (call with lock held)
+
+        Returns:
+            (data map, index map)
+        """
+        self._unmap()
+        self._data.flush()
+        self._index.flush()
+        data = self._data_map = mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ)
+        index = self._index_map = mmap.mmap(self._index.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped_count = self._count
+        return data, index
+
+    def _unmap(self) -> None:
+        """Close current maps (call with lock held)"""
+        for mapped in (self._data_map, self._index_map):
+            if mapped is not None:
+                mapped.close()
+        self._data_map = None
+        self._index_map = None
+        self._mapped_count = 0
+
+
+class CompressedTier(ScrollbackTier):
+    """Thread-safe in-memory tier keeping old lines in compressed blocks
+
+    Evicted lines collect in an open block of ``block_lines`` lines. Full
+    blocks are sealed and compressed with zlib or lzma, and are
+    decompressed on demand when scrolling back, searching or exporting.
+    A small LRU keeps the most recently read blocks decoded. Log text
+    typically compresses several times over, so far more history fits in
+    the same memory.
+
+    Usage:
+        pane = Pane("logs", max_lines=5000, history=CompressedTier())
+    """
+
+    # Codec name -> (compress(data, level), decompress(data))
+    CODECS: Dict[str, Tuple[Callable[[bytes, Optional[int]], bytes], Callable[[bytes], bytes]]] = {
+        "zlib": (_zlib_compress, zlib.decompress),
+        "lzma": (_lzma_compress, lzma.decompress),
+    }
+
+    def __init__(
+        self,
+        block_lines: int = 1024,
+        codec: str = "zlib",
+        level: Optional[int] = None,
+        cache_blocks: int = 8
+    ) -> None:
+        """Initialize compressed tier
+
+        Args:
+            block_lines: Lines per sealed block
+            codec: "zlib" or "lzma"
+            level: Compression level (zlib 0-9, lzma preset 0-9; None = codec default)
+            cache_blocks: Decoded blocks kept in the LRU cache
+
+        Raises:
+            ValueError: If the codec is unknown or block_lines is not positive
+        """
+        super().__init__()
+        if codec not in self.CODECS:
+            raise ValueError(f"Unknown compression codec: {codec!r}")
+        if block_lines <= 0:
+            raise ValueError("block_lines must be positive")
+        self.block_lines: int = block_lines
+        self.codec: str = codec
+        self.level: Optional[int] = level
+        self.cache_blocks: int = cache_blocks
+        self._blocks: List[bytes] = []          # Sealed, compressed blocks
+        self._open: List[bytes] = []            # Encoded records of the open block
+        self._open_bytes: int = 0
+        self._compressed_bytes: int = 0
+        self._raw_bytes: int = 0                # Uncompressed size of sealed blocks
+        self._cache: "OrderedDict[int, List[Tuple[str, str]]]" = OrderedDict()
+        self._cache_bytes: Dict[int, int] = {}
+
+    def extend(self, items: List[Tuple[str, str]]) -> None:
+        """Add evicted lines, sealing blocks as they fill (thread-safe)"""
+        with self.lock:
+            for message, style in items:
+                record = _pack_record(message, style)
+                self._open.append(record)
+                self._open_bytes += len(record)
+                if len(self._open) >= self.block_lines:
+                    self._seal()
+
+    def get_range(self, start: int, end: int) -> List[Tuple[str, str]]:
+        """Get lines at positions [start, end), decompressing blocks as needed (thread-safe)"""
+        with self.lock:
+            start, end = max(0, start), min(end, self._len())
+            lines: List[Tuple[str, str]] = []
+            position = start
+            while position < end:
+                block, offset = divmod(position, self.block_lines)
+                take = min(end - position, self.block_lines - offset)
+                lines.extend(self._block_lines(block)[offset:offset + take])
+                position += take
+            return lines
+
+    def clear(self) -> None:
+        """Drop all blocks (thread-safe)"""
+        with self.lock:
+            self._blocks.clear()
+            self._open.clear()
+            self._open_bytes = 0
+            self._compressed_bytes = 0
+            self._raw_bytes = 0
+            self._cache.clear()
+            self._cache_bytes.clear()
+
+    def get_memory_usage(self) -> int:
+        """Get approximate bytes held: compressed blocks, the open block and cached blocks (thread-safe)"""
+        with self.lock:
+            return self._compressed_bytes + self._open_bytes + sum(self._cache_bytes.values())
+
+    def get_compression_ratio(self) -> float:
+        """Get uncompressed / compressed size of sealed blocks (thread-safe)
+
+        Returns:
+            Ratio, or 0.0 if no block has been sealed yet
+        """
+        with self.lock:
+            if not self._compressed_bytes:
+                return 0.0
+            return self._raw_bytes / self._compressed_bytes
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self._len()
+
+    def _len(self) -> int:
+        return len(self._blocks) * self.block_lines + len(self._open)
+
+    def _seal(self) -> None:
+        """Compress the open block (call with lock held)"""
+        raw = b"".join(self._open)
+        data = self.CODECS[self.codec][0](raw, self.level)
+        self._blocks.append(data)
+        self._compressed_bytes += len(data)
+        self._raw_bytes += len(raw)
+        self._open = []
+        self._open_bytes = 0
+
+    def _block_lines(self, block: int) -> List[Tuple[str, str]]:
+        """Get a block's lines through the LRU cache (call with lock held)"""
+        if block == len(self._blocks):
+            return _unpack_records(b"".join(self._open))
+        cached = self._cache.get(block)
+        if cached is not None:
+            self._cache.move_to_end(block)
+            return cached
+        raw = self.CODECS[self.codec][1](self._blocks[block])
+        lines = _unpack_records(raw)
+        if self.cache_blocks > 0:
+            self._cache[block] = lines
+            self._cache_bytes[block] = len(raw)
+            while len(self._cache) > self.cache_blocks:
+                evicted, _ = self._cache.popitem(last=False)
+                self._cache_bytes.pop(evicted, None)
+        return lines
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
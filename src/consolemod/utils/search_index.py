@@ -0,0 +1,178 @@
+import threading
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+
+class TrigramIndex:
+    """Thread-safe incremental trigram index over buffer lines
+
+    Each line is indexed under the lowercase 3-character substrings it
+    contains, keyed by the line's sequence number. Posting lists are
+    ``array('Q')`` in ascending order, so lines are added by appending and
+    lines dropped from the front of a buffer are trimmed from the front of
+    each list in occasional batches.
+
+    A query only needs the lines present in every posting list for its
+    trigrams; callers verify those candidates with a real substring check.
+    Queries shorter than three characters cannot use the index.
+    """
+
+    GRAM = 3
+    MIN_PURGE_POSTINGS = 65536  # Never purge for fewer dead postings than this
+
+    def __init__(self) -> None:
+        """Initialize empty index"""
+        self.lock: threading.RLock = threading.RLock()
+        self._postings: Dict[str, array] = {}
+        self._line_grams: Deque[int] = deque()  # Trigram count per live line, oldest first
+        self._first_seq: int = 0                 # Sequence of the oldest live line
+        self._next_seq: int = 0
+        self._total_postings: int = 0
+        self._live_postings: int = 0
+
+    @classmethod
+    def grams(cls, text: str) -> set:
+        """Get the distinct trigrams of lowercased text"""
+        text = text.lower()
+        return {text[i:i + cls.GRAM] for i in range(len(text) - cls.GRAM + 1)}
+
+    def add(self, seq: int, text: str) -> None:
+        """Index one line (thread-safe)
+
+        Args:
+            seq: Line sequence number, one higher than the previous line's
+            text: Line text
+        """
+        self.add_many(seq, [text])
+
+    def add_many(self, first_seq: int, texts: Iterable[str]) -> None:
+        """Index consecutive lines starting at ``first_seq`` (thread-safe)"""
+        with self.lock:
+            postings = self._postings
+            seq = first_seq
+            if not self._line_grams:
+                self._first_seq = first_seq
+            for text in texts:
+                grams = self.grams(str(text))
+                for gram in grams:
+                    posting = postings.get(gram)
+                    if posting is None:
+                        posting = postings[gram] = array("Q")
+                    posting.append(seq)
+                self._line_grams.append(len(grams))
+                self._total_postings += len(grams)
+                self._live_postings += len(grams)
+                seq += 1
+            self._next_seq = seq
+
+    def update_last(self, seq: int, text: str) -> None:
+        """Add trigrams of the newest line's new text (thread-safe)
+
+        Trigrams of the old text are kept; candidates are verified by the
+        caller, so stale postings only cost a wasted check.
+
+        Args:
+            seq: Sequence number of the newest indexed line
+            text: Its new text
+        """
+        with self.lock:
+            if seq != self._next_seq - 1 or not self._line_grams:
+                return
+            added = 0
+            for gram in self.grams(str(text)):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array("Q")
+                if not posting or posting[-1] != seq:
+                    posting.append(seq)
+                    added += 1
+            self._line_grams[-1] += added
+            self._total_postings += added
+            self._live_postings += added
+
+    def discard_before(self, seq: int) -> None:
+        """Forget lines with sequence numbers below ``seq`` (thread-safe)"""
+        with self.lock:
+            line_grams = self._line_grams
+            while self._first_seq < seq and line_grams:
+                self._live_postings -= line_grams.popleft()
+                self._first_seq += 1
+            self._first_seq = max(self._first_seq, seq)
+            dead = self._total_postings - self._live_postings
+            if dead > self._live_postings and dead > self.MIN_PURGE_POSTINGS:
+                self._purge()
+
+    def candidates(self, query: str) -> Optional[List[int]]:
+        """Get sequence numbers of lines that may contain ``query`` (thread-safe)
+
+        Args:
+            query: Search text (matching is checked case-insensitively)
+
+        Returns:
+            Ascending sequence numbers, or None if the query is too short
+            to use the index
+        """
+        grams = self.grams(query)
+        if not grams:
+            return None
+        with self.lock:
+            lists = []
+            for gram in grams:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    return []
+                lists.append(posting)
+            lists.sort(key=len)
+            first_seq = self._first_seq
+            live = len(self._line_grams)
+            smallest = lists[0]
+            result = list(smallest[bisect_left(smallest, first_seq):])
+            for other in lists[1:]:
+                if not result:
+                    break
+                start = bisect_left(other, first_seq)
+                if len(other) - start >= live:
+                    continue  # Holds every live line, so it filters nothing
+                narrowed = []
+                lo = start
+                end = len(other)
+                for seq in result:
+                    lo = bisect_left(other, seq, lo, end)
+                    if lo == end:
+                        break
+                    if other[lo] == seq:
+                        narrowed.append(seq)
+                result = narrowed
+            return result
+
+    def clear(self) -> None:
+        """Drop all postings (thread-safe)"""
+        with self.lock:
+            self._postings.clear()
+            self._line_grams.clear()
+            self._first_seq = self._next_seq
+            self._total_postings = 0
+            self._live_postings = 0
+
+    def get_memory_usage(self) -> int:
+        """Get approximate bytes used by posting lists (thread-safe)"""
+        with self.lock:
+            return self._total_postings * 8 + len(self._postings) * 120
+
+    def _purge(self) -> None:
+        """Trim postings of discarded lines from every list (call with lock held)"""
+        first_seq = self._first_seq
+        for gram in list(self._postings):
+            posting = self._postings[gram]
+            cut = bisect_left(posting, first_seq)
+            if cut == len(posting):
+                del self._postings[gram]
+            elif cut:
+                del posting[:cut]
+        self._total_postings = self._live_postings
+
+
+if __name__ == '__main__':
+    raise ImportError("This module is for import only and cannot be executed directly.")
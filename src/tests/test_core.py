@@ -1,10 +1,15 @@
 """Comprehensive tests for core module."""
 
 import asyncio
+import threading
+import time
 import pytest
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import Mock, patch, AsyncMock, mock_open
 
-from consolemod.core import TerminalSplitter, Pane, LayoutMode
+from consolemod.core import TerminalSplitter, Pane, PaneView, IngestPolicy, LayoutMode
+from consolemod.core.dispatch import DISPATCHER
+from consolemod.monitoring import MemoryMonitor, PerformanceMonitor
+from consolemod.utils import CircularBuffer, CompressedTier, SpillTier
 
 
 class TestPane:
@@ -67,6 +72,514 @@ class TestPane:
         assert len(content) <= 10
 
 
+class TestWriteListeners:
+    """Tests for batched write listeners."""
+
+    def test_batches_with_sequence_ranges(self):
+        """Test listeners get committed batches with contiguous sequences."""
+        pane = Pane("test", max_lines=5)
+        batches = []
+        pane.add_write_listener(lambda lines, start, end: batches.append((lines, start, end)))
+
+        pane.write_many([(f"line {i}", "white") for i in range(8)])
+        pane.write("last")
+        assert pane.flush_listeners(timeout=2)
+
+        lines = [m for batch, _, _ in batches for m, _ in batch]
+        assert lines == [f"line {i}" for i in range(8)] + ["last"]
+        assert batches[0][1] == 0
+        for (_, _, end), (_, start, _) in zip(batches, batches[1:]):
+            assert start == end
+        assert batches[-1][2] == 9
+
+    def test_slow_listener_does_not_block_writers(self):
+        """Test writers keep going while a listener is busy."""
+        pane = Pane("test", max_lines=10_000)
+        release = threading.Event()
+        received = []
+
+        def slow(lines, start, end):
+            release.wait(2)
+            received.extend(lines)
+
+        pane.add_write_listener(slow)
+        start = time.perf_counter()
+        for i in range(1000):
+            pane.write(f"line {i}")
+        assert time.perf_counter() - start < 1
+        release.set()
+        assert pane.flush_listeners(timeout=5)
+        assert len(received) == 1000
+
+    @pytest.mark.asyncio
+    async def test_async_listener(self):
+        """Test coroutine listeners run on their event loop."""
+        pane = Pane("test")
+        got = asyncio.Queue()
+
+        async def listener(lines, start, end):
+            await got.put((lines, start, end))
+
+        pane.add_write_listener(listener)
+        await pane.awrite("hello", "green")
+        lines, start, end = await asyncio.wait_for(got.get(), 2)
+        assert lines == [("hello", "green")]
+        assert (start, end) == (0, 1)
+
+    def test_async_listener_needs_loop(self):
+        """Test adding a coroutine listener outside a loop is rejected."""
+        async def listener(lines, start, end):
+            pass
+
+        with pytest.raises(ValueError):
+            Pane("test").add_write_listener(listener)
+
+    def test_write_callback_outside_lock(self):
+        """Test the per-line callback runs without the pane lock held."""
+        pane = Pane("test")
+        seen = []
+
+        def callback(message, style):
+            acquired = pane.lock.acquire(blocking=False)
+            seen.append((message, acquired))
+            if acquired:
+                pane.lock.release()
+
+        pane.set_write_callback(callback)
+        pane.write("a")
+        pane.write("b")
+        pane.flush_listeners(timeout=2)
+        assert seen == [("a", True), ("b", True)]
+
+    def test_listener_errors_counted(self):
+        """Test a failing listener is counted and does not stop delivery."""
+        pane = Pane("test")
+        received = []
+
+        def failing(lines, start, end):
+            raise ValueError("boom")
+
+        pane.add_write_listener(failing)
+        pane.add_write_listener(lambda lines, start, end: received.extend(lines))
+        before = DISPATCHER.errors
+        pane.write("a")
+        pane.flush_listeners(timeout=2)
+        pane.write("b")
+        pane.flush_listeners(timeout=2)
+        assert received == [("a", "white"), ("b", "white")]
+        assert DISPATCHER.errors == before + 2
+        assert isinstance(DISPATCHER.last_error, ValueError)
+
+    @pytest.mark.asyncio
+    async def test_async_listener_errors_counted(self):
+        """Test exceptions raised inside coroutine listeners are counted."""
+        pane = Pane("test")
+        done = asyncio.Event()
+
+        async def failing(lines, start, end):
+            done.set()
+            raise KeyError("boom")
+
+        pane.add_write_listener(failing)
+        before = DISPATCHER.errors
+        await pane.awrite("a")
+        await asyncio.wait_for(done.wait(), 2)
+        await asyncio.sleep(0.01)
+        assert DISPATCHER.errors == before + 1
+
+
+class TestSequenceNumbers:
+    """Tests for stable pane line sequence numbers."""
+
+    def test_lines_since_with_staged_writes(self):
+        """Test staged lines are committed before incremental reads."""
+        pane = Pane("test", max_lines=3)
+        for i in range(5):
+            pane.write(f"line {i}")
+        assert [seq for seq, _, _ in pane.get_lines_since(0)] == [2, 3, 4]
+        assert pane.get_line_by_seq(4) == ("line 4", "white")
+        assert pane.get_next_seq() == 5
+
+        pane.write("line 5")
+        assert pane.get_lines_since(5) == [(5, "line 5", "white")]
+
+    def test_search_by_seq_matches_listener_range(self):
+        """Test search sequence numbers use the listener numbering."""
+        pane = Pane("test", max_lines=2)
+        ranges = []
+        pane.add_write_listener(lambda lines, start, end: ranges.append((start, end)))
+        pane.write_many([("a", "white"), ("b", "white"), ("c", "white")])
+        assert pane.flush_listeners(timeout=2)
+        assert ranges == [(0, 3)]
+        assert pane.search("c", by_seq=True) == [(2, "c", "white")]
+        assert pane.filter_content(lambda m, s: m == "b", by_seq=True) == [(1, "b", "white")]
+
+
+class TestPaneViews:
+    """Tests for incrementally maintained filtered views."""
+
+    @staticmethod
+    def _is_error(message, style):
+        return message.startswith("ERROR")
+
+    def test_view_tracks_source(self):
+        """Test views include existing and new matches."""
+        logs = Pane("logs", max_lines=100)
+        logs.write("ERROR boot")
+        logs.write("info ready")
+        view = logs.add_view("errors", self._is_error)
+        logs.write("ERROR disk")
+
+        assert isinstance(view, PaneView)
+        assert view.id == "logs:errors"
+        assert logs.get_view("errors") is view
+        assert view.get_content_snapshot() == [("ERROR boot", "white"), ("ERROR disk", "white")]
+        assert view.search("disk", by_seq=True) == [(2, "ERROR disk", "white")]
+
+    def test_predicate_runs_once_per_line(self):
+        """Test repeated reads do not re-evaluate old lines."""
+        logs = Pane("logs", max_lines=1000)
+        calls = []
+
+        def predicate(message, style):
+            calls.append(message)
+            return "7" in message
+
+        view = logs.add_view("sevens", predicate)
+        logs.write_many([(f"line {i}", "white") for i in range(100)])
+        for _ in range(50):
+            view.has_changes()
+            view.get_visible_content(10)
+        assert len(calls) == 100
+        assert len(view.get_content_snapshot()) == 19
+
+    def test_view_follows_eviction(self):
+        """Test lines evicted from the source leave the view."""
+        logs = Pane("logs", max_lines=10)
+        view = logs.add_view("errors", self._is_error)
+        for i in range(30):
+            logs.write(f"ERROR {i}" if i % 3 == 0 else f"info {i}")
+        assert [m for m, _ in view.get_content_snapshot()] == ["ERROR 21", "ERROR 24", "ERROR 27"]
+
+        logs.clear()
+        assert view.get_content_snapshot() == []
+
+    def test_view_scrolls_independently(self):
+        """Test views keep their own scroll position."""
+        logs = Pane("logs", max_lines=100)
+        view = logs.add_view("all", lambda m, s: True)
+        logs.write_many([(f"line {i}", "white") for i in range(20)])
+        view.scroll(1, 5)
+        assert view.get_visible_content(2) == [("line 13", "white"), ("line 14", "white")]
+        assert logs.scrollback == 0
+
+    def test_view_is_read_only(self):
+        """Test writing to a view is rejected."""
+        view = Pane("logs").add_view("errors", self._is_error)
+        with pytest.raises(RuntimeError):
+            view.write("ERROR")
+        with pytest.raises(RuntimeError):
+            asyncio.run(view.awrite("ERROR"))
+        with pytest.raises(RuntimeError):
+            asyncio.run(view.awrite_many([("ERROR", "red")]))
+        view.enable_log_index()
+        with pytest.raises(RuntimeError):
+            view.write_record("ERROR", "red", 3, time.time())
+        assert len(view.get_content_snapshot()) == 0
+
+    def test_view_buffer_reads(self):
+        """Test the view buffer answers CircularBuffer reads from its matches."""
+        logs = Pane("logs", max_lines=100)
+        view = logs.add_view("errors", self._is_error)
+        for i in range(10):
+            logs.write(f"ERROR {i}" if i % 2 else f"info {i}")
+        assert isinstance(view.buffer, CircularBuffer)
+        assert view.buffer.get_first_seq() == 1
+        assert view.buffer.get_last(2) == [("ERROR 7", "white"), ("ERROR 9", "white")]
+        assert view.buffer[-1] == ("ERROR 9", "white")
+        assert view.buffer[1:3] == [("ERROR 3", "white"), ("ERROR 5", "white")]
+
+    def test_remove_view_detaches(self):
+        """Test removed views stop receiving change notifications."""
+        logs = Pane("logs")
+        view = logs.add_view("errors", self._is_error)
+        wakeups = []
+        view.add_change_listener(lambda: wakeups.append(1))
+        logs.write("ERROR a")
+        logs.remove_view("errors")
+        logs.write("ERROR b")
+        assert wakeups == [1]
+        assert logs.get_view("errors") is None
+
+
+class TestWrapAwareScrolling:
+    """Tests for scrolling by wrapped screen rows."""
+
+    def _pane(self):
+        pane = Pane("logs", max_lines=100)
+        rows = ["", " bbbb cccc", " bbbb cccc dddd eeee"]  # 1, 2 or 3 rows at width 10
+        for i in range(10):
+            pane.write(f"l{i}" + rows[i % 3])
+        pane.set_viewport(10, 4)
+        return pane
+
+    def test_logical_lines_until_width_known(self):
+        """Test scrolling counts lines while no width is set."""
+        pane = Pane("logs")
+        pane.write("x " * 100)
+        assert pane.get_total_rows() == 1
+        assert pane.get_visible_window(5) == ([("x " * 100, "white")], 0)
+
+    def test_visible_window_counts_rows(self):
+        """Test the window covers exactly the requested rows."""
+        pane = self._pane()
+        assert pane.get_total_rows() == 19
+        lines, skip = pane.get_visible_window(4)
+        assert [m.split()[0] for m, _ in lines] == ["l8", "l9"]
+        assert skip == 0
+
+        pane.scroll(1, 1)
+        lines, skip = pane.get_visible_window(4)
+        assert [m.split()[0] for m, _ in lines] == ["l7", "l8"]
+        assert skip == 1
+
+    def test_scroll_clamps_to_rows(self):
+        """Test scrolling stops at the first row."""
+        pane = self._pane()
+        pane.scroll(1, 1000)
+        assert pane.scrollback == 19
+
+    def test_scroll_to_fraction(self):
+        """Test jumping to a relative position in rows."""
+        pane = self._pane()
+        pane.scroll_to_fraction(0.0)
+        assert pane.scrollback == 15
+        lines, skip = pane.get_visible_window(4)
+        assert lines[0][0] == "l0" and skip == 0
+        assert pane.get_scroll_fraction() == 0.0
+
+        pane.scroll_to_fraction(1.0)
+        assert pane.scrollback == 0
+        assert pane.get_scroll_fraction() == 1.0
+
+    def test_resize_remeasures(self):
+        """Test a width change recomputes row counts."""
+        pane = self._pane()
+        pane.set_viewport(200, 4)
+        assert pane.get_total_rows() == 10
+
+    def test_eviction_and_new_lines(self):
+        """Test cached rows follow evictions and appends."""
+        pane = Pane("logs", max_lines=3)
+        pane.set_viewport(10, 4)
+        for _ in range(5):
+            pane.write("abcd abcd abcd")  # 2 rows each
+        assert pane.get_total_rows() == 6
+        pane.clear()
+        assert pane.get_total_rows() == 0
+
+    def test_history_tier_measured_lazily(self):
+        """Test history lines count one row each until scrolling reaches them."""
+        pane = Pane("logs", max_lines=4, history=CompressedTier(block_lines=4))
+        for i in range(20):
+            pane.write(f"l{i} abcd abcd")  # 2 rows each at width 10
+        pane.set_viewport(10, 4)
+        assert pane.get_total_rows() == 16 + 8
+        assert len(pane.buffer) == 20
+        assert not pane._measured_chunks
+
+        pane.scroll_to_fraction(0.0)
+        lines, skip = pane.get_visible_window(4)
+        assert [m.split()[0] for m, _ in lines] == ["l0", "l1"] and skip == 0
+        assert pane.get_total_rows() == 40
+
+        pane.scroll(-1, 4)
+        lines, _ = pane.get_visible_window(4)
+        assert [m.split()[0] for m, _ in lines] == ["l2", "l3"]
+
+    def test_spilled_lines_scrollable_after_render(self):
+        """Test rendering a pane with a spill tier keeps its history in the scroll range."""
+        pane = Pane("logs", max_lines=20, history=SpillTier())
+        splitter = TerminalSplitter(enable_input=False)
+        splitter.add_pane(pane)
+        for i in range(200):
+            pane.write(f"line {i}")
+        splitter.render_frame()
+        assert len(pane.buffer) == 200
+        assert pane.get_total_rows() == 200
+
+        pane.scroll_to_fraction(0.0)
+        lines, _ = pane.get_visible_window(pane.viewport_rows)
+        assert lines[0][0] == "line 0"
+
+
+class TestRepeatCollapsing:
+    """Tests for merging repeated pane lines."""
+
+    def test_flood_takes_one_line(self):
+        """Test a flood of identical lines keeps history and counts repeats."""
+        pane = Pane("logs", max_lines=3)
+        pane.write("useful")
+        pane.enable_collapse()
+        for _ in range(5000):
+            pane.write("spam")
+        pane.write("after")
+        lines = [m for m, _ in pane.get_content_snapshot()]
+        assert lines[0] == "useful"
+        assert lines[1].startswith("spam (x5000, ")
+        assert lines[2] == "after"
+        assert pane.collapser.collapsed == 4999
+
+    def test_run_across_commits_keeps_seq(self):
+        """Test repeats after a commit rewrite the committed line in place."""
+        pane = Pane("logs")
+        pane.enable_collapse()
+        pane.write("spam")
+        assert pane.get_next_seq() == 1
+        pane.write("spam")
+        pane.write("spam")
+        assert pane.get_next_seq() == 1
+        assert pane.get_line_by_seq(0)[0].startswith("spam (x3, ")
+        assert pane.collapser.get_run()[1] == 3
+
+    def test_rows_follow_rewritten_line(self):
+        """Test the wrapped row count of a rewritten line is updated."""
+        pane = Pane("logs")
+        pane.enable_collapse()
+        pane.set_viewport(10, 4)
+        pane.write("spam")
+        assert pane.get_total_rows() == 1
+        pane.write("spam")
+        assert pane.get_total_rows() == 3  # "spam (x2," / "HH:MM:SS -" / "HH:MM:SS)"
+
+    def test_template_and_disable(self):
+        """Test template mode merges lines differing in digits until disabled."""
+        pane = Pane("logs")
+        pane.enable_collapse(template=True)
+        pane.write_many([(f"retry {i}", "red") for i in range(4)])
+        assert len(pane.get_content_snapshot()) == 1
+        pane.disable_collapse()
+        pane.write_many([(f"retry {i}", "red") for i in range(4)])
+        assert len(pane.get_content_snapshot()) == 5
+
+    def test_clear_ends_run(self):
+        """Test a cleared pane does not rewrite a line it no longer has."""
+        pane = Pane("logs")
+        pane.enable_collapse()
+        pane.write("spam")
+        pane.get_content_snapshot()
+        pane.clear()
+        pane.write("spam")
+        assert pane.get_content_snapshot() == [("spam", "white")]
+
+
+class TestIngestPolicies:
+    """Tests for per-pane backpressure."""
+
+    def _pane(self, mode, rate=1, burst=5):
+        pane = Pane("logs", max_lines=10000)
+        pane.set_ingest_policy(IngestPolicy(mode, rate=rate, burst=burst))
+        return pane
+
+    def test_drop_newest_keeps_first_lines(self):
+        """Test lines over the budget are discarded."""
+        pane = self._pane("drop_newest")
+        pane.write_many([(f"line {i}", "white") for i in range(10)])
+        for i in range(10, 20):
+            pane.write(f"line {i}")
+        assert [m for m, _ in pane.get_content_snapshot()] == [f"line {i}" for i in range(5)]
+        stats = pane.get_ingest_stats()
+        assert (stats["received"], stats["dropped"]) == (20, 15)
+
+    def test_drop_oldest_keeps_latest_lines(self):
+        """Test lines over the budget displace the oldest uncommitted lines."""
+        pane = self._pane("drop_oldest")
+        for i in range(20):
+            pane.write(f"line {i}")
+        assert [m for m, _ in pane.get_content_snapshot()] == [f"line {i}" for i in range(15, 20)]
+        pane.write("late")
+        assert pane.get_content_snapshot()[-1][0] == "line 19"  # Committed lines are never displaced
+        assert pane.get_ingest_stats()["dropped"] == 16
+
+    def test_sample_bounds_kept_lines(self):
+        """Test sampling keeps at most the budget plus one burst."""
+        pane = self._pane("sample", burst=2)
+        for i in range(1000):
+            pane.write(f"line {i}")
+        stats = pane.get_ingest_stats()
+        kept = len(pane.get_content_snapshot())
+        assert kept <= 4
+        assert stats["sampled"] == kept - 2
+        assert stats["dropped"] + kept == stats["received"] == 1000
+
+    def test_block_slows_writer(self):
+        """Test a block policy delays writers to the rate without losing lines."""
+        pane = self._pane("block", rate=100, burst=1)
+        start = time.monotonic()
+        for i in range(5):
+            pane.write(f"line {i}")
+        assert time.monotonic() - start >= 0.03
+        assert len(pane.get_content_snapshot()) == 5
+        assert pane.get_ingest_stats()["blocked"] == 4
+
+    @pytest.mark.asyncio
+    async def test_block_awaits_in_async_writes(self):
+        """Test async writers yield to the event loop while blocked."""
+        pane = self._pane("block", rate=50, burst=1)
+        ticks = []
+
+        async def ticker():
+            for _ in range(3):
+                ticks.append(len(pane.get_content_snapshot()))
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(pane.awrite_many([("a", "white")] * 3), ticker())
+        assert len(pane.get_content_snapshot()) == 3
+        assert ticks[0] == 0
+
+    @pytest.mark.asyncio
+    async def test_block_sync_writes_on_loop_do_not_sleep(self):
+        """Test sync writes from a coroutine are staged without stalling the loop."""
+        pane = self._pane("block", rate=1, burst=1)
+        start = time.monotonic()
+        pane.write("a")
+        pane.write("b")
+        pane.write_record("c", "white", 1, time.time())
+        assert time.monotonic() - start < 0.5
+        assert len(pane.get_content_snapshot()) == 3
+        stats = pane.get_ingest_stats()
+        assert stats["received"] == 3
+        assert stats["blocked"] == 2
+        assert stats["blocked_time"] == 0.0
+
+    def test_invalid_policy(self):
+        """Test unknown modes and bad rates are rejected."""
+        with pytest.raises(ValueError):
+            IngestPolicy("drop_random", rate=10)
+        with pytest.raises(ValueError):
+            IngestPolicy("block", rate=0)
+
+    def test_counters_reach_performance_monitor(self):
+        """Test policy counters are merged into the pane stats."""
+        pane = self._pane("drop_newest")
+        other = Pane("plain")
+        for _ in range(8):
+            pane.write("x")
+        monitor = PerformanceMonitor()
+        monitor.record_panes([pane, other])
+        stats = monitor.get_pane_stats("logs")
+        assert (stats["dropped"], stats["mode"], stats["writes"]) == (3, "drop_newest", 0)
+        assert monitor.get_pane_stats("plain") == {}
+
+    def test_removing_policy_accepts_everything(self):
+        """Test clearing the policy stops limiting writes."""
+        pane = self._pane("drop_newest", burst=1)
+        pane.set_ingest_policy(None)
+        pane.write_many([("x", "white")] * 10)
+        assert len(pane.get_content_snapshot()) == 10
+        assert pane.get_ingest_stats() == {}
+
+
 class TestTerminalSplitter:
     """Tests for TerminalSplitter class."""
 
@@ -154,6 +667,18 @@ class TestTerminalSplitter:
         metrics = splitter.get_memory_metrics()
         assert isinstance(metrics, dict)
 
+    def test_memory_metrics_track_writes(self):
+        """Test memory metrics follow pane writes without manual recording."""
+        splitter = TerminalSplitter(enable_metrics=True, enable_input=False)
+        pane = Pane("test")
+        splitter.add_pane(pane)
+        empty = splitter.get_memory_metrics()["total_bytes"]
+
+        pane.write("x" * 1000)
+        metrics = splitter.get_memory_metrics()
+        assert metrics["total_bytes"] > empty + 1000
+        assert metrics["pane_breakdown"]["test"] == pane.get_memory_usage()
+
     def test_reset_metrics(self):
         """Test resetting metrics."""
         splitter = TerminalSplitter(enable_metrics=True)
@@ -162,11 +687,35 @@ class TestTerminalSplitter:
 
     def test_splitter_with_config(self):
         """Test splitter with config file."""
-        with patch('builtins.open'):
+        with patch('builtins.open', mock_open(read_data="panes: []")):
             splitter = TerminalSplitter(config="test.yaml")
             assert splitter is not None
 
 
+class TestMemoryMonitor:
+    """Tests for MemoryMonitor aggregation."""
+
+    def test_total_updates_incrementally(self):
+        """Test the total follows per-pane updates and removals."""
+        monitor = MemoryMonitor()
+        monitor.record_pane_memory("a", 100)
+        monitor.record_pane_memory("b", 50)
+        monitor.record_pane_memory("a", 30)
+        assert monitor.get_total_memory() == 80
+
+        monitor.remove_pane("b")
+        assert monitor.get_total_memory() == 30
+        assert monitor.get_pane_breakdown() == {"a": 30}
+
+    def test_record_panes(self):
+        """Test recording usage straight from panes."""
+        monitor = MemoryMonitor()
+        panes = [Pane(f"p{i}") for i in range(3)]
+        panes[0].write("hello")
+        monitor.record_panes(panes)
+        assert monitor.get_total_memory() == sum(p.get_memory_usage() for p in panes)
+
+
 class TestThreadSafety:
     """Tests for thread safety."""
 
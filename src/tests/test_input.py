@@ -1,6 +1,10 @@
 """Input handling and keyboard tests."""
 
+import asyncio
+import os
+import sys
 import pytest
+from unittest.mock import Mock
 from consolemod.input import KeyCode, InputHandler
 
 
@@ -95,6 +99,104 @@ class TestInputHandler:
             pass
 
 
+class TestInputReader:
+    """Tests for the persistent keyboard reader."""
+
+    def test_split_keys(self):
+        """Test a chunk of input is split into separate keys."""
+        keys = InputHandler._split_keys("a\x1b[A\x1b[5~\x1bOB\t")
+        assert keys == ["a", "\x1b[A", "\x1b[5~", "\x1b[B", "\t"]
+
+    def test_pending_keys_empty_before_start(self):
+        """Test draining before start returns nothing."""
+        handler = InputHandler()
+        assert handler.get_pending_keys() == []
+
+    @pytest.mark.asyncio
+    async def test_fd_reader_queues_events(self):
+        """Test keys read from a file descriptor are queued in order."""
+        handler = InputHandler()
+        notified = []
+        handler._loop = asyncio.get_running_loop()
+        handler._queue = asyncio.Queue()
+        handler._on_key = lambda: notified.append(True)
+        handler.running = True
+
+        read_fd, write_fd = os.pipe()
+        handler._loop.add_reader(read_fd, handler._on_fd_readable, read_fd)
+        try:
+            os.write(write_fd, b"\x1b[A\x1b[B\t")
+            await asyncio.sleep(0.05)
+            events = handler.get_pending_keys()
+        finally:
+            handler._loop.remove_reader(read_fd)
+            os.close(read_fd)
+            os.close(write_fd)
+
+        assert [e.key for e in events] == [KeyCode.UP, KeyCode.DOWN, KeyCode.TAB]
+        assert notified
+        assert handler.get_pending_keys() == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(sys.platform == "win32", reason="needs a POSIX pty")
+    async def test_fd_reader_delivers_ctrl_c(self, monkeypatch):
+        """Test Ctrl+C typed on the terminal is queued as a key instead of raising SIGINT."""
+        import pty
+        import termios
+
+        master_fd, slave_fd = pty.openpty()
+        stdin = os.fdopen(slave_fd, "r")
+        monkeypatch.setattr(sys, "stdin", stdin)
+        handler = InputHandler()
+        handler._loop = asyncio.get_running_loop()
+        handler._queue = asyncio.Queue()
+        handler.running = True
+        try:
+            assert handler._start_fd_reader()
+            assert not termios.tcgetattr(slave_fd)[3] & termios.ISIG
+            os.write(master_fd, b"\x03")
+            await asyncio.sleep(0.05)
+            events = handler.get_pending_keys()
+        finally:
+            handler.stop()
+            stdin.close()
+            os.close(master_fd)
+
+        assert [e.key for e in events] == [KeyCode.CTRL_C]
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(sys.platform == "win32", reason="needs a POSIX pty")
+    async def test_fd_reader_failure_restores_terminal(self, monkeypatch):
+        """Test the terminal settings are restored if the loop cannot watch stdin."""
+        import pty
+        import termios
+
+        master_fd, slave_fd = pty.openpty()
+        stdin = os.fdopen(slave_fd, "r")
+        monkeypatch.setattr(sys, "stdin", stdin)
+        loop = asyncio.get_running_loop()
+        monkeypatch.setattr(loop, "add_reader", Mock(side_effect=NotImplementedError))
+        handler = InputHandler()
+        handler._loop = loop
+        before = termios.tcgetattr(slave_fd)
+        try:
+            assert not handler._start_fd_reader()
+            assert termios.tcgetattr(slave_fd) == before
+            assert handler._saved_tty_attrs is None
+        finally:
+            stdin.close()
+            os.close(master_fd)
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_keys(self):
+        """Test keys beyond max_pending are dropped instead of blocking."""
+        handler = InputHandler(max_pending=2)
+        handler._queue = asyncio.Queue(maxsize=2)
+        for _ in range(5):
+            handler._push(handler._parse_key("\t"))
+        assert len(handler.get_pending_keys()) == 2
+
+
 class TestKeyboardInput:
     """Tests for keyboard input processing."""
 
@@ -1,8 +1,9 @@
 """Comprehensive tests for logging module."""
 
+import logging
 import pytest
 from consolemod.core import Pane
-from consolemod.logging import PaneLogger, LogLevel
+from consolemod.logging import PaneLogger, LogLevel, StdoutPaneAdapter
 
 
 class TestPaneLogger:
@@ -117,3 +118,91 @@ class TestPaneLogger:
         content = pane.get_visible_content(10)
         # Content should have been written
         assert len(content) >= 3
+
+
+class TestLogIndex:
+    """Tests for level and timestamp indexes on logger-fed panes."""
+
+    def test_count_and_fetch_by_level(self):
+        """Test per-level counts and lines without parsing text."""
+        pane = Pane("logs", max_lines=100)
+        logger = PaneLogger(pane, index=True)
+        for i in range(10):
+            logger.info(f"request {i}")
+            if i % 3 == 0:
+                logger.error(f"failure {i}")
+
+        assert logger.count(LogLevel.ERROR) == 4
+        assert logger.count() == 14
+        assert logger.level_counts()[LogLevel.INFO] == 10
+        assert logger.level_counts()[LogLevel.DEBUG] == 0
+        lines = logger.get_lines(LogLevel.ERROR, limit=2)
+        assert [m.split("] ")[-1] for _, m, _ in lines] == ["failure 6", "failure 9"]
+        assert all(style == "red" for _, _, style in lines)
+
+    def test_time_range(self):
+        """Test time-range queries use the recorded timestamps."""
+        pane = Pane("logs", max_lines=100)
+        logger = PaneLogger(pane, include_timestamp=False, index=True)
+        for minute in range(10):
+            logger.log(f"tick {minute}", LogLevel.WARNING if minute % 2 else LogLevel.INFO,
+                       timestamp=1_000_000 + minute * 60)
+
+        assert logger.count(since=1_000_000 + 5 * 60) == 5
+        assert logger.count(LogLevel.WARNING, since=1_000_000 + 5 * 60) == 3
+        assert logger.count(until=1_000_000 + 60) == 1
+        lines = logger.get_lines(since=1_000_000 + 120, until=1_000_000 + 240)
+        assert [m for _, m, _ in lines] == ["[INFO] tick 2", "[WARNING] tick 3"]
+
+    def test_clock_going_backwards(self):
+        """Test out-of-order timestamps keep the index searchable."""
+        pane = Pane("logs")
+        logger = PaneLogger(pane, include_timestamp=False, index=True)
+        for ts in (100, 200, 150, 300):
+            logger.log("x", timestamp=ts)
+        assert logger.count(since=200) == 3
+        assert logger.count(until=200) == 1
+
+    def test_eviction_and_clear(self):
+        """Test evicted lines leave the index."""
+        pane = Pane("logs", max_lines=5)
+        logger = PaneLogger(pane, index=True)
+        for i in range(12):
+            (logger.error if i % 2 else logger.info)(f"line {i}")
+        assert logger.count() == 5
+        assert logger.count(LogLevel.ERROR) == 3
+        assert [seq for seq, _, _ in logger.get_lines(LogLevel.ERROR)] == [7, 9, 11]
+
+        pane.clear()
+        assert logger.count() == 0
+        logger.error("after clear")
+        assert logger.count(LogLevel.ERROR) == 1
+
+    def test_unindexed_logger_unchanged(self):
+        """Test loggers without index=True write plain lines."""
+        pane = Pane("logs")
+        logger = PaneLogger(pane)
+        logger.error("plain")
+        assert pane.log_index is None
+        assert logger.count() == 0
+        assert pane.get_content_snapshot()[0][1] == "red"
+
+    @pytest.mark.asyncio
+    async def test_async_indexed_write(self):
+        """Test async logging records levels too."""
+        pane = Pane("logs")
+        logger = PaneLogger(pane, index=True)
+        await logger.acritical("meltdown")
+        await logger.adebug("details")
+        assert logger.count(LogLevel.CRITICAL) == 1
+        assert logger.count(LogLevel.DEBUG) == 1
+
+    def test_stdlib_adapter_uses_record_time(self):
+        """Test the logging adapter indexes records at their creation time."""
+        pane = Pane("logs")
+        handler = StdoutPaneAdapter(pane, index=True)
+        record = logging.LogRecord("app", logging.ERROR, __file__, 1, "boom", None, None)
+        record.created = 1234.5
+        handler.emit(record)
+        assert pane.count_log_lines(since=1234.5, until=1235) == 1
+        assert pane.count_log_lines(since=1235) == 0
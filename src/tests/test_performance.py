@@ -4,7 +4,7 @@ import asyncio
 import time
 import threading
 import pytest
-from consolemod.core import Pane, TerminalSplitter, LayoutMode
+from consolemod.core import Pane, TerminalSplitter, LayoutMode, OffscreenTerminal
 from consolemod.logging import PaneLogger
 from consolemod.ui import ProgressBar, Table
 from consolemod.utils import CircularBuffer, CommandHistory
@@ -60,6 +60,75 @@ class TestRenderingPerformance:
         assert avg_time < 0.01  # <10ms per retrieval
 
 
+class TestFrameRenderPerformance:
+    """Headless benchmarks of actual frame rendering."""
+
+    def _splitter(self, backend, panes=20, lines=200, width=200, height=60):
+        terminal = OffscreenTerminal(width, height, emulate=False)
+        splitter = TerminalSplitter(terminal=terminal, backend=backend)
+        for p in range(panes):
+            pane = Pane(f"pane{p}")
+            for i in range(lines):
+                pane.write(f"[green]INFO[/green] pane {p} line {i}")
+            splitter.add_pane(pane)
+        splitter.render_frame()
+        terminal.reset_stats()
+        return splitter, terminal
+
+    @pytest.mark.parametrize("backend", ["rich", "cells"])
+    def test_tail_frames_per_second(self, backend):
+        """Test frame rate with one pane receiving lines each frame."""
+        splitter, terminal = self._splitter(backend)
+        pane = splitter.get_pane("pane0")
+
+        start = time.perf_counter()
+        for i in range(30):
+            pane.write(f"new line {i}")
+            splitter.render_frame()
+        elapsed = time.perf_counter() - start
+
+        assert terminal.get_stats()["frames"] == 30
+        assert 30 / elapsed > 5  # Should sustain >5 fps on a 200x60 screen
+
+    def test_cells_backend_bytes_per_frame(self):
+        """Test the diffed backend writes far fewer bytes per tail frame."""
+        averages = {}
+        for backend in ("rich", "cells"):
+            splitter, terminal = self._splitter(backend)
+            pane = splitter.get_pane("pane0")
+            for i in range(10):
+                pane.write(f"new line {i}")
+                splitter.render_frame()
+            averages[backend] = terminal.get_stats()["avg_bytes_per_frame"]
+
+        assert averages["cells"] * 10 < averages["rich"]
+
+    def test_idle_frame_latency(self):
+        """Test an unchanged frame is cheap once panels are cached."""
+        splitter, _ = self._splitter("cells")
+
+        start = time.perf_counter()
+        for _ in range(20):
+            splitter.render_frame()
+        avg_time = (time.perf_counter() - start) / 20
+
+        assert avg_time < 0.1  # <100ms per idle frame
+
+    def test_frames_are_deterministic(self):
+        """Test identical input renders identical screens."""
+        hashes = set()
+        for _ in range(2):
+            terminal = OffscreenTerminal(80, 24)
+            splitter = TerminalSplitter(terminal=terminal)
+            pane = Pane("logs")
+            splitter.add_pane(pane)
+            for i in range(50):
+                pane.write(f"line {i}")
+            splitter.render_frame()
+            hashes.add(terminal.screen_hash())
+        assert len(hashes) == 1
+
+
 class TestMemoryUsage:
     """Tests for memory efficiency."""
 
@@ -85,6 +154,24 @@ class TestMemoryUsage:
         items = buffer.get_all()
         assert len(items) <= 50
 
+    def test_compact_buffer_bytes_per_line(self):
+        """Test compact storage costs close to the payload per line."""
+        import tracemalloc
+
+        def bytes_per_line(compact):
+            tracemalloc.start()
+            buffer = CircularBuffer(max_size=20_000, compact=compact)
+            for i in range(40_000):
+                buffer.append(f"2024-01-01 12:00:00 INFO request {i:06d} ok", "green")
+            used = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return used / len(buffer)
+
+        payload = len("2024-01-01 12:00:00 INFO request 000000 ok")
+        compact = bytes_per_line(True)
+        assert compact < payload + 32
+        assert compact < bytes_per_line(False) / 2
+
     def test_history_memory_bounded(self):
         """Test history memory is bounded."""
         history = CommandHistory(max_size=100)
@@ -192,6 +279,25 @@ class TestAsyncPerformance:
         
         assert throughput > 100  # Async should be faster
 
+    @pytest.mark.asyncio
+    async def test_awrite_call_overhead(self):
+        """Benchmark per-call cost of awrite against a thread-pool hop."""
+        pane = Pane("test", max_lines=50_000)
+        count = 2000
+
+        start = time.perf_counter()
+        for i in range(count):
+            await asyncio.to_thread(pane.write, f"Message {i}")
+        hop_us = (time.perf_counter() - start) / count * 1e6
+
+        start = time.perf_counter()
+        for i in range(count):
+            await pane.awrite(f"Message {i}")
+        inline_us = (time.perf_counter() - start) / count * 1e6
+
+        assert inline_us * 5 < hop_us
+        assert len(pane.get_content_snapshot()) == 2 * count
+
 
 class TestLoggingPerformance:
     """Tests for logging performance."""
@@ -357,6 +463,21 @@ class TestScrollingPerformance:
         avg_time = elapsed / 50
         assert avg_time < 0.05  # <50ms per scroll+render
 
+    def test_row_scrolling_cost_independent_of_size(self):
+        """Test wrapped-row scrolling stays cheap on large panes."""
+        def time_scrolls(lines):
+            pane = Pane("test", max_lines=lines)
+            pane.write_many([(f"{i} " + "word " * (i % 40), "white") for i in range(lines)])
+            pane.set_viewport(80, 30)
+            pane.get_total_rows()  # Measure once
+            start = time.perf_counter()
+            for i in range(500):
+                pane.scroll(1, 7)
+                pane.get_visible_window(30)
+            return time.perf_counter() - start
+
+        assert time_scrolls(100_000) < time_scrolls(1_000) * 5
+
 
 class TestDataStructurePerformance:
     """Tests for data structure performance."""
@@ -373,6 +494,42 @@ class TestDataStructurePerformance:
         throughput = 10000 / elapsed
         assert throughput > 1000  # Should append >1000/sec
 
+    def test_circular_buffer_viewport_cost(self):
+        """Test viewport reads do not scale with buffer size."""
+        small = CircularBuffer(max_size=100)
+        large = CircularBuffer(max_size=100_000)
+        for buffer in (small, large):
+            for i in range(buffer.max_size + 50):  # Wrap around
+                buffer.append(f"Item {i}")
+
+        def time_reads(buffer):
+            start = time.perf_counter()
+            for _ in range(2000):
+                buffer.get_slice(len(buffer) - 40, len(buffer))
+            return time.perf_counter() - start
+
+        assert time_reads(large) < time_reads(small) * 5
+
+    def test_indexed_search_performance(self):
+        """Test selective queries on an indexed buffer avoid a full scan."""
+        buffer = CircularBuffer(max_size=200_000, compact=True, indexed=True)
+        buffer.extend([
+            (f"{i} worker-{i % 97} {'timeout' if i % 5000 == 0 else 'ok'} /api/v{i % 7}", "white")
+            for i in range(200_000)
+        ])
+
+        start = time.perf_counter()
+        results = buffer.search("TIMEOUT")
+        indexed = time.perf_counter() - start
+
+        buffer.index = None
+        start = time.perf_counter()
+        assert buffer.search("TIMEOUT") == results
+        scanned = time.perf_counter() - start
+
+        assert len(results) == 40
+        assert indexed < scanned / 10
+
     def test_command_history_navigation_performance(self):
         """Test history navigation performance."""
         history = CommandHistory(max_size=1000)
@@ -0,0 +1,651 @@
+"""Tests for the render pipeline."""
+
+import asyncio
+import io
+import threading
+import time
+import pytest
+from rich.console import Console
+from rich.style import Style
+from rich.text import Text
+
+from consolemod.core import (
+    TerminalSplitter, Pane, PaneRenderer, FrameScheduler, OffscreenTerminal, TerminalWriter
+)
+from consolemod.core.backends import CellBackend, RichBackend, create_backend
+from consolemod.core.wrap import TextCache, measure_rows, parse_line
+from consolemod.ui import DARK_THEME, Layout, LayoutMode
+
+
+class TestPaneRenderer:
+    """Tests for incremental pane rendering."""
+
+    def _make_panes(self, count):
+        panes = [Pane(f"pane{i}") for i in range(count)]
+        for i, pane in enumerate(panes):
+            pane.write(f"Hello {i}")
+        return panes
+
+    def test_first_render_builds_all_panes(self):
+        """Test every pane is built on the first frame."""
+        renderer = PaneRenderer(DARK_THEME)
+        panes = self._make_panes(5)
+        renderer.render(panes, (80, 24))
+        assert renderer.last_rebuilt == 5
+
+    def test_idle_frame_rebuilds_nothing(self):
+        """Test an unchanged frame reuses every panel."""
+        renderer = PaneRenderer(DARK_THEME)
+        panes = self._make_panes(20)
+        root = renderer.render(panes, (80, 24))
+        assert renderer.render(panes, (80, 24)) is root
+        assert renderer.last_rebuilt == 0
+
+    def test_only_dirty_panes_rebuilt(self):
+        """Test writes, scrolling and focus only rebuild affected panes."""
+        renderer = PaneRenderer(DARK_THEME)
+        panes = self._make_panes(10)
+        renderer.render(panes, (80, 24))
+
+        panes[2].write("more")
+        panes[5].scroll(1, 1)
+        panes[7].set_focus(True)
+        renderer.render(panes, (80, 24))
+        assert renderer.last_rebuilt == 3
+
+    def test_resize_rebuilds_all_panes(self):
+        """Test a terminal resize rebuilds every panel."""
+        renderer = PaneRenderer(DARK_THEME)
+        panes = self._make_panes(4)
+        renderer.render(panes, (80, 24))
+        renderer.render(panes, (120, 40))
+        assert renderer.last_rebuilt == 4
+
+    def test_pane_set_change_rebuilds_tree(self):
+        """Test adding a pane rebuilds the layout tree."""
+        renderer = PaneRenderer(DARK_THEME)
+        panes = self._make_panes(2)
+        root = renderer.render(panes, (80, 24))
+        panes.append(Pane("extra"))
+        assert renderer.render(panes, (80, 24)) is not root
+        assert renderer.last_rebuilt == 3
+
+    def test_clear_marks_pane_dirty(self):
+        """Test clearing a pane triggers a rebuild."""
+        renderer = PaneRenderer(DARK_THEME)
+        panes = self._make_panes(1)
+        renderer.render(panes, (80, 24))
+        panes[0].clear()
+        renderer.render(panes, (80, 24))
+        assert renderer.last_rebuilt == 1
+
+    def test_viewport_matches_pane_height(self):
+        """Test each pane formats exactly the rows it has on screen."""
+        layout = Layout(LayoutMode.VERTICAL)
+        renderer = PaneRenderer(DARK_THEME, layout)
+        short, tall = Pane("short"), Pane("tall")
+        for i in range(500):
+            short.write(f"s{i}")
+            tall.write(f"t{i}")
+
+        renderer.render([short, tall], (80, 12))
+        assert renderer.get_pane_rows(short) == 4
+        assert renderer.get_pane_rows(tall) == 4
+
+        renderer.render([short, tall], (80, 404))
+        assert renderer.get_pane_rows(tall) == 200
+        panel = renderer.root["tall"].renderable
+        assert len(panel.renderable.plain.splitlines()) == 200
+
+    def test_viewport_honors_scrollback(self):
+        """Test scrolled panes show older lines."""
+        renderer = PaneRenderer(DARK_THEME)
+        pane = Pane("logs")
+        for i in range(50):
+            pane.write(f"line {i}")
+        pane.scroll(1, 10)
+        renderer.render([pane], (80, 7))
+        text = renderer.root["logs"].renderable.renderable.plain
+        assert text.splitlines() == [f"line {i}" for i in range(35, 40)]
+
+    def test_wrapped_lines_fill_viewport(self):
+        """Test long lines count as their wrapped rows so the newest line stays visible."""
+        renderer = PaneRenderer(DARK_THEME)
+        pane = Pane("logs")
+        for i in range(20):
+            pane.write(f"line {i} " + "word " * 10)
+        root = renderer.render([pane], (24, 8))  # 20 content cells, 6 rows
+        assert pane.wrap_width == 20
+        assert pane.get_total_rows() == 60
+
+        console = Console(file=io.StringIO(), width=24, height=8, color_system=None)
+        console.print(root)
+        rows = [row.strip("│ ") for row in console.file.getvalue().splitlines()[1:-1]]
+        assert rows[0].startswith("line 18")
+        assert rows[-1] == "word word word word"
+
+    def test_partial_top_line_is_cropped(self):
+        """Test scrolling by rows drops the scrolled-out rows of the top line."""
+        renderer = PaneRenderer(DARK_THEME)
+        pane = Pane("logs")
+        for i in range(20):
+            pane.write(f"line {i} " + "word " * 10)
+        renderer.render([pane], (24, 8))
+        pane.scroll(1, 1)  # Row scrolling: the top line is line 17 minus its first two rows
+        renderer.render([pane], (24, 8))
+        lines = renderer.root["logs"].renderable.renderable.plain.splitlines()
+        assert lines[0].strip() == "word word word word"
+        assert lines[1].startswith("line 18")
+        assert lines[2].startswith("line 19")
+
+    def test_measure_rows_matches_rich_wrap(self):
+        """Test row counts equal Rich's own word wrap."""
+        console = Console(file=io.StringIO())
+        messages = [
+            "", "short", "  leading spaces then a fairly long sentence of words",
+            "x" * 45 + " tail", "[bold]markup[/bold] " * 6, "tab\tseparated " * 4,
+            "multi\nline " * 3, "漢字" * 30, "a  b   c    " * 8,
+        ]
+        for width in (1, 3, 7, 20, 60):
+            for message in messages:
+                expected = len(Text.from_markup(message).wrap(console, width))
+                assert measure_rows(message, "white", width) == max(1, expected)
+
+    def test_rounding_remainder_goes_to_last_pane(self):
+        """Test panes fill the whole screen despite integer division."""
+        renderer = PaneRenderer(DARK_THEME)
+        panes = [Pane(f"p{i}") for i in range(3)]
+        renderer.render(panes, (80, 40))
+        assert sum(g[3] for g in renderer.geometry.values()) == 40
+
+    def test_grid_layout_geometry(self):
+        """Test grid mode lays panes out in rows of columns."""
+        renderer = PaneRenderer(DARK_THEME, Layout(LayoutMode.GRID))
+        panes = [Pane(f"p{i}") for i in range(4)]
+        renderer.render(panes, (80, 20))
+        assert renderer.geometry["p3"] == (40, 10, 40, 10)
+
+    def test_borderless_pane_uses_full_height(self):
+        """Test panes without borders get every row."""
+        renderer = PaneRenderer(DARK_THEME)
+        pane = Pane("plain", border=False)
+        renderer.render([pane], (80, 10))
+        assert renderer.get_pane_rows(pane) == 10
+
+    def test_splitter_build_layout(self):
+        """Test the splitter renders its panes through the renderer."""
+        splitter = TerminalSplitter(enable_input=False)
+        splitter.add_pane(Pane("logs"))
+        splitter.get_pane("logs").write("[red]boom[/red]")
+        layout = splitter._build_layout()
+        assert layout["logs"] is not None
+        assert splitter._build_layout() is layout
+
+    def test_lines_parsed_once(self):
+        """Test a rebuild only parses lines that were not on screen."""
+        renderer = PaneRenderer(DARK_THEME)
+        pane = Pane("logs", border=False)
+        for i in range(20):
+            pane.write(f"[bold]line[/bold] {i}")
+        renderer.render([pane], (40, 5))
+        cache = renderer.get_text_cache(pane)
+        assert (cache.hits, cache.misses) == (0, 5)
+        pane.write("new")
+        renderer.render([pane], (40, 5))
+        assert (cache.hits, cache.misses) == (4, 6)
+
+    def test_cached_texts_render_unchanged(self):
+        """Test cached lines are not modified by rendering or cropping."""
+        renderer = PaneRenderer(DARK_THEME)
+        pane = Pane("logs", border=False)
+        message = "[red]alert[/red] " + "word " * 12
+        pane.write(message, "bold")
+        renderer.render([pane], (20, 3))
+        text = renderer.get_text_cache(pane).get_texts([(0, message, "bold")])[0]
+        before = (text.plain, list(text.spans), text.style)
+        pane.scroll(1, 1)
+        console = Console(file=io.StringIO(), width=20, height=3)
+        for _ in range(2):
+            console.print(renderer.render([pane], (20, 3)))
+        assert (text.plain, list(text.spans), text.style) == before
+
+    def test_replaced_pane_gets_new_cache(self):
+        """Test a new pane under a reused id does not see stale lines."""
+        renderer = PaneRenderer(DARK_THEME)
+        old, new = Pane("logs"), Pane("logs")
+        old.write("old line")
+        new.write("new line")
+        renderer.render([old], (40, 5))
+        renderer.render([new], (40, 5))
+        cache = renderer.get_text_cache(new)
+        assert (cache.hits, cache.misses) == (0, 1)
+
+    def test_text_cache_is_bounded(self):
+        """Test the cache keeps the window plus at most its capacity."""
+        cache = TextCache(capacity=4)
+        cache.get_texts([(i, f"line {i}", "white") for i in range(10)])
+        assert len(cache) == 10
+        cache.get_texts([(20, "x", "white")])
+        assert len(cache) == 4
+        cache.get_texts([(8, "line 8", "white"), (9, "line 9", "white")])
+        assert cache.hits == 2
+
+    def test_rewritten_line_is_reparsed(self):
+        """Test a line rewritten in place is parsed again."""
+        cache = TextCache()
+        cache.get_texts([(0, "spam", "white")])
+        assert cache.get_texts([(0, "spam (x2)", "white")])[0].plain == "spam (x2)"
+        assert (cache.hits, cache.misses) == (0, 2)
+
+    def test_style_resolved_once(self):
+        """Test line styles are parsed to Rich styles, keeping theme names as strings."""
+        assert parse_line("x", "bright_red").style == Style.parse("bright_red")
+        assert parse_line("x", "repr.number").style == "repr.number"
+        assert parse_line("[broken", "white").plain == "[broken"
+
+
+class TestFrameScheduler:
+    """Tests for the event-driven frame scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_idle_scheduler_does_not_wake(self):
+        """Test no frame is released without a request."""
+        scheduler = FrameScheduler(fps=60)
+        scheduler.bind()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(scheduler.wait_for_frame(), 0.1)
+        assert scheduler.frames == 0
+
+    @pytest.mark.asyncio
+    async def test_requests_are_coalesced(self):
+        """Test many requests before a frame produce a single frame."""
+        scheduler = FrameScheduler(fps=60)
+        scheduler.bind()
+        for _ in range(100):
+            scheduler.request_frame()
+        await scheduler.wait_for_frame()
+        assert scheduler.frames == 1
+        assert scheduler.requests == 100
+        assert not scheduler.is_pending()
+
+    @pytest.mark.asyncio
+    async def test_fps_cap(self):
+        """Test frames are spaced by at least 1/fps."""
+        scheduler = FrameScheduler(fps=20)
+        scheduler.bind()
+        start = time.monotonic()
+        for _ in range(3):
+            scheduler.request_frame()
+            await scheduler.wait_for_frame()
+        assert time.monotonic() - start >= 2 / 20 - 0.01
+
+    @pytest.mark.asyncio
+    async def test_request_from_other_thread(self):
+        """Test a request from a worker thread wakes the loop."""
+        scheduler = FrameScheduler(fps=60)
+        scheduler.bind()
+        threading.Timer(0.02, scheduler.request_frame).start()
+        await asyncio.wait_for(scheduler.wait_for_frame(), 1.0)
+        assert scheduler.frames == 1
+
+    @pytest.mark.asyncio
+    async def test_timer_ticks(self):
+        """Test timers request frames and run their callback."""
+        scheduler = FrameScheduler(fps=60)
+        scheduler.bind()
+        ticks = []
+        timer_id = scheduler.add_timer(0.01, lambda: ticks.append(1))
+        await asyncio.wait_for(scheduler.wait_for_frame(), 1.0)
+        scheduler.remove_timer(timer_id)
+        assert ticks
+
+    def test_blocking_wait(self):
+        """Test a render thread is woken by a request from another thread."""
+        scheduler = FrameScheduler(fps=60)
+        assert not scheduler.wait_for_frame_blocking(timeout=0.05)
+        threading.Timer(0.02, scheduler.request_frame).start()
+        assert scheduler.wait_for_frame_blocking(timeout=1.0)
+        assert scheduler.frames == 1
+        assert not scheduler.is_pending()
+
+    def test_invalid_timer_interval(self):
+        """Test non-positive timer intervals are rejected."""
+        with pytest.raises(ValueError):
+            FrameScheduler().add_timer(0)
+
+    def test_pane_write_requests_frame(self):
+        """Test pane changes request a frame from the splitter."""
+        splitter = TerminalSplitter(enable_input=False)
+        pane = Pane("logs")
+        splitter.add_pane(pane)
+        before = splitter._scheduler.requests
+        pane.write("hello")
+        pane.scroll(1, 1)
+        assert splitter._scheduler.requests == before + 2
+
+    def test_view_rebuilt_only_on_matching_lines(self):
+        """Test a filtered view is dirty only when a matching line arrives."""
+        renderer = PaneRenderer(DARK_THEME)
+        logs = Pane("logs")
+        view = logs.add_view("errors", lambda m, s: "ERROR" in m)
+        renderer.render([view], (80, 24))
+
+        logs.write("info only")
+        renderer.render([view], (80, 24))
+        assert renderer.last_rebuilt == 0
+
+        logs.write("ERROR found")
+        renderer.render([view], (80, 24))
+        assert renderer.last_rebuilt == 1
+
+
+class TestCellBackend:
+    """Tests for the diffed cell-grid backend."""
+
+    def _console(self, width=60, height=12):
+        return Console(file=io.StringIO(), width=width, height=height,
+                       force_terminal=True, color_system="truecolor")
+
+    def test_create_backend(self):
+        """Test backends are created by name."""
+        console = self._console()
+        assert isinstance(create_backend("rich", console), RichBackend)
+        assert isinstance(create_backend("cells", console), CellBackend)
+        with pytest.raises(ValueError):
+            create_backend("bogus", console)
+
+    def test_unchanged_frame_is_empty(self):
+        """Test redrawing an identical frame writes nothing."""
+        console = self._console()
+        backend = CellBackend(console)
+        renderer = PaneRenderer(DARK_THEME)
+        panes = [Pane("a"), Pane("b")]
+        panes[0].write("hello")
+        assert backend.render(renderer.render(panes, console.size))
+        assert backend.render(renderer.render(panes, console.size)) == ""
+
+    def test_diff_reproduces_screen(self):
+        """Test applying diffs frame after frame yields the current grid."""
+        terminal = OffscreenTerminal(60, 12)
+        backend = CellBackend(terminal.console)
+        renderer = PaneRenderer(DARK_THEME)
+        panes = [Pane("a", color="green"), Pane("b", color="red")]
+
+        for i in range(30):
+            panes[i % 2].write(f"[bold]line[/bold] {i} 漢字 e\u0301")
+            terminal.write_frame(backend.render(renderer.render(panes, terminal.console.size)))
+            assert terminal.get_text() == backend.get_text()
+
+    def test_diff_smaller_than_full_redraw(self):
+        """Test a one-line change costs far less than a full Rich redraw."""
+        console = self._console(200, 60)
+        cells, full = CellBackend(console), RichBackend(console)
+        renderer = PaneRenderer(DARK_THEME)
+        panes = [Pane(f"p{i}") for i in range(4)]
+        for pane in panes:
+            for i in range(100):
+                pane.write(f"log line {i}")
+        cells.render(renderer.render(panes, console.size))
+
+        panes[0].write("new line")
+        layout = renderer.render(panes, console.size)
+        assert len(cells.render(layout)) * 10 < len(full.render(layout))
+
+    def test_resize_redraws_everything(self):
+        """Test a size change triggers a full redraw."""
+        console = self._console(40, 10)
+        backend = CellBackend(console)
+        renderer = PaneRenderer(DARK_THEME)
+        panes = [Pane("a")]
+        backend.render(renderer.render(panes, console.size))
+        console.size = (50, 10)
+        assert backend.render(renderer.render(panes, console.size)).startswith("\x1b[0m\x1b[2J")
+        assert len(backend.get_text()[0]) == 50
+
+    def test_style_table_bounded(self):
+        """Test interned styles are rebuilt once the table is full, keeping output correct."""
+        terminal = OffscreenTerminal(40, 6)
+        backend = CellBackend(terminal.console)
+        backend.MAX_STYLES = 8
+        pane = Pane("a")
+        renderer = PaneRenderer(DARK_THEME)
+        for i in range(40):
+            pane.write(f"line {i}", f"#{i:02x}{i:02x}{i:02x}")
+            terminal.write_frame(backend.render(renderer.render([pane], terminal.console.size)))
+            assert len(backend._sgr) <= backend.MAX_STYLES + 8
+            assert terminal.get_text() == backend.get_text()
+
+
+class TestOffscreenTerminal:
+    """Tests for headless rendering."""
+
+    def _splitter(self, backend="rich", width=60, height=12):
+        terminal = OffscreenTerminal(width, height)
+        splitter = TerminalSplitter(terminal=terminal, backend=backend)
+        splitter.add_pane(Pane("a"))
+        splitter.add_pane(Pane("b"))
+        return splitter, terminal
+
+    def test_headless_splitter_has_no_input(self):
+        """Test headless splitters never read the keyboard."""
+        splitter, _ = self._splitter()
+        assert splitter.input_handler is None
+
+    def test_render_frame_updates_screen(self):
+        """Test rendered content shows up on the offscreen screen."""
+        splitter, terminal = self._splitter()
+        splitter.get_pane("a").write("hello offscreen")
+        splitter.render_frame()
+        assert any("hello offscreen" in line for line in terminal.get_text())
+        assert terminal.get_stats()["frames"] == 1
+        assert terminal.get_last_frame()
+
+    def test_backends_produce_same_screen(self):
+        """Test both backends leave identical screens."""
+        hashes = []
+        for backend in ("rich", "cells"):
+            splitter, terminal = self._splitter(backend)
+            for i in range(25):
+                splitter.get_pane("a" if i % 3 else "b").write(f"line {i} 漢字")
+                splitter.render_frame()
+            hashes.append(terminal.screen_hash())
+        assert hashes[0] == hashes[1]
+
+    def test_resize(self):
+        """Test resizing changes the rendered geometry."""
+        splitter, terminal = self._splitter("cells")
+        splitter.render_frame()
+        terminal.resize(100, 30)
+        splitter.render_frame()
+        text = terminal.get_text()
+        assert len(text) == 30
+        assert text[-1].rstrip().endswith("╯")
+        assert len(text[-1].rstrip()) == 100
+
+    @pytest.mark.asyncio
+    async def test_headless_render_loop(self):
+        """Test the render loop runs without a TTY and idles between writes."""
+        splitter, terminal = self._splitter("cells")
+        splitter.fps = 100
+
+        async def driver():
+            await asyncio.sleep(0.05)
+            splitter.get_pane("a").write("first")
+            await asyncio.sleep(0.1)
+            idle_frames = terminal.frame_count
+            await asyncio.sleep(0.1)
+            assert terminal.frame_count == idle_frames  # Nothing changed, no frames
+            splitter.stop()
+
+        await asyncio.wait_for(asyncio.gather(splitter.render_loop(), driver()), 5)
+        assert any("first" in line for line in terminal.get_text())
+
+
+class TestFrameMetrics:
+    """Tests for per-phase frame timing."""
+
+    def test_render_frame_records_phases(self):
+        """Test rendering records a frame with per-phase timings."""
+        terminal = OffscreenTerminal(80, 24)
+        splitter = TerminalSplitter(terminal=terminal, enable_metrics=True)
+        pane = Pane("logs")
+        splitter.add_pane(pane)
+        for i in range(5):
+            pane.write(f"line {i}")
+            splitter.render_frame()
+
+        frames = list(splitter.perf_monitor.frames)
+        assert len(frames) == 5
+        frame = frames[-1]
+        assert frame.render_time > 0
+        assert frame.layout_time > 0
+        assert frame.build_time > 0
+        assert frame.write_time > 0
+        phases = frame.layout_time + frame.build_time + frame.render_time + frame.write_time
+        assert frame.total_time >= phases
+
+    def test_performance_metrics_include_phases(self):
+        """Test get_performance_metrics reports non-zero phase averages."""
+        terminal = OffscreenTerminal(80, 24)
+        splitter = TerminalSplitter(terminal=terminal, enable_metrics=True)
+        splitter.add_pane(Pane("logs"))
+        splitter.render_frame()
+        splitter.render_frame()
+
+        metrics = splitter.get_performance_metrics()
+        assert metrics["avg_frame_time_ms"] > 0
+        for phase in ("input", "layout", "build", "render", "write"):
+            assert f"avg_{phase}_time_ms" in metrics
+        assert metrics["avg_render_time_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_render_loop_records_frames(self):
+        """Test the render loop feeds the performance monitor."""
+        terminal = OffscreenTerminal(80, 24)
+        splitter = TerminalSplitter(terminal=terminal, enable_metrics=True, fps=100)
+        splitter.add_pane(Pane("logs"))
+
+        async def driver():
+            for i in range(3):
+                splitter.get_pane("logs").write(f"line {i}")
+                await asyncio.sleep(0.03)
+            splitter.stop()
+
+        await asyncio.wait_for(asyncio.gather(splitter.render_loop(), driver()), 5)
+        assert len(splitter.perf_monitor.frames) >= 2
+
+
+class TestTerminalWriter:
+    """Tests for buffered frame output and byte accounting."""
+
+    def test_single_write_per_frame(self):
+        """Test each frame is written with one call."""
+        writes = []
+        writer = TerminalWriter(writes.append)
+        writer.write_frame("abc")
+        writer.write_frame("")
+        assert writes == ["abc"]
+        assert writer.frames == 2
+        assert writer.last_frame_bytes == 0
+
+    def test_synchronized_output(self):
+        """Test frames are wrapped in synchronized-output sequences."""
+        writes = []
+        writer = TerminalWriter(writes.append, synchronized=True)
+        size = writer.write_frame("abc")
+        assert writes == ["\x1b[?2026habc\x1b[?2026l"]
+        assert size == len(writes[0])
+
+    def test_utf8_byte_counting(self):
+        """Test byte counts use the UTF-8 size."""
+        writer = TerminalWriter(lambda data: None)
+        assert writer.write_frame("漢字") == 6
+        assert writer.get_bytes_per_second() == 6
+
+    def test_budget_lowers_fps(self):
+        """Test large frames under a byte budget reduce the frame rate."""
+        writer = TerminalWriter(lambda data: None, max_bytes_per_second=10_000)
+        assert writer.effective_fps(30) == 30
+        for _ in range(10):
+            writer.write_frame("x" * 5_000)
+        assert writer.effective_fps(30) == pytest.approx(2, rel=0.05)
+
+        for _ in range(30):
+            writer.write_frame("x" * 100)
+        assert writer.effective_fps(30) == 30
+
+    def test_budget_floor(self):
+        """Test throttling never goes below min_fps."""
+        writer = TerminalWriter(lambda data: None, max_bytes_per_second=10, min_fps=1)
+        writer.write_frame("x" * 1_000)
+        assert writer.effective_fps(30) == 1
+
+    def test_splitter_reports_bytes(self):
+        """Test byte counters appear in the performance metrics."""
+        terminal = OffscreenTerminal(80, 24)
+        splitter = TerminalSplitter(terminal=terminal, enable_metrics=True,
+                                    max_bytes_per_second=1_000)
+        splitter.add_pane(Pane("logs"))
+        splitter.render_frame()
+
+        metrics = splitter.get_performance_metrics()
+        assert metrics["bytes_last_frame"] == terminal.frame_bytes
+        assert metrics["total_bytes"] > 0
+        assert metrics["bytes_per_second"] > 0
+        assert metrics["effective_fps"] < splitter.fps
+        assert splitter.perf_monitor.frames[-1].output_bytes == terminal.frame_bytes
+
+
+class TestRenderThread:
+    """Tests for the dedicated render-thread mode."""
+
+    @pytest.mark.asyncio
+    async def test_frames_render_off_loop(self):
+        """Test frames are drawn on the render thread, not the event loop."""
+        terminal = OffscreenTerminal(80, 24)
+        splitter = TerminalSplitter(terminal=terminal, enable_metrics=True,
+                                    fps=100, render_thread=True)
+        pane = Pane("logs")
+        splitter.add_pane(pane)
+
+        render_threads = set()
+        original = splitter._render_frame
+
+        def record(input_ns):
+            render_threads.add(threading.current_thread().name)
+            return original(input_ns)
+
+        splitter._render_frame = record
+
+        async def driver():
+            for i in range(5):
+                pane.write(f"line {i}")
+                await asyncio.sleep(0.03)
+            splitter.stop()
+
+        await asyncio.wait_for(asyncio.gather(splitter.render_loop(), driver()), 5)
+        assert render_threads == {"consolemod-render"}
+        assert any("line 4" in line for line in terminal.get_text())
+
+        metrics = splitter.get_performance_metrics()
+        assert 0 < metrics["render_thread_utilization"] <= 1
+
+    @pytest.mark.asyncio
+    async def test_render_error_propagates(self):
+        """Test an exception on the render thread is raised from render_loop."""
+        splitter = TerminalSplitter(terminal=OffscreenTerminal(40, 10), render_thread=True)
+        splitter.add_pane(Pane("logs"))
+
+        def fail(input_ns):
+            raise RuntimeError("boom")
+
+        splitter._render_frame = fail
+        with pytest.raises(RuntimeError, match="boom"):
+            await asyncio.wait_for(splitter.render_loop(), 5)
+        assert not splitter._running
+
+    def test_utilization_disabled_by_default(self):
+        """Test utilisation is only reported in render-thread mode."""
+        splitter = TerminalSplitter(terminal=OffscreenTerminal(), enable_metrics=True)
+        assert splitter.get_render_thread_utilization() == 0.0
+        assert "render_thread_utilization" not in splitter.get_performance_metrics()
@@ -4,7 +4,7 @@ import asyncio
 import threading
 import time
 import pytest
-from consolemod.core import Pane, TerminalSplitter
+from consolemod.core import Pane, TerminalSplitter, IngestPolicy
 from consolemod.logging import PaneLogger
 from consolemod.utils import CircularBuffer, CommandHistory
 
@@ -196,6 +196,75 @@ class TestConcurrentStress:
         elapsed = time.time() - start
         assert elapsed < 5.0
 
+    def test_staged_writes_keep_every_line_in_order(self):
+        """Test many producers lose no lines and keep per-thread order."""
+        pane = Pane("staged", max_lines=100_000)
+        versions = []
+
+        def write_task(task_id):
+            for i in range(2000):
+                pane.write(f"{task_id}:{i}")
+
+        def reader_task():
+            for _ in range(200):
+                pane.get_visible_content(40)
+                versions.append(pane.buffer.get_version())
+
+        threads = [threading.Thread(target=write_task, args=(i,)) for i in range(32)]
+        threads.append(threading.Thread(target=reader_task))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        lines = [message for message, _ in pane.get_content_snapshot()]
+        assert len(lines) == 32 * 2000
+        last_seen = {}
+        for line in lines:
+            task_id, i = map(int, line.split(":"))
+            assert i == last_seen.get(task_id, -1) + 1
+            last_seen[task_id] = i
+        # Lines were committed in batches, not one version bump per line
+        assert pane.buffer.get_version() < len(lines)
+
+    def test_drop_oldest_under_concurrent_commits(self):
+        """Test drop_oldest writers racing readers keep counts consistent."""
+        pane = Pane("flood", max_lines=100_000)
+        pane.set_ingest_policy(IngestPolicy("drop_oldest", rate=5000, burst=500))
+        errors = []
+
+        def write_task(task_id):
+            try:
+                for i in range(5000):
+                    pane.write(f"{task_id}:{i}")
+            except Exception as e:
+                errors.append(e)
+
+        def reader_task():
+            for _ in range(200):
+                pane.get_visible_content(40)
+
+        threads = [threading.Thread(target=write_task, args=(i,)) for i in range(8)]
+        threads.append(threading.Thread(target=reader_task))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        stats = pane.get_ingest_stats()
+        assert stats["received"] == 8 * 5000
+        assert len(pane.get_content_snapshot()) == stats["received"] - stats["dropped"]
+
+    def test_commit_on_read(self):
+        """Test staged lines are visible to the next read."""
+        pane = Pane("staged")
+        pane.write("a")
+        pane.write_many([("b", "red"), ("c", "red")])
+        assert pane.has_changes()
+        assert [m for m, _ in pane.get_visible_content(10)] == ["a", "b", "c"]
+        assert pane.buffer.get_version() == 1
+
     def test_concurrent_splitter_operations(self):
         """Test concurrent splitter operations."""
         splitter = TerminalSplitter()
@@ -5,8 +5,11 @@ from consolemod.utils import (
     wrap_text, align_text, truncate_text,
     format_bytes, format_duration,
     CommandHistory, UndoRedoStack,
-    CircularBuffer, TextAlign
+    CircularBuffer, StyleTable, ScrollbackTier, SpillTier, CompressedTier, TrigramIndex, RowIndex, RepeatCollapser,
+    TextAlign
 )
+from consolemod.core import Pane
+from consolemod.utils.collapse import _clock
 
 
 class TestTextFormatting:
@@ -282,3 +285,390 @@ class TestCircularBuffer:
         assert not buffer.is_full()
         buffer.append("B")
         assert buffer.is_full()
+
+    def test_slices_after_wrapping(self):
+        """Test slices and tail reads stay in order across the wrap point."""
+        buffer = CircularBuffer(max_size=5)
+        for i in range(8):
+            buffer.append(f"item{i}")
+
+        assert [m for m, _ in buffer.get_all()] == [f"item{i}" for i in range(3, 8)]
+        assert [m for m, _ in buffer.get_slice(1, 4)] == ["item4", "item5", "item6"]
+        assert [m for m, _ in buffer.get_slice(-2)] == ["item6", "item7"]
+        assert [m for m, _ in buffer.get_last(3)] == ["item5", "item6", "item7"]
+        assert buffer.get_slice(4, 2) == []
+
+    def test_random_access(self):
+        """Test indexing by position from either end."""
+        buffer = CircularBuffer(max_size=3)
+        for i in range(4):
+            buffer.append(f"item{i}", "red")
+
+        assert buffer[0] == ("item1", "red")
+        assert buffer[-1] == ("item3", "red")
+        assert [m for m, _ in buffer[1:]] == ["item2", "item3"]
+        with pytest.raises(IndexError):
+            buffer[3]
+
+
+class TestCompactCircularBuffer:
+    """Tests for CircularBuffer compact storage."""
+
+    def test_round_trip_after_wrapping(self):
+        """Test compact lines read back unchanged across the wrap point."""
+        buffer = CircularBuffer(max_size=4, compact=True)
+        for i in range(10):
+            buffer.append(f"line {i} 漢字", "green" if i % 2 else "red")
+
+        assert buffer.get_all() == [
+            (f"line {i} 漢字", "green" if i % 2 else "red") for i in range(6, 10)
+        ]
+        assert buffer[-1] == ("line 9 漢字", "green")
+        assert buffer.get_last(2) == buffer.get_slice(2)
+        assert buffer.search("line 7") == [(1, "line 7 漢字", "green")]
+
+    def test_styles_are_interned(self):
+        """Test compact buffers share one style id per distinct style."""
+        a = CircularBuffer(max_size=10, compact=True)
+        b = CircularBuffer(max_size=10, compact=True)
+        a.append("x", "bold magenta")
+        b.append("y", "bold magenta")
+        assert a._store._style_ids[0] == b._store._style_ids[0]
+        assert StyleTable().intern("red") == 0
+
+    def test_memory_tracks_payload(self):
+        """Test memory usage stays close to the live payload size."""
+        buffer = CircularBuffer(max_size=100, compact=True)
+        for i in range(1000):
+            buffer.append("x" * 50)
+        assert buffer.get_memory_usage() < 100 * (50 + 30)
+
+    def test_memory_usage_is_incremental(self):
+        """Test running totals match a fresh buffer holding the same lines."""
+        buffer = CircularBuffer(max_size=5)
+        for i in range(12):
+            buffer.append(f"line {i}" * (i % 3 + 1))
+        fresh = CircularBuffer(max_size=5)
+        for message, style in buffer.get_all():
+            fresh.append(message, style)
+        assert buffer.get_memory_usage() == fresh.get_memory_usage()
+
+        buffer.clear()
+        assert buffer.get_memory_usage() == CircularBuffer(max_size=5).get_memory_usage()
+
+    def test_clear(self):
+        """Test clearing a compact buffer."""
+        buffer = CircularBuffer(max_size=3, compact=True)
+        buffer.append("a")
+        buffer.clear()
+        buffer.append("b")
+        assert buffer.get_all() == [("b", "white")]
+
+
+class TestSpillTier:
+    """Tests for disk spillover scrollback."""
+
+    def test_evicted_lines_stay_addressable(self, tmp_path):
+        """Test lines evicted from the ring are read back from disk."""
+        for compact in (False, True):
+            buffer = CircularBuffer(max_size=10, compact=compact,
+                                    history=SpillTier(str(tmp_path)))
+            expected = [(f"line {i} 漢字", "red" if i % 2 else "green") for i in range(50)]
+            for message, style in expected[:30]:
+                buffer.append(message, style)
+            buffer.extend(expected[30:])
+
+            assert len(buffer) == 50
+            assert len(buffer.history) == 40
+            assert buffer.get_all() == expected
+            assert buffer.get_slice(35, 45) == expected[35:45]
+            assert buffer[3] == expected[3]
+            assert [idx for idx, _, _ in buffer.search("line 1")] == [1] + list(range(10, 20))
+
+    def test_memory_does_not_grow_with_spilled_lines(self, tmp_path):
+        """Test RAM usage stays fixed as scrollback grows on disk."""
+        buffer = CircularBuffer(max_size=100, history=SpillTier(str(tmp_path)))
+        for i in range(200):
+            buffer.append(f"line {i:05d}")
+        usage = buffer.get_memory_usage()
+        for i in range(5000):
+            buffer.append(f"line {i:05d}")
+        assert buffer.get_memory_usage() == usage
+        assert buffer.history.get_disk_usage() > 5000 * 6
+
+    def test_clear_and_close(self, tmp_path):
+        """Test clearing truncates the segment and close deletes it."""
+        tier = SpillTier(str(tmp_path))
+        buffer = CircularBuffer(max_size=2, history=tier)
+        for i in range(5):
+            buffer.append(f"line {i}")
+        buffer.clear()
+        assert len(buffer) == 0
+        assert tier.get_disk_usage() == 0
+
+        tier.close()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_pane_scrolls_into_spilled_history(self, tmp_path):
+        """Test a pane can scroll back past its in-memory lines."""
+        pane = Pane("logs", max_lines=20, history=SpillTier(str(tmp_path)))
+        for i in range(100):
+            pane.write(f"line {i}")
+        pane.scroll(1, 90)
+        assert [m for m, _ in pane.get_visible_content(3)] == ["line 7", "line 8", "line 9"]
+
+
+class TestCompressedTier:
+    """Tests for compressed cold-history blocks."""
+
+    def test_round_trip_across_blocks(self):
+        """Test lines read back unchanged from sealed and open blocks."""
+        for codec in ("zlib", "lzma"):
+            tier = CompressedTier(block_lines=16, codec=codec, cache_blocks=2)
+            buffer = CircularBuffer(max_size=10, history=tier)
+            expected = [(f"worker {i % 4} handled request {i} 漢字", "green") for i in range(100)]
+            buffer.extend(expected[:40])
+            for message, style in expected[40:]:
+                buffer.append(message, style)
+
+            assert len(tier) == 90
+            assert buffer.get_all() == expected
+            assert buffer.get_slice(10, 50) == expected[10:50]
+            assert buffer[87] == expected[87]
+            assert [idx for idx, _, _ in buffer.search("request 77")] == [77]
+            assert len(tier._cache) <= 2
+
+    def test_log_text_compresses(self):
+        """Test repetitive log lines shrink well below their raw size."""
+        tier = CompressedTier(block_lines=256)
+        raw = 0
+        for i in range(2048):
+            message = f"2024-01-01 12:00:{i % 60:02d} INFO request {i} handled in {i % 97} ms"
+            raw += len(message)
+            tier.append(message, "green")
+        assert tier.get_compression_ratio() > 4
+        assert tier.get_memory_usage() < raw / 3
+
+    def test_clear(self):
+        """Test clearing drops all blocks."""
+        tier = CompressedTier(block_lines=4)
+        tier.extend([("x", "white")] * 10)
+        tier.clear()
+        assert len(tier) == 0
+        assert tier.get_range(0, 10) == []
+
+    def test_invalid_arguments(self):
+        """Test unknown codecs and empty blocks are rejected."""
+        with pytest.raises(ValueError):
+            CompressedTier(codec="brotli")
+        with pytest.raises(ValueError):
+            CompressedTier(block_lines=0)
+
+    def test_compression_levels(self):
+        """Test an explicit level is passed to each codec."""
+        lines = [(f"line {i}", "white") for i in range(8)]
+        for codec in ("zlib", "lzma"):
+            tier = CompressedTier(block_lines=4, codec=codec, level=1)
+            tier.extend(lines)
+            assert tier.get_range(0, 8) == lines
+
+    def test_tier_base_is_abstract(self):
+        """Test tiers must implement storage before they can be created."""
+        with pytest.raises(TypeError):
+            ScrollbackTier()
+
+
+class TestTrigramIndex:
+    """Tests for indexed buffer search."""
+
+    MESSAGES = ["Disk ERROR on sda", "network timeout", "disk ok", "Retry after TIMEOUT", "ok"]
+
+    def test_matches_linear_search(self):
+        """Test indexed results equal a plain scan, both case modes."""
+        indexed = CircularBuffer(max_size=7, indexed=True)
+        plain = CircularBuffer(max_size=7)
+        for i in range(23):
+            for buffer in (indexed, plain):
+                buffer.append(f"{self.MESSAGES[i % 5]} #{i}", "white")
+        for query in ("error", "ERROR", "timeout", "disk", "#2", "o", "missing"):
+            for case_sensitive in (False, True):
+                assert indexed.search(query, case_sensitive) == plain.search(query, case_sensitive)
+
+    def test_candidates_follow_evictions(self):
+        """Test evicted lines leave the index."""
+        buffer = CircularBuffer(max_size=3, indexed=True)
+        buffer.extend([(f"line {i}", "white") for i in range(5)])
+        assert buffer.index.candidates("line") == [2, 3, 4]
+        assert buffer.index.candidates("ne 0") == []
+        assert buffer.index.candidates("ab") is None
+
+        buffer.clear()
+        assert buffer.search("line") == []
+        buffer.append("line again", "white")
+        assert buffer.search("again") == [(0, "line again", "white")]
+
+    def test_purge_drops_dead_postings(self):
+        """Test posting lists are trimmed once dead entries dominate."""
+        index = TrigramIndex()
+        index.MIN_PURGE_POSTINGS = 0
+        index.add_many(0, ["abcd"] * 10)
+        index.discard_before(8)
+        assert len(index._postings["abc"]) == 2
+        assert index.candidates("bcd") == [8, 9]
+
+    def test_history_lines_indexed(self):
+        """Test lines moved to a history tier stay searchable."""
+        buffer = CircularBuffer(max_size=4, history=CompressedTier(block_lines=4), indexed=True)
+        buffer.extend([(f"request {i}", "green") for i in range(20)])
+        assert buffer.search("request 13") == [(13, "request 13", "green")]
+        assert buffer.get_memory_usage() > 0
+
+
+class TestSequenceNumbers:
+    """Tests for stable line sequence numbers."""
+
+    def test_fetch_by_seq_across_eviction(self):
+        """Test sequence numbers keep addressing the same lines."""
+        buffer = CircularBuffer(max_size=3)
+        buffer.extend([(f"line {i}", "white") for i in range(5)])
+        assert buffer.get_first_seq() == 2
+        assert buffer.get_next_seq() == 5
+        assert buffer.get_by_seq(3) == ("line 3", "white")
+        assert buffer.get_by_seq(1) is None
+        assert buffer.get_by_seq(5) is None
+
+        buffer.append("line 5", "white")
+        assert buffer.get_by_seq(3) == ("line 3", "white")
+
+    def test_get_since(self):
+        """Test incremental reads skip seen and dropped lines."""
+        buffer = CircularBuffer(max_size=4)
+        buffer.extend([(f"line {i}", "white") for i in range(6)])
+        assert buffer.get_since(4) == [(4, "line 4", "white"), (5, "line 5", "white")]
+        assert [seq for seq, _, _ in buffer.get_since(0)] == [2, 3, 4, 5]
+        assert [seq for seq, _, _ in buffer.get_since(0, limit=2)] == [2, 3]
+        assert buffer.get_since(6) == []
+
+        buffer.clear()
+        buffer.append("after clear", "white")
+        assert buffer.get_since(0) == [(6, "after clear", "white")]
+
+    def test_search_and_filter_by_seq(self):
+        """Test by_seq results stay valid after later evictions."""
+        buffer = CircularBuffer(max_size=3, indexed=True)
+        buffer.extend([(f"entry {i}", "white") for i in range(5)])
+        assert buffer.search("entry 3") == [(1, "entry 3", "white")]
+        assert buffer.search("entry 3", by_seq=True) == [(3, "entry 3", "white")]
+        assert buffer.filter(lambda m, s: m.endswith("4"), by_seq=True) == [(4, "entry 4", "white")]
+
+        buffer.append("entry 5", "white")
+        assert buffer.get_by_seq(3) == ("entry 3", "white")
+
+
+class TestRowIndex:
+    """Tests for the wrapped-row Fenwick tree."""
+
+    def test_prefix_sums_and_find(self):
+        """Test row totals and row-to-line lookups."""
+        index = RowIndex(base_seq=100)
+        heights = [1, 3, 2, 1, 4]
+        index.extend(heights)
+        assert index.next_seq == 105
+        assert index.rows_between(100, 105) == 11
+        assert index.rows_between(101, 103) == 5
+
+        expected = [(100 + i, r) for i, h in enumerate(heights) for r in range(h)]
+        assert [index.find(100, row) for row in range(11)] == expected
+        assert index.find(100, 11) == (105, 0)
+        assert index.find(102, 0) == (102, 0)
+
+    def test_compaction_keeps_sums(self):
+        """Test discarding old lines keeps queries on live lines exact."""
+        index = RowIndex()
+        index.MIN_COMPACT = 2
+        index.extend([i % 4 + 1 for i in range(20)])
+        index.discard_before(15)
+        assert index.base_seq == 15
+        assert index.rows_between(15, 20) == sum(i % 4 + 1 for i in range(15, 20))
+        assert index.find(15, 4) == (16, 0)
+        index.extend([7])
+        assert index.rows_between(15, 21) == 21
+
+    def test_bulk_load_matches_extend(self):
+        """Test building from initial heights gives the same sums as appending."""
+        heights = [i % 5 + 1 for i in range(37)]
+        loaded = RowIndex(10, heights)
+        appended = RowIndex(10)
+        appended.extend(heights)
+        assert loaded.next_seq == appended.next_seq == 47
+        assert [loaded.rows_before(s) for s in range(10, 48)] == [appended.rows_before(s) for s in range(10, 48)]
+        assert [loaded.find(10, r) for r in range(sum(heights))] == [appended.find(10, r) for r in range(sum(heights))]
+
+    def test_assign_overwrites_heights(self):
+        """Test overwriting a run of heights keeps sums and lookups exact."""
+        index = RowIndex(10, [1] * 20)
+        index.assign(14, [3, 2, 5])
+        index.assign(29, [4, 4, 4])  # Past the end is ignored
+        heights = [1] * 4 + [3, 2, 5] + [1] * 12 + [4]
+        expected = RowIndex(10, heights)
+        assert index.next_seq == 30
+        assert [index.rows_before(s) for s in range(10, 31)] == [expected.rows_before(s) for s in range(10, 31)]
+        assert [index.find(10, r) for r in range(sum(heights))] == [expected.find(10, r) for r in range(sum(heights))]
+
+    def test_set_last(self):
+        """Test changing the newest line's rows keeps sums and lookups exact."""
+        index = RowIndex()
+        index.extend([1, 2, 1, 3])
+        index.set_last(5)
+        assert index.rows_between(0, 4) == 9
+        assert index.find(0, 8) == (3, 4)
+        index.extend([2])
+        assert index.rows_between(0, 5) == 11
+
+
+class TestRepeatCollapser:
+    """Tests for merging repeated lines."""
+
+    def test_runs_within_and_across_batches(self):
+        """Test repeats merge into the run's first line, also across batches."""
+        collapser = RepeatCollapser()
+        replaced, lines = collapser.collapse([("spam", "red")] * 3 + [("ok", "red"), ("spam", "red")], now=0)
+        assert replaced is None
+        assert [m for m, _ in lines] == ["spam (x3, %s - %s)" % ((_clock(0),) * 2), "ok", "spam"]
+
+        replaced, lines = collapser.collapse([("spam", "red")] * 2, now=60)
+        assert replaced == ("spam (x3, %s - %s)" % (_clock(0), _clock(60)), "red")
+        assert lines == []
+        assert collapser.get_run() == ("spam", 3, 0, 60)
+        assert collapser.collapsed == 4
+
+    def test_style_and_template(self):
+        """Test styles must match and template mode masks digits."""
+        exact, template = RepeatCollapser(), RepeatCollapser(template=True)
+        batch = [("retry 1", "red"), ("retry 2", "red"), ("retry 3", "white")]
+        assert len(exact.collapse(batch)[1]) == 3
+        _, lines = template.collapse(batch)
+        assert [m.split(" (")[0] for m, _ in lines] == ["retry 1", "retry 3"]
+
+    def test_records_keep_timestamps(self):
+        """Test (message, style, level, timestamp) records use their own times."""
+        collapser = RepeatCollapser()
+        _, lines = collapser.collapse([("x", "white", 2, 10.0), ("x", "white", 2, 20.0)], now=99)
+        assert lines[0][2:] == (2, 10.0)
+        assert collapser.get_run()[2:] == (10.0, 20.0)
+        collapser.reset()
+        assert collapser.get_run() is None
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_buffer_replace_last(self, compact):
+        """Test rewriting the newest line keeps its seq and stays searchable."""
+        buffer = CircularBuffer(max_size=3, compact=compact, indexed=True)
+        assert buffer.replace_last("nothing", "white") is None
+        buffer.extend([(f"line {i}", "white") for i in range(5)])
+        version = buffer.get_version()
+        assert buffer.replace_last("line 4 repeated", "red") == 4
+        assert buffer.get_all() == [("line 2", "white"), ("line 3", "white"), ("line 4 repeated", "red")]
+        assert buffer.get_version() > version
+        assert buffer.search("repeated", by_seq=True) == [(4, "line 4 repeated", "red")]
+        buffer.append("line 5", "white")
+        assert buffer.get_slice(-2) == [("line 4 repeated", "red"), ("line 5", "white")]